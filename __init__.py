@@ -10,10 +10,12 @@ bl_info = {
 
 import bpy
 
-from .dependencies import instalar_dependencias
-from .importer     import ImportPMDL, menu_func_import
-from .exporter     import ExportPMDL, menu_func_export
-from .logic_patch  import ImportPatch, ExportPatch, menu_func_import_patch, menu_func_export_patch
+from .dependencies  import instalar_dependencias
+from .importer      import ImportPMDL, menu_func_import
+from .exporter      import ExportPMDL, menu_func_export
+from .exportar_lote import ExportLotePMDL, menu_func_export_lote
+from .logic_patch   import ImportPatch, ExportPatch, menu_func_import_patch, menu_func_export_patch
+from .logic_patch   import AplicarPaletaParches, menu_func_paleta_lote
 
 
 def register():
@@ -23,11 +25,15 @@ def register():
     bpy.utils.register_class(ExportPMDL)
     bpy.utils.register_class(ImportPatch)
     bpy.utils.register_class(ExportPatch)
+    bpy.utils.register_class(ExportLotePMDL)
+    bpy.utils.register_class(AplicarPaletaParches)
 
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import_patch)
     bpy.types.TOPBAR_MT_file_export.append(menu_func_export)
     bpy.types.TOPBAR_MT_file_export.append(menu_func_export_patch)
+    bpy.types.TOPBAR_MT_file_export.append(menu_func_export_lote)
+    bpy.types.TOPBAR_MT_file_export.append(menu_func_paleta_lote)
 
 
 def unregister():
@@ -35,11 +41,15 @@ def unregister():
     bpy.utils.unregister_class(ExportPMDL)
     bpy.utils.unregister_class(ImportPatch)
     bpy.utils.unregister_class(ExportPatch)
+    bpy.utils.unregister_class(ExportLotePMDL)
+    bpy.utils.unregister_class(AplicarPaletaParches)
 
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import_patch)
     bpy.types.TOPBAR_MT_file_export.remove(menu_func_export)
     bpy.types.TOPBAR_MT_file_export.remove(menu_func_export_patch)
+    bpy.types.TOPBAR_MT_file_export.remove(menu_func_export_lote)
+    bpy.types.TOPBAR_MT_file_export.remove(menu_func_paleta_lote)
 
 
 if __name__ == "__main__":
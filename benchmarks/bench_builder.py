@@ -0,0 +1,169 @@
+"""
+Benchmark de construccion de mallas: ruta foreach_set de builder contra la ruta
+bmesh anterior (vertice por vertice), sobre partes sinteticas de 1k a 100k vertices.
+
+Uso (desde la carpeta que contiene el addon):
+    blender -b --factory-startup --python pmdl_addon/benchmarks/bench_builder.py
+
+Ademas de los tiempos comprueba que ambas rutas producen la misma topologia,
+las mismas posiciones, las mismas UVs por esquina y los mismos pesos. Las
+posiciones sinteticas son aleatorias, asi que no hay triangulos degenerados
+(que la ruta nueva descarta y bmesh conservaba).
+"""
+
+import os
+import sys
+import time
+
+import bmesh
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar
+
+builder        = cargar('builder')
+pmdl_model     = cargar('pmdl_model')
+nombres_huesos = cargar('nombres_huesos')
+
+TAMANOS = (1_000, 10_000, 100_000)
+ESCALA  = 0.015625
+
+
+def parte_sintetica(num_vertices, semilla=0):
+    """Parte con tiras de 8 a 64 vertices, 1 a 4 huesos por subparte y pesos al azar."""
+    rnd       = np.random.default_rng(semilla)
+    subpartes = []
+    restantes = num_vertices
+    while restantes > 0:
+        n   = int(min(restantes, rnd.integers(8, 65)))
+        k   = int(rnd.integers(1, 5))
+        ids = [int(h) for h in rnd.choice(32, size=k, replace=False)]
+        pesos = rnd.integers(0, 0x7F81, size=(n, k)).astype(np.float32) / 32640.0
+        pesos[rnd.random((n, k)) < 0.3] = 0.0
+        subpartes.append(pmdl_model.PmdlSubpart.desde_arrays(
+            indice       = len(subpartes),
+            num_vertices = n,
+            num_huesos   = k,
+            huesos_ids   = ids,
+            offset       = 0,
+            coords       = rnd.integers(-32768, 32768, size=(n, 3), dtype=np.int16),
+            uvs          = rnd.integers(0, 256, size=(n, 2), dtype=np.uint8),
+            pesos        = pesos,
+        ))
+        restantes -= n
+
+    return pmdl_model.PmdlPart(
+        indice=0, capa=0, opacidad=0xFFFF, offset=0, longitud=0,
+        flag_especial=0, flag_bytes_raw='00000000', nombre_flag='Ninguna',
+        subpartes=subpartes,
+    )
+
+
+def crear_bmesh(parte, coleccion):
+    """Ruta anterior de builder._crear_objeto_mesh (solo geometria, UVs y pesos)."""
+    mesh = bpy.data.meshes.new("bmesh")
+    obj  = bpy.data.objects.new("bmesh", mesh)
+    coleccion.objects.link(obj)
+
+    bm           = bmesh.new()
+    uv_layer     = bm.loops.layers.uv.new("UVMap")
+    deform_layer = bm.verts.layers.deform.new()
+
+    vertex_groups_map = {}
+    for hid in sorted({h for sub in parte['subpartes'] for h in sub['huesos_ids']}):
+        nombre_vg = nombres_huesos.obtener_nombre_hueso(hid, False, {})
+        vertex_groups_map[hid] = obj.vertex_groups.new(name=nombre_vg).index
+
+    for subparte in parte['subpartes']:
+        vertices_bm  = []
+        vertices_sub = subparte['vertices']
+
+        for vertice in vertices_sub:
+            v = bm.verts.new((
+                 vertice['coord_x'] * ESCALA,
+                 vertice['coord_z'] * ESCALA,
+                -vertice['coord_y'] * ESCALA,
+            ))
+            for hid, peso in zip(subparte['huesos_ids'], vertice['pesos']):
+                if hid in vertex_groups_map and peso > 0.0:
+                    v[deform_layer][vertex_groups_map[hid]] = peso
+            vertices_bm.append(v)
+
+        for i in range(len(vertices_bm) - 2):
+            v1, v2, v3 = vertices_bm[i], vertices_bm[i+1], vertices_bm[i+2]
+            if i % 2 == 0:
+                verts_face, uv_indices = [v1, v2, v3], [i, i+1, i+2]
+            else:
+                verts_face, uv_indices = [v1, v3, v2], [i, i+2, i+1]
+            try:
+                face = bm.faces.new(verts_face)
+                for j, loop in enumerate(face.loops):
+                    ud = vertices_sub[uv_indices[j]]
+                    loop[uv_layer].uv = (ud['uv_x'] / 255.0, 1.0 - (ud['uv_y'] / 255.0))
+            except ValueError:
+                continue
+
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.update()
+    return obj
+
+
+def crear_foreach(parte, coleccion):
+    return builder._crear_objeto_mesh(
+        parte=parte, coleccion=coleccion, material=builder.crear_material_tex_ttt(),
+        armature_obj=None, escala=ESCALA, factor_x=1.0, factor_y=1.0, factor_z=1.0,
+        renombrar_huesos=False, nombres_huesos={},
+    )
+
+
+def volcar(obj):
+    """Arrays comparables de una malla: co, vertices por esquina, uv por esquina, pesos."""
+    mesh = obj.data
+    co   = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    esquinas = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", esquinas)
+    uv = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    mesh.uv_layers["UVMap"].data.foreach_get("uv", uv)
+
+    nombres = {vg.index: vg.name for vg in obj.vertex_groups}
+    pesos   = [
+        sorted((nombres[g.group], g.weight) for g in v.groups)
+        for v in mesh.vertices
+    ]
+    return co, esquinas, uv, pesos
+
+
+def main():
+    coleccion = bpy.data.collections.new("bench_builder")
+    bpy.context.scene.collection.children.link(coleccion)
+
+    print(f"\n{'vertices':>9} {'bmesh':>10} {'foreach':>10} {'x':>6}  iguales")
+    for n in TAMANOS:
+        parte = parte_sintetica(n)
+
+        t0 = time.perf_counter()
+        obj_bm = crear_bmesh(parte, coleccion)
+        t1 = time.perf_counter()
+        obj_fs = crear_foreach(parte, coleccion)
+        t2 = time.perf_counter()
+
+        a, b    = volcar(obj_bm), volcar(obj_fs)
+        iguales = (np.array_equal(a[0], b[0]) and np.array_equal(a[1], b[1])
+                   and np.array_equal(a[2], b[2]) and a[3] == b[3])
+
+        print(f"{n:>9} {1e3 * (t1 - t0):>8.1f}ms {1e3 * (t2 - t1):>8.1f}ms "
+              f"{(t1 - t0) / (t2 - t1):>6.1f}  {'si' if iguales else 'NO'}")
+
+        for obj in (obj_bm, obj_fs):
+            mesh = obj.data
+            bpy.data.objects.remove(obj)
+            bpy.data.meshes.remove(mesh)
+
+    bpy.data.collections.remove(coleccion)
+
+
+if __name__ == "__main__":
+    main()
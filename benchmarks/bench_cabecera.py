@@ -0,0 +1,154 @@
+"""
+Benchmark de la lectura de la cabecera y de las tablas de partes y subpartes:
+Registro de formato_pmdl (memoryview + struct.unpack_from de la entrada completa)
+contra las lecturas campo a campo con leer_uint32/leer_uint16/leer_float32 que
+usaba el parser antes.
+
+No necesita Blender:
+    python pmdl_addon/benchmarks/bench_cabecera.py
+
+Solo mide el indice (analizar_pmdl_bytes con diferido=True, sin vertices) con
+los 0xFF de los IDs de hueso ya resueltos, y comprueba que ambas lecturas dan los
+mismos valores.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar, medir
+from pmdl_sintetico import pmdl_sintetico
+
+binary_utils = cargar('binary_utils')
+pmdl_parser  = cargar('pmdl_parser')
+
+leer_uint32  = binary_utils.leer_uint32
+leer_uint16  = binary_utils.leer_uint16
+leer_uint8   = binary_utils.leer_uint8
+leer_float32 = binary_utils.leer_float32
+
+PARTES            = (20, 200, 2000)
+SUBPARTES_PARTE   = 8
+VERTICES_SUBPARTE = 4
+REPETICIONES      = 20
+
+
+def cabecera_campos(blob):
+    """Lectura anterior de la cabecera: un leer_* por campo."""
+    return (
+        blob[0:4].decode('ascii', errors='ignore'),
+        leer_float32(blob, 0x40),
+        leer_float32(blob, 0x44),
+        leer_float32(blob, 0x48),
+        leer_uint32(blob, 0x08),
+        leer_uint32(blob, 0x50),
+        leer_uint32(blob, 0x5C),
+        leer_uint32(blob, 0x60),
+    )
+
+
+def cabecera_registro(blob):
+    info, _ = pmdl_parser.leer_cabecera_pmdl(blob)
+    return (info.tipo, info.grosor_x, info.grosor_y, info.grosor_z, info.cantidad_huesos,
+            info.offset_huesos, info.cantidad_partes, info.offset_indice_partes)
+
+
+def indice_campos(blob):
+    """
+    Recorrido anterior de la tabla de partes y de las subpartes: los mismos dicts
+    que armaba analizar_pmdl, sin leer los vertices.
+    """
+    cantidad_partes      = leer_uint32(blob, 0x5C)
+    offset_indice_partes = leer_uint32(blob, 0x60)
+    ids_previas          = [None, None, None, None]
+    partes               = []
+
+    for i in range(cantidad_partes):
+        entrada_offset = offset_indice_partes + (i * 0x20)
+        if entrada_offset + 0x20 > len(blob):
+            break
+
+        capa          = leer_uint16(blob, entrada_offset + 0x00)
+        opacidad      = leer_uint16(blob, entrada_offset + 0x02)
+        part_offset   = leer_uint32(blob, entrada_offset + 0x04)
+        part_length   = leer_uint32(blob, entrada_offset + 0x08)
+        flag_especial = leer_uint32(blob, entrada_offset + 0x0C)
+        flag_bytes    = blob[entrada_offset + 0x0C : entrada_offset + 0x10]
+        datos_parte   = blob[part_offset : part_offset + part_length]
+
+        subpartes = []
+        for j in range(leer_uint32(datos_parte, 0x00)):
+            sub_offset = 0x04 + (j * 0x10)
+            if sub_offset + 0x10 > len(datos_parte):
+                break
+
+            num_vertices = leer_uint16(datos_parte, sub_offset + 0x00)
+            num_huesos   = leer_uint16(datos_parte, sub_offset + 0x02)
+
+            huesos_ids = []
+            for k in range(num_huesos):
+                hueso_id = leer_uint8(datos_parte, sub_offset + 0x04 + k)
+                if hueso_id == 0xFF:
+                    hueso_id = ids_previas[k] if ids_previas[k] is not None else 0xFF
+                huesos_ids.append(hueso_id)
+                ids_previas[k] = hueso_id
+
+            subpartes.append({
+                'indice'      : j,
+                'num_vertices': num_vertices,
+                'num_huesos'  : num_huesos,
+                'huesos_ids'  : huesos_ids,
+                'offset'      : leer_uint32(datos_parte, sub_offset + 0x0C),
+            })
+
+        partes.append({
+            'indice'            : i,
+            'capa'              : capa,
+            'opacidad'          : opacidad,
+            'offset'            : part_offset,
+            'longitud'          : part_length,
+            'flag_especial'     : flag_especial,
+            'flag_bytes_raw'    : flag_bytes.hex(),
+            'nombre_flag'       : binary_utils.FLAGS_ESPECIALES.get(flag_especial, "Desconocido"),
+            'subpartes'         : subpartes,
+            'cantidad_subpartes': len(subpartes),
+        })
+
+    return partes
+
+
+def indice_registro(blob):
+    info, _ = pmdl_parser.analizar_pmdl_bytes(blob, "bench", diferido=True)
+    return info.partes
+
+
+def resumen(partes):
+    """Valores comparables de los dicts anteriores y de los PmdlPart/PmdlSubpart."""
+    return [(p['capa'], p['opacidad'], p['offset'], p['longitud'], p['flag_especial'],
+             p['flag_bytes_raw'], [(s['num_vertices'], s['num_huesos'], list(s['huesos_ids']),
+                                    s['offset']) for s in p['subpartes']])
+            for p in partes]
+
+
+def main():
+    pmdl_parser.print = lambda *a, **k: None
+
+    blob = pmdl_sintetico(1)
+    t_campos, a = medir(cabecera_campos, blob, repeticiones=REPETICIONES)
+    t_reg, b    = medir(cabecera_registro, blob, repeticiones=REPETICIONES)
+    print(f"\ncabecera: campos {1e6 * t_campos:.1f}us, Registro {1e6 * t_reg:.1f}us, "
+          f"iguales {'si' if a == b else 'NO'}")
+
+    print(f"\n{'partes':>7} {'subpartes':>9} {'campos':>10} {'Registro':>10} {'x':>6}  iguales")
+    for partes in PARTES:
+        blob = pmdl_sintetico(partes * SUBPARTES_PARTE * VERTICES_SUBPARTE,
+                              vertices_subparte=VERTICES_SUBPARTE, subpartes_parte=SUBPARTES_PARTE)
+
+        t_campos, a = medir(indice_campos, blob, repeticiones=REPETICIONES)
+        t_reg, b    = medir(indice_registro, blob, repeticiones=REPETICIONES)
+        print(f"{partes:>7} {partes * SUBPARTES_PARTE:>9} {1e3 * t_campos:>8.2f}ms "
+              f"{1e3 * t_reg:>8.2f}ms {t_campos / t_reg:>6.1f}  {'si' if resumen(a) == resumen(b) else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark de la codificacion de coordenadas y UVs de codificador_pmdl: ruta NumPy
+(foreach_get + vista estructurada del blob) contra el bucle anterior vertice por
+vertice, sobre mallas sinteticas de 1k a 100k vertices.
+
+Uso (desde la carpeta que contiene el addon):
+    blender -b --factory-startup --python pmdl_addon/benchmarks/bench_export.py
+
+Ademas de los tiempos comprueba que ambas rutas escriben exactamente los mismos bytes.
+"""
+
+import math
+import os
+import struct
+import sys
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar
+
+codificador  = cargar('codificador_pmdl')
+datos_malla  = cargar('datos_malla')
+formato_pmdl = cargar('formato_pmdl')
+
+TAMANOS  = (1_000, 10_000, 100_000)
+FACTORES = (300.0 / 512.0, 1.0, 410.5 / 512.0)
+
+
+def objeto_sintetico(num_vertices, coleccion, semilla=0):
+    """Malla en tira con posiciones y UVs al azar y una transformacion no trivial."""
+    rnd   = np.random.default_rng(semilla)
+    verts = rnd.uniform(-4.0, 4.0, size=(num_vertices, 3)).tolist()
+    caras = [(i, i + 1, i + 2) for i in range(num_vertices - 2)]
+
+    mesh = bpy.data.meshes.new("bench_export")
+    mesh.from_pydata(verts, [], caras)
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", rnd.uniform(-0.1, 1.1, size=len(mesh.loops) * 2).astype(np.float32))
+
+    obj = bpy.data.objects.new("bench_export", mesh)
+    coleccion.objects.link(obj)
+    obj.location       = (0.3, -1.2, 0.7)
+    obj.rotation_euler = (0.0, 0.0, math.radians(33.0))
+    obj.scale          = (1.5, 1.5, 1.5)
+    bpy.context.view_layer.update()
+    return obj
+
+
+def codificar_bucle(obj, blob, factor_x, factor_y, factor_z):
+    """Bucle anterior de exportar_pmdl (sin pesos): UV del primer loop y coords por vertice."""
+    mesh     = obj.data
+    uv_layer = mesh.uv_layers.active
+
+    uv_por_vert = {}
+    for loop in mesh.loops:
+        vi = loop.vertex_index
+        if vi not in uv_por_vert:
+            uv = uv_layer.data[loop.index].uv
+            uv_por_vert[vi] = (uv.x, uv.y)
+
+    for indice, vert in enumerate(mesh.vertices):
+        pos_uv     = indice * 8
+        pos_coords = pos_uv + 2
+        if indice in uv_por_vert:
+            u, v_uv = uv_por_vert[indice]
+            blob[pos_uv]     = max(0, min(255, int(round(u * 255.0))))
+            blob[pos_uv + 1] = max(0, min(255, int(round((1.0 - v_uv) * 255.0))))
+
+        co_world   = obj.matrix_world @ vert.co
+        bx, by, bz = co_world.x, co_world.y, co_world.z
+        cx = bx / (codificador.ESCALA_EXPORT * factor_x)
+        cy = -bz / (codificador.ESCALA_EXPORT * factor_y)
+        cz = by / (codificador.ESCALA_EXPORT * factor_z)
+        struct.pack_into('<h', blob, pos_coords,     max(-32768, min(32767, int(round(cx)))))
+        struct.pack_into('<h', blob, pos_coords + 2, max(-32768, min(32767, int(round(cy)))))
+        struct.pack_into('<h', blob, pos_coords + 4, max(-32768, min(32767, int(round(cz)))))
+
+
+def codificar_numpy(obj, blob, factor_x, factor_y, factor_z):
+    """Ruta nueva de exportar_pmdl (sin pesos; la malla no tiene vertex groups)."""
+    datos       = datos_malla.leer_datos_malla(obj)
+    coords      = codificador.coords_pmdl_objeto(datos, (factor_x, factor_y, factor_z))
+    uvs, con_uv = codificador.uvs_pmdl_objeto(datos)
+    registros   = np.frombuffer(blob, dtype=formato_pmdl.dtype_vertice(0), count=len(coords))
+    registros['coords']     = coords
+    registros['uv'][con_uv] = uvs[con_uv]
+
+
+def main():
+    coleccion = bpy.data.collections.new("bench_export")
+    bpy.context.scene.collection.children.link(coleccion)
+
+    print(f"\n{'vertices':>9} {'bucle':>10} {'numpy':>10} {'x':>6}  iguales")
+    for n in TAMANOS:
+        obj = objeto_sintetico(n, coleccion)
+        a   = bytearray(n * 8)
+        b   = bytearray(n * 8)
+
+        t0 = time.perf_counter()
+        codificar_bucle(obj, a, *FACTORES)
+        t1 = time.perf_counter()
+        codificar_numpy(obj, b, *FACTORES)
+        t2 = time.perf_counter()
+
+        print(f"{n:>9} {1e3 * (t1 - t0):>8.1f}ms {1e3 * (t2 - t1):>8.1f}ms "
+              f"{(t1 - t0) / (t2 - t1):>6.1f}  {'si' if a == b else 'NO'}")
+
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+
+    bpy.data.collections.remove(coleccion)
+
+
+if __name__ == "__main__":
+    main()
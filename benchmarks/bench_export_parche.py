@@ -0,0 +1,120 @@
+"""
+Benchmark de la exportacion de un parche: codificacion en serie del PMDL principal
+y de cada cara PMDF contra codificador_pmdl.codificar_en_paralelo, con todas las partes
+modificadas (ninguna se puede reutilizar por huella).
+
+No necesita Blender:
+    python pmdl_addon/benchmarks/bench_export_parche.py PARCHE.PCK1
+
+Las mallas se arman directamente desde el parche (sin crear objetos en Blender),
+con cada vertice desplazado medio paso de cuantizacion para que cambien los bytes.
+Ademas de los tiempos comprueba que ambas rutas producen el mismo parche.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar, medir
+
+codificador    = cargar('codificador_pmdl')
+datos_malla    = cargar('datos_malla')
+pmdl_parser    = cargar('pmdl_parser')
+nombres_huesos = cargar('nombres_huesos')
+patch_parser   = cargar('logic_patch.patch_parser')
+
+
+def mallas_modificadas(info):
+    """DatosMalla de cada parte tal como la importaria builder, con los vertices desplazados."""
+    escala  = codificador.ESCALA_EXPORT
+    factor  = [g / codificador.GROSOR_MAXIMO if g > 0 else 1.0
+               for g in (info.grosor_x, info.grosor_y, info.grosor_z)]
+    mallas  = []
+    for parte in info.partes:
+        subpartes = parte.subpartes
+        huesos    = sorted({hid for sub in subpartes for hid in sub.huesos_ids})
+        columna   = {hid: g for g, hid in enumerate(huesos)}
+        coords    = np.concatenate([sub.coords for sub in subpartes]).astype(np.float64) + 0.5
+        uvs       = np.concatenate([sub.uvs for sub in subpartes]).astype(np.float64)
+
+        pesos = np.zeros((len(coords), len(huesos) + 1), dtype=np.float32)
+        base  = 0
+        for sub in subpartes:
+            for j, hid in enumerate(sub.huesos_ids):
+                pesos[base : base + len(sub.pesos), columna[hid]] = sub.pesos[:, j]
+            base += len(sub.pesos)
+
+        co = np.stack((
+             coords[:, 0] * escala * factor[0],
+             coords[:, 2] * escala * factor[2],
+            -coords[:, 1] * escala * factor[1],
+        ), axis=1).astype(np.float32)
+
+        mallas.append(datos_malla.DatosMalla(
+            nombre       = f"Parte_{parte.indice:02d}",
+            co           = co,
+            matriz       = np.eye(4, dtype=np.float32),
+            vertice_loop = np.arange(len(co), dtype=np.int32),
+            uv_loop      = np.stack((uvs[:, 0] / 255.0, 1.0 - uvs[:, 1] / 255.0), axis=1).astype(np.float32),
+            pesos        = pesos,
+            grupos       = [nombres_huesos.obtener_nombre_hueso(hid, False, {}) for hid in huesos],
+            propiedades  = {'PMDL_Capa': parte.capa, 'PMDL_Flag': parte.flag_especial},
+        ))
+    return mallas
+
+
+def modelos_del_parche(info_patch):
+    """(inicio, fin, mallas) del PMDL principal y de cada cara PMDF."""
+    blob    = info_patch['blob']
+    rangos  = [(info_patch['pmdl_inicio'], info_patch['pmdl_fin'])]
+    rangos += [(cara['inicio'], cara['fin']) for cara in patch_parser.leer_caras_pmdf(blob)]
+
+    modelos = []
+    for inicio, fin in rangos:
+        info, error = pmdl_parser.analizar_pmdl_bytes(blob, 'bench', offset=inicio, tamano=fin - inicio)
+        if error:
+            continue
+        modelos.append((inicio, fin, mallas_modificadas(info)))
+    return modelos
+
+
+def trabajos_para(blob, modelos):
+    vista = memoryview(blob)
+    return [dict(blob=vista[inicio:fin], mallas=mallas, armature=None)
+            for inicio, fin, mallas in modelos]
+
+
+def en_serie(original, modelos):
+    blob = bytearray(original)
+    for trabajo in trabajos_para(blob, modelos):
+        codificador.codificar_pmdl(**trabajo)
+    return blob
+
+
+def en_paralelo(original, modelos):
+    blob = bytearray(original)
+    codificador.codificar_en_paralelo(trabajos_para(blob, modelos))
+    return blob
+
+
+def main():
+    argumentos = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]
+    info_patch, error = patch_parser.leer_parche(argumentos[0])
+    if error:
+        raise SystemExit(error)
+
+    original = bytes(info_patch['blob'])
+    modelos  = modelos_del_parche(info_patch)
+    vertices = sum(len(m.co) for _, _, mallas in modelos for m in mallas)
+    print(f"\n{len(modelos)} modelos, {vertices} vertices, {os.cpu_count()} CPUs")
+
+    t_serie, a    = medir(en_serie, original, modelos)
+    t_paralelo, b = medir(en_paralelo, original, modelos)
+    print(f"serie {1e3 * t_serie:.1f}ms  paralelo {1e3 * t_paralelo:.1f}ms  "
+          f"x{t_serie / t_paralelo:.2f}  iguales: {'si' if a == b else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
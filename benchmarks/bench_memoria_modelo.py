@@ -0,0 +1,158 @@
+"""
+Benchmark de memoria del modelo analizado: dicts anidados que retornaba antes
+analizar_pmdl (un dict por parte, subparte y vertice) contra PmdlModel con los
+vertices en arrays por subparte, sobre un PMDL sintetico de ~10k vertices.
+
+No necesita Blender:
+    python pmdl_addon/benchmarks/bench_memoria_modelo.py
+
+Mide con tracemalloc la memoria que queda retenida por el resultado y el pico
+durante el analisis. El blob del archivo se crea antes de medir y no cuenta.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench_parser
+from comun import cargar
+from pmdl_sintetico import pmdl_sintetico
+
+binary_utils = cargar('binary_utils')
+pmdl_parser  = cargar('pmdl_parser')
+
+leer_uint32  = binary_utils.leer_uint32
+leer_uint16  = binary_utils.leer_uint16
+leer_uint8   = binary_utils.leer_uint8
+leer_float32 = binary_utils.leer_float32
+
+NUM_VERTICES = 10_000
+NUM_HUESOS   = 4
+
+
+def analizar_subpartes_dicts(datos_parte, ids_previas_global):
+    """analizar_subpartes anterior: un dict por subparte con su lista de vertices."""
+    if len(datos_parte) < 4:
+        return [], ids_previas_global
+
+    cantidad_subpartes = leer_uint32(datos_parte, 0x00)
+    subpartes          = []
+    ids_previas        = list(ids_previas_global)
+
+    for i in range(cantidad_subpartes):
+        entrada_offset = 0x04 + (i * 0x10)
+        if entrada_offset + 0x10 > len(datos_parte):
+            break
+
+        num_vertices = leer_uint16(datos_parte, entrada_offset + 0x00)
+        num_huesos   = leer_uint16(datos_parte, entrada_offset + 0x02)
+
+        huesos_ids = []
+        for j in range(num_huesos):
+            if entrada_offset + 0x04 + j < len(datos_parte):
+                hueso_id = leer_uint8(datos_parte, entrada_offset + 0x04 + j)
+                if hueso_id == 0xFF:
+                    hueso_id = ids_previas[j] if ids_previas[j] is not None else 0xFF
+                huesos_ids.append(hueso_id)
+                ids_previas[j] = hueso_id
+
+        offset_subparte = leer_uint32(datos_parte, entrada_offset + 0x0C)
+        vertices        = bench_parser.leer_vertices_bucle(datos_parte, offset_subparte,
+                                                           num_vertices, num_huesos)
+        subpartes.append({
+            'indice'      : i,
+            'num_vertices': num_vertices,
+            'num_huesos'  : num_huesos,
+            'huesos_ids'  : huesos_ids,
+            'offset'      : offset_subparte,
+            'vertices'    : vertices,
+        })
+
+    return subpartes, ids_previas
+
+
+def analizar_pmdl_dicts(blob, nombre):
+    """analizar_pmdl anterior (sobre bytes ya leidos): dicts anidados."""
+    info = {
+        'nombre'              : nombre,
+        'filepath'            : '',
+        'tipo'                : blob[0:4].decode('ascii', errors='ignore'),
+        'grosor_x'            : leer_float32(blob, 0x40),
+        'grosor_y'            : leer_float32(blob, 0x44),
+        'grosor_z'            : leer_float32(blob, 0x48),
+        'cantidad_huesos'     : leer_uint32(blob, 0x08),
+        'offset_huesos'       : leer_uint32(blob, 0x50),
+        'cantidad_partes'     : leer_uint32(blob, 0x5C),
+        'offset_indice_partes': leer_uint32(blob, 0x60),
+        'blob'                : blob,
+    }
+
+    ids_previas_global = [None, None, None, None]
+    partes             = []
+    for i in range(info['cantidad_partes']):
+        entrada_offset = info['offset_indice_partes'] + (i * 0x20)
+        if entrada_offset + 0x20 > len(blob):
+            break
+
+        flag_especial = leer_uint32(blob, entrada_offset + 0x0C)
+        part_offset   = leer_uint32(blob, entrada_offset + 0x04)
+        part_length   = leer_uint32(blob, entrada_offset + 0x08)
+        datos_parte   = blob[part_offset : part_offset + part_length]
+        subpartes, ids_previas_global = analizar_subpartes_dicts(datos_parte, ids_previas_global)
+
+        partes.append({
+            'indice'            : i,
+            'capa'              : leer_uint16(blob, entrada_offset + 0x00),
+            'opacidad'          : leer_uint16(blob, entrada_offset + 0x02),
+            'offset'            : part_offset,
+            'longitud'          : part_length,
+            'flag_especial'     : flag_especial,
+            'flag_bytes_raw'    : blob[entrada_offset + 0x0C : entrada_offset + 0x10].hex(),
+            'nombre_flag'       : binary_utils.FLAGS_ESPECIALES.get(flag_especial, "Desconocido"),
+            'subpartes'         : subpartes,
+            'cantidad_subpartes': len(subpartes),
+        })
+
+    info['partes'] = partes
+    return info
+
+
+def analizar_pmdl_model(blob, nombre):
+    info, _ = pmdl_parser.analizar_pmdl_bytes(blob, nombre)
+    return info
+
+
+def medir_memoria(funcion, *args):
+    """Retorna (KiB retenidos por el resultado, KiB de pico, segundos, resultado)."""
+    tracemalloc.start()
+    t0        = time.perf_counter()
+    resultado = funcion(*args)
+    t         = time.perf_counter() - t0
+    retenido, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retenido / 1024, pico / 1024, t, resultado
+
+
+def contar_vertices(partes):
+    return sum(len(sub['vertices']) if isinstance(sub, dict) else len(sub.coords)
+               for parte in partes for sub in parte['subpartes'])
+
+
+def main():
+    blob = pmdl_sintetico(NUM_VERTICES, NUM_HUESOS)
+    pmdl_parser.print = lambda *a, **k: None
+
+    print(f"\nPMDL sintetico: {len(blob) / 1024:.0f} KiB, {NUM_HUESOS} huesos por vertice "
+          f"(el blob no se cuenta)")
+    print(f"{'modelo':<10} {'vertices':>9} {'retenido':>11} {'pico':>11} {'tiempo':>10}")
+    for nombre, funcion in (("dicts", analizar_pmdl_dicts), ("PmdlModel", analizar_pmdl_model)):
+        retenido, pico, t, info = medir_memoria(funcion, blob, "bench")
+        print(f"{nombre:<10} {contar_vertices(info['partes']):>9} {retenido:>7.0f} KiB "
+              f"{pico:>7.0f} KiB {1e3 * t:>8.1f}ms")
+        del info
+
+
+if __name__ == "__main__":
+    main()
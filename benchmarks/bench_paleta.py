@@ -0,0 +1,104 @@
+"""
+Benchmark de los recoloreados de textura:
+  1. tex_encoder.textura_a_parche sobre una imagen recoloreada (solo se reescribe
+     la paleta) contra la codificacion completa (cuantizar + entrelazar).
+  2. recoloreado.aplicar_paleta_a_parches sobre COPIAS copias de un parche.
+
+No necesita Blender:
+    python pmdl_addon/benchmarks/bench_paleta.py PARCHE.PCK1 [COPIAS]
+
+Las copias se escriben en un directorio temporal; el parche original no se toca.
+Comprueba que el recoloreado vuelve exactamente igual y que los indices no cambian.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar, medir
+
+tex_codec    = cargar('logic_patch.tex_codec')
+tex_encoder  = cargar('logic_patch.tex_encoder')
+patch_parser = cargar('logic_patch.patch_parser')
+recoloreado  = cargar('logic_patch.recoloreado')
+
+
+def decodificar(blob, textura):
+    return tex_codec.decodificar_rgba(blob, textura['indices_offset'], textura['paleta_offset'],
+                                      textura['formato'])
+
+
+def recolorear(paleta):
+    """Paleta con los canales rotados (R->G->B) y el alfa intacto."""
+    nueva        = paleta.copy()
+    nueva[:, :3] = np.roll(paleta[:, :3], 1, axis=1)
+    return nueva
+
+
+def codificacion_completa(blob, textura, rgba):
+    indices_bytes, paleta_bytes, _ = tex_encoder.codificar_rgba(rgba, textura['formato'])
+    blob[textura['indices_offset'] : textura['indices_offset'] + len(indices_bytes)] = indices_bytes
+    blob[textura['paleta_offset'] : textura['paleta_offset'] + len(paleta_bytes)]   = paleta_bytes
+    return 'completa'
+
+
+def main():
+    argumentos = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]
+    ruta       = argumentos[0]
+    copias     = int(argumentos[1]) if len(argumentos) > 1 else 100
+
+    with open(ruta, 'rb') as f:
+        original = f.read()
+    texturas, error = patch_parser.leer_texturas(original)
+    if error:
+        raise SystemExit(error)
+    textura = texturas[0]
+    formato = textura['formato']
+    paleta  = recolorear(tex_codec.leer_paleta(original, textura['paleta_offset'], formato))
+
+    # Imagen recoloreada tal como la veria el exportador
+    referencia = bytearray(original)
+    referencia[textura['paleta_offset'] : textura['paleta_offset'] + formato.tamano_paleta] = paleta.tobytes()
+    rgba = decodificar(referencia, textura)
+
+    print(f"\n{'camino':<22} {'tiempo':>10}  resultado")
+    for nombre, funcion in (("solo paleta", tex_encoder.textura_a_parche),
+                            ("codificacion completa", codificacion_completa)):
+        t, estado = medir(lambda: funcion(bytearray(original), textura, rgba))
+        blob = bytearray(original)
+        funcion(blob, textura, rgba)
+        fin_indices = textura['indices_offset'] + formato.tamano_indices
+        iguales     = np.array_equal(decodificar(blob, textura), rgba)
+        indices     = blob[textura['indices_offset'] : fin_indices] == original[textura['indices_offset'] : fin_indices]
+        print(f"{nombre:<22} {1e3 * t:>8.1f}ms  {estado}, imagen {'igual' if iguales else 'distinta'}, "
+              f"indices {'sin cambios' if indices else 'reescritos'}")
+
+    directorio = tempfile.mkdtemp(prefix="bench_paleta_")
+    salida     = os.path.join(directorio, "salida")
+    os.mkdir(salida)
+    try:
+        rutas = []
+        for i in range(copias):
+            rutas.append(os.path.join(directorio, f"{i:04d}_{os.path.basename(ruta)}"))
+            shutil.copyfile(ruta, rutas[-1])
+
+        t0         = time.perf_counter()
+        resultados = recoloreado.aplicar_paleta_a_parches(rutas, paleta.tobytes(), 0, salida)
+        t_lote     = time.perf_counter() - t0
+
+        with open(os.path.join(salida, os.path.basename(rutas[-1])), 'rb') as f:
+            igual = f.read() == bytes(referencia)
+        errores = sum(1 for _, error in resultados if error)
+        print(f"\nlote: {copias} parches en {t_lote:.2f}s ({1e3 * t_lote / copias:.2f}ms por parche), "
+              f"{errores} errores, resultado {'igual' if igual else 'DISTINTO'} a la referencia")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark de pmdl_parser.decodificar_vertices (vista estructurada de NumPy) contra
+el bucle por vertice que usaba el parser antes (un dict por vertice), sobre
+subpartes sinteticas de 1k a 100k vertices con 1 y 4 huesos por vertice.
+
+No necesita Blender:
+    python pmdl_addon/benchmarks/bench_parser.py
+
+Ademas de los tiempos comprueba que ambos decodificadores dan los mismos valores.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar, medir
+
+binary_utils = cargar('binary_utils')
+pmdl_parser  = cargar('pmdl_parser')
+
+leer_uint8 = binary_utils.leer_uint8
+leer_int16 = binary_utils.leer_int16
+
+TAMANOS = (1_000, 10_000, 100_000)
+HUESOS  = (1, 4)
+
+
+def leer_vertices_bucle(datos_parte, offset_subparte, num_vertices, num_huesos):
+    """Decodificador anterior: pesos byte a byte y un dict por vertice."""
+    vertices       = []
+    tamano_pesos   = num_huesos * 2
+    tamano_vertice = tamano_pesos + 2 + 6
+    pos            = offset_subparte
+
+    for i in range(num_vertices):
+        if pos + tamano_vertice > len(datos_parte):
+            break
+
+        pesos = []
+        for j in range(num_huesos):
+            if pos + (j * 2) + 2 <= len(datos_parte):
+                byte1    = leer_uint8(datos_parte, pos + (j * 2))
+                byte2    = leer_uint8(datos_parte, pos + (j * 2) + 1)
+                peso_raw = (byte1 << 8) | byte2  # big-endian
+
+                if peso_raw <= 0x0080:
+                    peso_norm = 0.0
+                elif peso_raw >= 0x8000:
+                    peso_norm = 1.0
+                else:
+                    peso_norm = (peso_raw - 128) / 32640.0
+            else:
+                peso_norm = 0.0
+
+            pesos.append(peso_norm)
+
+        pos += tamano_pesos
+
+        uv_x   = leer_uint8(datos_parte, pos)
+        uv_y   = leer_uint8(datos_parte, pos + 1)
+        pos   += 2
+
+        coord_x = leer_int16(datos_parte, pos)
+        coord_y = leer_int16(datos_parte, pos + 2)
+        coord_z = leer_int16(datos_parte, pos + 4)
+        pos    += 6
+
+        vertices.append({
+            'indice' : i,
+            'pesos'  : pesos,
+            'uv_x'   : uv_x,
+            'uv_y'   : uv_y,
+            'coord_x': coord_x,
+            'coord_y': coord_y,
+            'coord_z': coord_z,
+        })
+
+    return vertices
+
+
+def subparte_sintetica(num_vertices, num_huesos, semilla=0):
+    rnd = np.random.default_rng(semilla)
+    return rnd.integers(0, 256, num_vertices * (num_huesos * 2 + 8), dtype=np.uint8).tobytes()
+
+
+def iguales(vertices, pesos, uvs, coords):
+    if len(vertices) != len(pesos):
+        return False
+    return (np.array_equal(np.float32([v['pesos'] for v in vertices]), pesos)
+            and np.array_equal([(v['uv_x'], v['uv_y']) for v in vertices], uvs)
+            and np.array_equal([(v['coord_x'], v['coord_y'], v['coord_z']) for v in vertices], coords))
+
+
+def main():
+    print(f"\n{'vertices':>9} {'huesos':>6} {'bucle':>10} {'numpy':>10} {'x':>7}  iguales")
+    for n in TAMANOS:
+        for num_huesos in HUESOS:
+            datos = subparte_sintetica(n, num_huesos)
+
+            t_bucle, vertices = medir(leer_vertices_bucle, datos, 0, n, num_huesos)
+            t_numpy, arrays   = medir(pmdl_parser.decodificar_vertices, datos, 0, n, num_huesos)
+
+            print(f"{n:>9} {num_huesos:>6} {1e3 * t_bucle:>8.2f}ms {1e3 * t_numpy:>8.3f}ms "
+                  f"{t_bucle / t_numpy:>7.0f}  {'si' if iguales(vertices, *arrays) else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
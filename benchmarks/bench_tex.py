@@ -0,0 +1,134 @@
+"""
+Benchmark de la textura de los parches:
+  1. Decodificador: desentrelazado NumPy de tex_codec contra el bucle anterior
+     pixel por pixel (replica de ShowTex()), sobre texturas completas y truncadas.
+  2. Paso completo del import (decodificar + registrar en Blender): lista de
+     floats asignada a Image.pixels, contra array float32 y foreach_set.
+
+Uso (desde la carpeta que contiene el addon):
+    blender -b --factory-startup --python pmdl_addon/benchmarks/bench_tex.py
+
+Ademas de los tiempos comprueba que ambas rutas producen exactamente los mismos pixeles.
+"""
+
+import os
+import sys
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar, medir
+
+tex_codec   = cargar('logic_patch.tex_codec')
+tex_decoder = cargar('logic_patch.tex_decoder')
+
+TEX_HEADER = 0x80
+
+
+def decodificar_bucle(blob, indices_offset, paleta_offset):
+    """
+    Decodificador anterior: paleta en lista y 4 bucles while que escriben pixel por
+    pixel (antes sobre una imagen PIL, aqui sobre un array transparente).
+    """
+    paleta = []
+    for i in range(256):
+        off = paleta_offset + (i * 4)
+        if off + 3 < len(blob):
+            paleta.append((blob[off], blob[off + 1], blob[off + 2], blob[off + 3]))
+        else:
+            paleta.append((0, 0, 0, 255))
+
+    pixels = np.zeros((256, 256, 4), dtype=np.uint8)
+
+    num, num2, num3, num4 = 0, 0, 0, 32
+    while num4 != 0:
+        num5 = 16
+        while num5 != 0:
+            num6 = 0
+            while num6 < 8:
+                num7 = 0
+                while num7 < 16:
+                    if num3 < 65536:
+                        idx = indices_offset + num3
+                        if idx < len(blob):
+                            x = int(num7 + num)
+                            y = int(num6 + num2)
+                            if x < 256 and y < 256:
+                                pixels[y, x] = paleta[blob[idx]]
+                        num3 += 1
+                    num7 += 1
+                num6 += 1
+            if num + 2 < 256:
+                num += 16
+            num5 -= 1
+        if num2 + 2 < 256:
+            num2 += 8
+        num = 0
+        num4 -= 1
+
+    return pixels[::-1]
+
+
+def textura_sintetica(semilla, recorte=0):
+    """Cabecera + indices + paleta al azar; 'recorte' quita bytes del final."""
+    rnd  = np.random.default_rng(semilla)
+    blob = bytes(TEX_HEADER) + rnd.integers(0, 256, 0x10000 + 0x400, dtype=np.uint8).tobytes()
+    return blob[:len(blob) - recorte]
+
+
+def registrar_lista(blob, indices_offset, paleta_offset, nombre):
+    """Paso anterior del import: RGBA -> float64 -> lista de Python -> Image.pixels."""
+    rgba = decodificar_bucle(blob, indices_offset, paleta_offset)
+    arr  = rgba.astype(float) / 255.0
+
+    nombre_img = nombre + "_tex"
+    if nombre_img in bpy.data.images:
+        bpy.data.images.remove(bpy.data.images[nombre_img])
+
+    bl_img        = bpy.data.images.new(nombre_img, width=256, height=256, alpha=True)
+    bl_img.pixels = arr.flatten().tolist()
+    bl_img.pack()
+    bl_img.update()
+    return bl_img
+
+
+def registrar_array(blob, indices_offset, paleta_offset, nombre):
+    """Paso actual del import sin caches: decodificar con NumPy -> float32 -> foreach_set."""
+    rgba = tex_codec.decodificar_rgba(blob, indices_offset, paleta_offset)
+    return tex_decoder.imagen_blender_desde_rgba(rgba, nombre)
+
+
+def pixeles_de(bl_img):
+    pixeles = np.empty(len(bl_img.pixels), dtype=np.float32)
+    bl_img.pixels.foreach_get(pixeles)
+    return pixeles
+
+
+def main():
+    indices_offset = TEX_HEADER
+    paleta_offset  = TEX_HEADER + 0x10000
+
+    print(f"\n{'textura':<28} {'bucle':>10} {'numpy':>10} {'x':>7}  iguales")
+    casos = (
+        ("completa",                      0),
+        ("paleta a medias",               0x200 + 2),
+        ("sin paleta, indices a medias",  0x400 + 0x8000 + 5),
+    )
+    for semilla, (nombre, recorte) in enumerate(casos):
+        blob = textura_sintetica(semilla, recorte)
+        t_bucle, a = medir(decodificar_bucle, blob, indices_offset, paleta_offset)
+        t_numpy, b = medir(tex_codec.decodificar_rgba, blob, indices_offset, paleta_offset)
+        print(f"{nombre:<28} {1e3 * t_bucle:>8.1f}ms {1e3 * t_numpy:>8.2f}ms "
+              f"{t_bucle / t_numpy:>7.0f}  {'si' if np.array_equal(a, b) else 'NO'}")
+
+    blob = textura_sintetica(0)
+    t_lista, a = medir(registrar_lista, blob, indices_offset, paleta_offset, "bench_lista")
+    t_array, b = medir(registrar_array, blob, indices_offset, paleta_offset, "bench_array")
+    print(f"\n{'paso completo':<28} {'lista':>10} {'float32':>10} {'x':>7}  iguales")
+    print(f"{'decodificar + registrar':<28} {1e3 * t_lista:>8.1f}ms {1e3 * t_array:>8.1f}ms "
+          f"{t_lista / t_array:>7.1f}  {'si' if np.array_equal(pixeles_de(a), pixeles_de(b)) else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark de la cache de texturas por contenido (logic_patch.tex_decoder):
+paso de texturas del import (textura_a_blender) en cada situacion de reutilizacion.
+  - primera importacion: desentrelazar + paleta + registrar en Blender
+  - segunda importacion del mismo parche: la imagen de Blender se reutiliza
+  - la imagen se pinto y se empaqueto: sus pixeles ya no son la textura, se registra otra vez
+  - mismo contenido con otro nombre de imagen: RGBA en memoria
+  - variante de color (mismos indices, otra paleta): indices en memoria
+  - nueva sesion (memoria vacia) con usar_cache: RGBA desde la cache en disco
+
+Uso (desde la carpeta que contiene el addon):
+    blender -b --factory-startup --python pmdl_addon/benchmarks/bench_tex_cache.py
+
+Cuenta cuantas veces se desentrelazan indices en cada caso y comprueba que los
+pixeles registrados son los del decodificador sin cache.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar
+
+cache_parse = cargar('cache_parse')
+tex_codec   = cargar('logic_patch.tex_codec')
+tex_decoder = cargar('logic_patch.tex_decoder')
+
+_desentrelazados = [0]
+_desempaquetar   = tex_decoder.desempaquetar_indices
+
+
+def _contar(datos, bpp):
+    _desentrelazados[0] += 1
+    return _desempaquetar(datos, bpp)
+
+
+def textura_sintetica(semilla, paleta_semilla=None):
+    formato = tex_codec.FORMATO_PARCHE
+    blob    = bytearray(np.random.default_rng(semilla).integers(0, 256, formato.tamano_total,
+                                                                dtype=np.uint8).tobytes())
+    textura = {
+        'formato'        : formato,
+        'inicio'         : 0,
+        'indices_offset' : tex_codec.TEX_HEADER,
+        'paleta_offset'  : tex_codec.TEX_HEADER + formato.tamano_indices,
+    }
+    if paleta_semilla is not None:
+        blob[textura['paleta_offset']:] = np.random.default_rng(paleta_semilla).integers(
+            0, 256, formato.tamano_paleta, dtype=np.uint8).tobytes()
+    return bytes(blob), textura
+
+
+def pixeles_de(bl_img):
+    pixeles = np.empty(len(bl_img.pixels), dtype=np.float32)
+    bl_img.pixels.foreach_get(pixeles)
+    return pixeles
+
+
+def esperado(blob, textura):
+    rgba = tex_codec.decodificar_rgba(blob, textura['indices_offset'], textura['paleta_offset'],
+                                      textura['formato'])
+    return rgba.astype(np.float32).reshape(-1) / 255.0
+
+
+def paso(nombre_caso, blob, textura, nombre_img, usar_cache=False):
+    _desentrelazados[0] = 0
+    imagenes = len(bpy.data.images)
+    t0       = time.perf_counter()
+    bl_img   = tex_decoder.textura_a_blender(blob, textura, nombre_img, usar_cache)
+    t        = time.perf_counter() - t0
+    iguales  = np.array_equal(pixeles_de(bl_img), esperado(blob, textura))
+    print(f"{nombre_caso:<34} {1e3 * t:>7.2f}ms {_desentrelazados[0]:>14} "
+          f"{len(bpy.data.images) - imagenes:>+6}  {'si' if iguales else 'NO'}")
+
+
+def vaciar_memoria():
+    tex_decoder._memoria_rgba.clear()
+    tex_decoder._memoria_indices.clear()
+
+
+def main():
+    tex_decoder.desempaquetar_indices = _contar
+    tex_decoder.print                 = lambda *a, **k: None
+    cache_parse.print                 = lambda *a, **k: None
+
+    directorio = tempfile.mkdtemp(prefix="bench_tex_cache_")
+    cache_parse.configurar_cache(directorio=directorio)
+    try:
+        base      = textura_sintetica(0)
+        variante  = textura_sintetica(0, paleta_semilla=1)
+        vaciar_memoria()
+
+        print(f"\n{'caso':<34} {'tiempo':>9} {'desentrelazados':>14} {'imgs':>6}  pixeles iguales")
+        paso("primera importacion",              *base,     "bench",          usar_cache=True)
+        paso("segunda importacion",              *base,     "bench",          usar_cache=True)
+
+        bl_img  = bpy.data.images["bench_tex"]
+        pintada = pixeles_de(bl_img)
+        pintada[: 64 * 4] = 1.0
+        bl_img.pixels.foreach_set(pintada)
+        bl_img.pack()
+        paso("imagen pintada y empaquetada",     *base,     "bench",          usar_cache=True)
+        paso("mismo contenido, otra imagen",     *base,     "bench_copia")
+        paso("variante de color",                *variante, "bench_variante")
+
+        vaciar_memoria()
+        bpy.data.images.remove(bpy.data.images["bench_tex"])
+        paso("nueva sesion, cache en disco",     *base,     "bench",          usar_cache=True)
+    finally:
+        cache_parse.configurar_cache(directorio="")
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark del codec de texturas entrelazadas (logic_patch.tex_codec) para cada
+tamano y profundidad conocidos: construccion de la tabla de permutacion (una sola
+vez por formato), decodificacion a RGBA y codificacion de indices.
+
+No necesita Blender:
+    python pmdl_addon/benchmarks/bench_tex_codec.py
+
+Ademas de los tiempos comprueba el ida y vuelta: codificar los indices de la
+imagen decodificada devuelve exactamente los bytes originales.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar, medir
+
+tex_codec = cargar('logic_patch.tex_codec')
+
+REPETICIONES = 20
+
+
+def main():
+    print(f"\n{'formato':<16} {'tabla':>9} {'decodif.':>9} {'codif.':>9}  ida y vuelta")
+    for semilla, formato in enumerate(tex_codec.FORMATOS_CONOCIDOS):
+        rnd  = np.random.default_rng(semilla)
+        blob = rnd.integers(0, 256, formato.tamano_total, dtype=np.uint8).tobytes()
+        indices_offset = tex_codec.TEX_HEADER
+        paleta_offset  = indices_offset + formato.tamano_indices
+
+        tex_codec.tabla_swizzle.cache_clear()
+        t0 = time.perf_counter()
+        tex_codec.tabla_swizzle(formato.ancho, formato.alto, formato.bpp)
+        t_tabla = time.perf_counter() - t0
+
+        t_dec, _ = medir(tex_codec.decodificar_rgba, blob, indices_offset, paleta_offset, formato,
+                          repeticiones=REPETICIONES)
+
+        datos   = np.frombuffer(blob, dtype=np.uint8, count=formato.tamano_indices, offset=indices_offset)
+        imagen  = tex_codec.indices_a_imagen(tex_codec.desempaquetar_indices(datos, formato.bpp), formato)
+        paleta  = tex_codec.leer_paleta(blob, paleta_offset, formato)
+        t_cod, (indices_bytes, paleta_bytes) = medir(tex_codec.codificar_textura, imagen, paleta, formato,
+                                                       repeticiones=REPETICIONES)
+
+        iguales = indices_bytes == datos.tobytes() and paleta_bytes == blob[paleta_offset:]
+        print(f"{repr(formato):<16} {1e3 * t_tabla:>7.2f}ms {1e3 * t_dec:>7.2f}ms {1e3 * t_cod:>7.2f}ms  "
+              f"{'si' if iguales else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
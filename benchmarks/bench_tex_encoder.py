@@ -0,0 +1,104 @@
+"""
+Benchmark del codificador de texturas (logic_patch.tex_encoder): codificar una
+imagen RGBA al layout del parche y volver a decodificarla, para los tres caminos
+del cuantizador:
+  - colores de la paleta original (la textura importada, con otros pixeles),
+  - imagen nueva con 256 colores o menos (sin perdida),
+  - imagen con miles de colores (median cut + k-means).
+
+No necesita Blender:
+    python pmdl_addon/benchmarks/bench_tex_encoder.py
+
+Los dos primeros casos deben volver exactamente iguales; para el tercero se
+informa el error medio por canal y el PSNR de la imagen decodificada.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar, medir
+
+tex_codec   = cargar('logic_patch.tex_codec')
+tex_encoder = cargar('logic_patch.tex_encoder')
+
+
+def textura_sintetica(formato, semilla):
+    rnd  = np.random.default_rng(semilla)
+    blob = bytearray(rnd.integers(0, 256, formato.tamano_total, dtype=np.uint8).tobytes())
+    textura = {
+        'formato'        : formato,
+        'inicio'         : 0,
+        'indices_offset' : tex_codec.TEX_HEADER,
+        'paleta_offset'  : tex_codec.TEX_HEADER + formato.tamano_indices,
+    }
+    return blob, textura
+
+
+def imagen_gradiente(formato):
+    """Degradado suave con alfa variable: miles de colores distintos."""
+    y, x = np.mgrid[0:formato.alto, 0:formato.ancho].astype(np.float64)
+    r    = 255 * x / (formato.ancho - 1)
+    g    = 255 * y / (formato.alto - 1)
+    b    = 127.5 + 127.5 * np.sin((x + y) / 23.0)
+    a    = np.where((x // 32 + y // 32) % 2, 255, 160)
+    return np.rint(np.stack((r, g, b, a), axis=-1)).astype(np.uint8)
+
+
+def decodificar(blob, textura):
+    return tex_codec.decodificar_rgba(blob, textura['indices_offset'], textura['paleta_offset'],
+                                      textura['formato'])
+
+
+def casos(formato, semilla):
+    blob, textura = textura_sintetica(formato, semilla)
+    original      = decodificar(blob, textura)
+
+    # La textura importada con una region copiada encima: mismos colores de paleta
+    editada = original.copy()
+    alto, ancho = editada.shape[:2]
+    editada[: alto // 2, : ancho // 2] = original[alto // 2 :, ancho // 2 :]
+
+    # Imagen nueva de pocos colores
+    rnd         = np.random.default_rng(semilla + 100)
+    pocos       = rnd.integers(0, 256, (formato.colores, 4), dtype=np.uint8)
+    pocos_img   = pocos[rnd.integers(0, formato.colores, (alto, ancho))]
+
+    return blob, textura, (
+        ("paleta original", editada),
+        ("pocos colores",   pocos_img),
+        ("degradado",       imagen_gradiente(formato)),
+    )
+
+
+def main():
+    print(f"\n{'formato':<14} {'caso':<16} {'colores':>8} {'codificar':>10}  {'estado':<11} resultado")
+    for semilla, formato in enumerate((tex_codec.FORMATO_PARCHE,
+                                       tex_codec.FormatoTextura(256, 256, 4),
+                                       tex_codec.FormatoTextura(512, 512, 8))):
+        blob, textura, imagenes = casos(formato, semilla)
+
+        estado = tex_encoder.textura_a_parche(bytearray(blob), textura, decodificar(blob, textura))
+        print(f"{repr(formato):<14} {'sin editar':<16} {'-':>8} {'-':>10}  {estado:<11} "
+              f"{'ok' if estado == 'sin cambios' else 'NO'}")
+
+        for nombre, rgba in imagenes:
+            colores = len(np.unique(rgba.reshape(-1, 4).view('<u4')))
+            destino = bytearray(blob)
+            t, estado = medir(lambda: tex_encoder.textura_a_parche(bytearray(blob), textura, rgba))
+            tex_encoder.textura_a_parche(destino, textura, rgba)
+            vuelta  = decodificar(destino, textura)
+
+            if estado == 'exacta':
+                resultado = 'igual' if np.array_equal(vuelta, rgba) else 'NO IGUAL'
+            else:
+                error     = np.abs(vuelta.astype(np.float64) - rgba).mean()
+                mse       = ((vuelta.astype(np.float64) - rgba) ** 2).mean()
+                resultado = f"error medio {error:.2f}/canal, PSNR {10 * np.log10(255 ** 2 / mse):.1f} dB"
+            print(f"{repr(formato):<14} {nombre:<16} {colores:>8} {1e3 * t:>8.1f}ms  {estado:<11} {resultado}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark de tiras.triangular_tiras contra el bucle Python por triangulo que
+usaba builder antes, sobre partes sinteticas de 1k a 100k vertices.
+
+No necesita Blender:
+    python pmdl_addon/benchmarks/bench_tiras.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from comun import cargar, medir
+
+triangular_tiras = cargar('tiras').triangular_tiras
+
+TAMANOS = (1_000, 10_000, 100_000)
+
+
+def tiras_sinteticas(num_vertices, semilla=0):
+    """Tiras de 8 a 64 vertices; cada tira repite su ultimo vertice (union degenerada)."""
+    rnd        = np.random.default_rng(semilla)
+    longitudes = []
+    restantes  = num_vertices
+    while restantes > 0:
+        n = int(min(restantes, rnd.integers(8, 65)))
+        longitudes.append(n)
+        restantes -= n
+
+    coords  = rnd.integers(-32768, 32768, size=(num_vertices, 3), dtype=np.int16)
+    fin     = np.cumsum(longitudes) - 1
+    validos = np.asarray(longitudes) >= 2
+    coords[fin[validos]] = coords[fin[validos] - 1]
+    return longitudes, coords
+
+
+def triangular_bucle(longitudes):
+    """Bucle anterior de builder: un triangulo por iteracion, winding por paridad."""
+    triangulos = []
+    base       = 0
+    for n in longitudes:
+        for i in range(n - 2):
+            if i % 2 == 0:
+                triangulos.append((base + i, base + i + 1, base + i + 2))
+            else:
+                triangulos.append((base + i, base + i + 2, base + i + 1))
+        base += n
+    return triangulos
+
+
+def main():
+    print(f"\n{'vertices':>9} {'bucle':>10} {'numpy':>10} {'x':>6}  estadisticas")
+    for n in TAMANOS:
+        longitudes, coords = tiras_sinteticas(n)
+
+        t_bucle, referencia        = medir(triangular_bucle, longitudes)
+        t_numpy, (_, estadisticas) = medir(triangular_tiras, longitudes, coords)
+
+        sin_descartar, _ = triangular_tiras(longitudes)
+        assert sin_descartar.tolist() == [list(t) for t in referencia]
+
+        print(f"{n:>9} {1e3 * t_bucle:>8.2f}ms {1e3 * t_numpy:>8.2f}ms "
+              f"{t_bucle / t_numpy:>6.1f}  {estadisticas}")
+
+
+if __name__ == "__main__":
+    main()
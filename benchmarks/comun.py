@@ -0,0 +1,47 @@
+"""
+Carga del addon y medicion compartidas por los benchmarks.
+
+Los modulos que se miden fuera de Blender no dependen de bpy, pero el __init__
+del addon (y el de logic_patch) si: los paquetes se registran con su ruta sin
+ejecutar esos __init__, igual que en tests/entorno_pruebas.py. Dentro de Blender,
+con el addon ya cargado, se usa el paquete real.
+
+Cada benchmark agrega su carpeta a sys.path e importa de aqui:
+    from comun import cargar, medir
+"""
+
+import importlib
+import os
+import sys
+import time
+import types
+
+RAIZ_ADDON = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAQUETE    = 'pmdl_addon'
+
+
+def _registrar_paquete(nombre, ruta):
+    if nombre not in sys.modules:
+        paquete             = types.ModuleType(nombre)
+        paquete.__path__    = [ruta]
+        sys.modules[nombre] = paquete
+
+
+_registrar_paquete(PAQUETE, RAIZ_ADDON)
+_registrar_paquete(PAQUETE + '.logic_patch', os.path.join(RAIZ_ADDON, 'logic_patch'))
+
+
+def cargar(modulo):
+    """Importa un modulo del addon por su ruta relativa, p. ej. 'logic_patch.tex_codec'."""
+    return importlib.import_module(f"{PAQUETE}.{modulo}")
+
+
+def medir(funcion, *args, repeticiones=5):
+    """Mejor tiempo de 'repeticiones' llamadas. Retorna (segundos, resultado)."""
+    mejor = None
+    for _ in range(repeticiones):
+        t0        = time.perf_counter()
+        resultado = funcion(*args)
+        t1        = time.perf_counter()
+        mejor     = t1 - t0 if mejor is None else min(mejor, t1 - t0)
+    return mejor, resultado
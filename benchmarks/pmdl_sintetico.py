@@ -0,0 +1,47 @@
+"""
+PMDL sintetico para los benchmarks que no necesitan un archivo real: cabecera,
+tabla de partes, cabeceras de subpartes y vertices al azar, con el mismo layout
+que lee pmdl_parser. Cerca de la mitad de los IDs de hueso son 0xFF (repetir
+el de la subparte anterior), como en los modelos del juego.
+"""
+
+import struct
+
+import numpy as np
+
+OFFSET_INDICE_PARTES = 0x70
+
+
+def pmdl_sintetico(num_vertices, num_huesos=4, vertices_subparte=32, subpartes_parte=16, semilla=0):
+    """Bytes de un PMDL con ~num_vertices vertices repartidos en tiras de vertices_subparte."""
+    rnd             = np.random.default_rng(semilla)
+    tamano_vertice  = num_huesos * 2 + 8
+    num_subpartes   = max(1, -(-num_vertices // vertices_subparte))
+    cantidad_partes = -(-num_subpartes // subpartes_parte)
+
+    cabecera = bytearray(OFFSET_INDICE_PARTES)
+    cabecera[0x00:0x04] = b'pMdl'
+    struct.pack_into('<3f', cabecera, 0x40, 1.0, 1.0, 1.0)
+    struct.pack_into('<I', cabecera, 0x5C, cantidad_partes)
+    struct.pack_into('<I', cabecera, 0x60, OFFSET_INDICE_PARTES)
+
+    indice = bytearray(cantidad_partes * 0x20)
+    partes = []
+    offset = OFFSET_INDICE_PARTES + len(indice)
+    for p in range(cantidad_partes):
+        cantidad = min(subpartes_parte, num_subpartes - p * subpartes_parte)
+        datos    = bytearray(4 + cantidad * 0x10)
+        struct.pack_into('<I', datos, 0, cantidad)
+        for s in range(cantidad):
+            huesos = rnd.integers(0, 0x40, num_huesos, dtype=np.uint8)
+            if p or s:
+                huesos[rnd.random(num_huesos) < 0.5] = 0xFF
+            huesos = huesos.tobytes().ljust(8, b'\x00')
+            struct.pack_into('<HH8sI', datos, 4 + s * 0x10, vertices_subparte, num_huesos, huesos, len(datos))
+            datos += rnd.integers(0, 256, vertices_subparte * tamano_vertice, dtype=np.uint8).tobytes()
+
+        struct.pack_into('<HHIII', indice, p * 0x20, p % 4, 0xFF, offset, len(datos), 0)
+        partes.append(bytes(datos))
+        offset += len(datos)
+
+    return bytes(cabecera) + bytes(indice) + b''.join(partes)
@@ -1,8 +1,9 @@
 import bpy
 import mathutils
-import os
 
-from .binary_utils import leer_uint32, leer_uint8, leer_float32
+from .binary_utils   import leer_uint32
+from .formato_pmdl   import HUESO
+from .nombres_huesos import cargar_nombres_huesos, obtener_nombre_hueso
 
 
 def leer_huesos_pmdl(blob, offset_huesos, cantidad_huesos):
@@ -26,28 +27,21 @@ def leer_huesos_pmdl(blob, offset_huesos, cantidad_huesos):
     """
 
     huesos = []
-    TAM_HUESO = 0xA0
 
     print(f"\n=== LEYENDO {cantidad_huesos} HUESOS DESDE OFFSET 0x{offset_huesos:X} ===\n")
 
-    for i in range(cantidad_huesos):
-        offset_actual = offset_huesos + (i * TAM_HUESO)
-
-        if offset_actual + TAM_HUESO > len(blob):
-            print(f"[!] Hueso {i}: fuera de rango del archivo")
-            break
-
-        pop_level = leer_uint8(blob, offset_actual + 0x04)
-        hueso_id  = leer_uint8(blob, offset_actual + 0x0A)
+    for i, hueso in enumerate(HUESO.iterar(blob, offset_huesos, cantidad_huesos)):
+        pop_level = hueso['pop_level']
+        hueso_id  = hueso['id']
 
         # Posicion del hueso en espacio mundo
-        pos = [leer_float32(blob, offset_actual + 0x10 + j * 4) for j in range(3)]
+        pos = list(hueso['pos'][:3])
 
         # Posicion del padre en espacio mundo
-        pos_padre = [leer_float32(blob, offset_actual + 0x20 + j * 4) for j in range(3)]
+        pos_padre = list(hueso['pos_padre'][:3])
 
         # Escala / bounding box
-        escala_hueso = [leer_float32(blob, offset_actual + 0x50 + j * 4) for j in range(3)]
+        escala_hueso = list(hueso['escala'][:3])
 
         huesos.append({
             'id'         : hueso_id,
@@ -59,6 +53,9 @@ def leer_huesos_pmdl(blob, offset_huesos, cantidad_huesos):
 
         print(f"  Hueso 0x{hueso_id:02X}  pop={pop_level}  pos=[{pos[0]:.3f}, {pos[1]:.3f}, {pos[2]:.3f}]")
 
+    if len(huesos) < cantidad_huesos:
+        print(f"[!] Hueso {len(huesos)}: fuera de rango del archivo")
+
     return huesos
 
 
@@ -92,37 +89,6 @@ def construir_jerarquia_huesos(huesos):
     return jerarquia
 
 
-def cargar_nombres_huesos():
-    """Carga el diccionario de nombres desde bones_list"""
-
-    addon_dir  = os.path.dirname(os.path.abspath(__file__))
-    bones_file = os.path.join(addon_dir, "bones_list.txt")
-    nombres    = {}
-
-    if not os.path.exists(bones_file):
-        return nombres
-
-    try:
-        with open(bones_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if ':' in line:
-                    partes = line.split(':', 1)
-                    nombres[partes[0].strip()] = partes[1].strip()
-    except Exception as e:
-        print(f"Error al cargar bones_list.txt: {e}")
-
-    return nombres
-
-
-def obtener_nombre_hueso(hueso_id, renombrar, nombres):
-    """Retorna el nombre del hueso segun su ID."""
-    nombre_base = f"sk_{hueso_id:02X}"
-    if renombrar and nombre_base in nombres:
-        return nombres[nombre_base]
-    return nombre_base
-
-
 def crear_armature_desde_pmdl(blob, offset_huesos, cantidad_huesos,
                                renombrar_huesos=False, nombre="Armature", escala=0.002075):
 
@@ -1,12 +1,16 @@
 import bpy
-import bmesh
 import os
 
+import numpy as np
+
 from .bone_builder import (
     crear_armature_desde_pmdl,
     cargar_nombres_huesos,
     obtener_nombre_hueso
 )
+from .datos_malla import registrar_huellas
+from .soldadura import quitar_triangulos_duplicados, soldar_vertices
+from .tiras import triangular_tiras
 
 
 def crear_material_tex_ttt():
@@ -67,10 +71,105 @@ def limpiar_coleccion_vacia(context):
         except Exception:
             pass
 
+
+def _matriz_pesos(parte, huesos):
+    """
+    Pesos de la parte como matriz float32[N, len(huesos)], una columna por hueso.
+    Si un hueso se repite en las columnas de una subparte, gana su ultimo peso positivo.
+    """
+    columna_hueso = {hid: g for g, hid in enumerate(huesos)}
+    total         = sum(len(subparte['pesos']) for subparte in parte['subpartes'])
+    matriz        = np.zeros((total, len(huesos)), dtype=np.float32)
+
+    base = 0
+    for subparte in parte['subpartes']:
+        pesos = subparte['pesos']
+        filas = matriz[base : base + len(pesos)]
+        for j, hid in enumerate(subparte['huesos_ids']):
+            positivos = pesos[:, j] > 0.0
+            filas[positivos, columna_hueso[hid]] = pesos[positivos, j]
+        base += len(pesos)
+
+    return matriz
+
+
+def _cubetas_pesos(columna):
+    """
+    Agrupa los vertices con peso positivo de una columna por valor exacto de peso.
+    Produce (peso, lista de indices de vertice) ordenado por peso. Los pesos salen
+    de una tabla de 32641 valores float32, asi que las cubetas son pocas y el valor
+    que recibe Blender es el mismo float32 que se asignaba vertice por vertice.
+    """
+    indices = np.flatnonzero(columna > 0.0)
+    if len(indices) == 0:
+        return
+
+    valores = columna[indices]
+    orden   = np.argsort(valores, kind='stable')
+    valores = valores[orden]
+    indices = indices[orden]
+
+    cortes = np.flatnonzero(np.diff(valores)) + 1
+    for inicio, fin in zip(np.concatenate(([0], cortes)), np.concatenate((cortes, [len(valores)]))):
+        yield float(valores[inicio]), indices[inicio:fin].tolist()
+
+
+def _buffers_parte(parte, escala, factor_x, factor_y, factor_z, pesos_soldar=None):
+    """
+    Convierte las subpartes de una parte en buffers planos para foreach_set:
+      co             : float32[M * 3]     posiciones en espacio Blender
+      vertices_caras : int32[T * 3]       vertice de cada esquina de cada triangulo
+      uv             : float32[T * 3 * 2] UV de cada esquina
+    Los vertices quedan en el mismo orden que en el archivo, subparte tras subparte.
+    Tambien retorna las EstadisticasTiras de la parte y la soldadura aplicada.
+
+    Con pesos_soldar (matriz de _matriz_pesos) se sueldan los vertices identicos y
+    soldadura = (representantes, slots); sin soldar es None y M = N.
+    """
+    subpartes  = parte['subpartes']
+    coords     = [subparte['coords'] for subparte in subpartes]
+    uvs        = [subparte['uvs'] for subparte in subpartes]
+    longitudes = [len(c) for c in coords]
+
+    coords = np.concatenate(coords) if coords else np.zeros((0, 3), dtype=np.int16)
+    uvs    = np.concatenate(uvs)    if uvs    else np.zeros((0, 2), dtype=np.uint8)
+
+    triangulos, estadisticas = triangular_tiras(longitudes, coords)
+
+    uvs_f   = uvs.astype(np.float64)
+    uv_vert = np.empty((len(uvs), 2), dtype=np.float64)
+    uv_vert[:, 0] = uvs_f[:, 0] / 255.0
+    uv_vert[:, 1] = 1.0 - (uvs_f[:, 1] / 255.0)
+    uv            = uv_vert[triangulos]   # cada vertice trae su UV: mismos indices
+
+    soldadura = None
+    if pesos_soldar is not None:
+        representantes, slots = soldar_vertices(coords, uvs, pesos_soldar)
+        soldadura  = (representantes, slots)
+        coords     = coords[representantes]
+        triangulos = slots[triangulos]
+
+        conservar  = quitar_triangulos_duplicados(triangulos)
+        triangulos = triangulos[conservar]
+        uv         = uv[conservar]
+
+    coords_f = coords.astype(np.float64)
+    co       = np.empty((len(coords), 3), dtype=np.float64)
+    co[:, 0] =  coords_f[:, 0] * escala * factor_x
+    co[:, 1] =  coords_f[:, 2] * escala * factor_z
+    co[:, 2] = -coords_f[:, 1] * escala * factor_y
+
+    return (co.astype(np.float32).ravel(),
+            triangulos.ravel(),
+            uv.astype(np.float32).ravel(),
+            estadisticas,
+            soldadura)
+
+
 def _crear_objeto_mesh(parte, coleccion, material, armature_obj,
                        escala, factor_x, factor_y, factor_z,
                        renombrar_huesos, nombres_huesos,
-                       prefijo_nombre="Parte", pmdf_cara=None):
+                       prefijo_nombre="Parte", pmdf_cara=None, soldar=False):
 
     nombre_parte = f"{prefijo_nombre}_{parte['indice']:02d}"
     mesh         = bpy.data.meshes.new(nombre_parte)
@@ -104,66 +203,57 @@ def _crear_objeto_mesh(parte, coleccion, material, armature_obj,
     else:
         obj.data.materials[0] = material
 
-    bm           = bmesh.new()
-    uv_layer     = bm.loops.layers.uv.new("UVMap")
-    deform_layer = bm.verts.layers.deform.new()
-
     huesos_usados = set()
     for subparte in parte['subpartes']:
         for hid in subparte['huesos_ids']:
             huesos_usados.add(hid)
 
-    vertex_groups_map = {}
-    for hid in sorted(huesos_usados):
-        nombre_vg = obtener_nombre_hueso(hid, renombrar_huesos, nombres_huesos)
-        vg        = obj.vertex_groups.new(name=nombre_vg)
-        vertex_groups_map[hid] = vg.index
+    huesos        = sorted(huesos_usados)
+    vertex_groups = [
+        obj.vertex_groups.new(name=obtener_nombre_hueso(hid, renombrar_huesos, nombres_huesos))
+        for hid in huesos
+    ]
+    pesos         = _matriz_pesos(parte, huesos)
 
-    for subparte in parte['subpartes']:
-        vertices_bm = []
-
-        for vertice in subparte['vertices']:
-            x =  vertice['coord_x'] * escala * factor_x
-            y =  vertice['coord_z'] * escala * factor_z
-            z = -vertice['coord_y'] * escala * factor_y
-
-            v = bm.verts.new((x, y, z))
-
-            for hid, peso in zip(subparte['huesos_ids'], vertice['pesos']):
-                if hid in vertex_groups_map and peso > 0.0:
-                    v[deform_layer][vertex_groups_map[hid]] = peso
-
-            vertices_bm.append(v)
-
-        for i in range(len(vertices_bm) - 2):
-            v1, v2, v3 = vertices_bm[i], vertices_bm[i+1], vertices_bm[i+2]
-            if i % 2 == 0:
-                verts_face = [v1, v2, v3]
-                uv_indices = [i, i+1, i+2]
-            else:
-                verts_face = [v1, v3, v2]
-                uv_indices = [i, i+2, i+1]
-
-            try:
-                face = bm.faces.new(verts_face)
-                for j, loop in enumerate(face.loops):
-                    idx = uv_indices[j]
-                    if idx < len(subparte['vertices']):
-                        ud            = subparte['vertices'][idx]
-                        u             = ud['uv_x'] / 255.0
-                        v_uv          = 1.0 - (ud['uv_y'] / 255.0)
-                        loop[uv_layer].uv = (u, v_uv)
-            except ValueError:
-                continue
-
-    bm.verts.ensure_lookup_table()
-    bm.verts.index_update()
-    bm.to_mesh(mesh)
-    bm.free()
+    co, vertices_caras, uv, estadisticas, soldadura = _buffers_parte(
+        parte, escala, factor_x, factor_y, factor_z,
+        pesos_soldar = pesos if soldar else None,
+    )
+    num_caras = len(vertices_caras) // 3
+    if estadisticas.degenerados:
+        print(f"[import] {nombre_parte}: {estadisticas}")
 
+    if soldadura is not None:
+        representantes, slots = soldadura
+        pesos = pesos[representantes]
+        # Vertice de la malla que ocupa cada vertice del archivo (parte, subparte, indice en la tira)
+        obj["PMDL_Slots"] = slots.tolist()
+        print(f"[import] {nombre_parte}: {len(slots)} -> {len(representantes)} vertices soldados")
+
+    mesh.vertices.add(len(co) // 3)
+    mesh.vertices.foreach_set("co", co)
+
+    mesh.loops.add(len(vertices_caras))
+    mesh.loops.foreach_set("vertex_index", vertices_caras)
+
+    mesh.polygons.add(num_caras)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, len(vertices_caras), 3, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set("loop_total", np.full(num_caras, 3, dtype=np.int32))
+    # bmesh creaba las caras planas; en 4.1+ una cara nueva es suave por defecto
+    mesh.polygons.foreach_set("use_smooth", np.zeros(num_caras, dtype=bool))
+
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", uv)
+
+    mesh.update(calc_edges=True)
     if bpy.app.version < (4, 0, 0):
         mesh.calc_normals()
-    mesh.update()
+
+    # Pesos: una llamada a VertexGroup.add por cada (hueso, valor de peso)
+    for g, vg in enumerate(vertex_groups):
+        for peso, indices in _cubetas_pesos(pesos[:, g]):
+            vg.add(indices, peso, 'REPLACE')
 
     # Parentar al armature
     if armature_obj is not None:
@@ -176,7 +266,8 @@ def _crear_objeto_mesh(parte, coleccion, material, armature_obj,
 
 
 
-def crear_mesh_blender(info, escala=0.015625, renombrar_huesos=False, context=None):
+def crear_mesh_blender(info, escala=0.015625, renombrar_huesos=False, context=None,
+                       soldar=False):
     """Crea los objetos mesh y armature en Blender a partir de los datos del PMDL."""
 
     objetos_creados = []
@@ -259,6 +350,7 @@ def crear_mesh_blender(info, escala=0.015625, renombrar_huesos=False, context=No
             factor_z         = factor_z,
             renombrar_huesos = renombrar_huesos,
             nombres_huesos   = nombres_huesos,
+            soldar           = soldar,
         )
         objetos_creados.append(obj)
 
@@ -271,6 +363,9 @@ def crear_mesh_blender(info, escala=0.015625, renombrar_huesos=False, context=No
         todos.append(armature_obj)
     todos.extend(objetos_creados)
 
+    # Estado recien importado: el export conserva los bytes de lo que no cambie
+    registrar_huellas(todos, context)
+
     # Exponer coleccion y armature para que el llamador pueda usarlos
     crear_mesh_blender._ultima_coleccion  = coleccion
     crear_mesh_blender._ultimo_armature   = armature_obj
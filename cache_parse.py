@@ -0,0 +1,290 @@
+import hashlib
+import io
+import json
+import os
+import sys
+
+import numpy as np
+
+from .pmdl_model import PmdlModel, PmdlPart, PmdlSubpart
+from .pmdl_parser import analizar_pmdl_bytes
+
+
+# Cache en disco de geometria decodificada (y texturas de parches) en formato .npz.
+# Cada entrada se nombra <hash de ruta>_<hash de contenido>.npz; las texturas, que
+# solo dependen de sus bytes, <huella de la textura>_tex.npz (ver clave_textura).
+# La antiguedad de uso se lleva en el mtime del archivo, que se actualiza en cada
+# acierto (LRU).
+
+LIMITE_CACHE_MB = 512
+
+_config = {
+    'directorio' : None,
+    'limite_mb'  : LIMITE_CACHE_MB,
+}
+
+
+def _directorio_por_defecto():
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'pmdl_addon')
+
+
+def configurar_cache(directorio=None, limite_mb=None):
+    """Cambia el directorio y/o el limite de tamano (MB) de la cache. 0 la desactiva."""
+    if directorio is not None:
+        _config['directorio'] = directorio
+    if limite_mb is not None:
+        _config['limite_mb'] = limite_mb
+
+
+def directorio_cache():
+    return _config['directorio'] or _directorio_por_defecto()
+
+
+def cache_activa():
+    return _config['limite_mb'] > 0
+
+
+def _hash_ruta(filepath):
+    ruta = os.path.normcase(os.path.abspath(filepath))
+    return hashlib.blake2b(ruta.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def clave_archivo(filepath, datos):
+    """Clave de cache a partir de (ruta, tamano, mtime, hash del contenido)."""
+    st        = os.stat(filepath)
+    contenido = hashlib.blake2b(datos, digest_size=16)
+    contenido.update(f"{st.st_size}:{st.st_mtime_ns}".encode('ascii'))
+    return f"{_hash_ruta(filepath)}_{contenido.hexdigest()}"
+
+
+def clave_textura(huella):
+    """Clave de cache de una textura decodificada: solo depende de su contenido, no del archivo."""
+    return f"{huella}_tex"
+
+
+def _ruta_entrada(clave):
+    return os.path.join(directorio_cache(), clave + '.npz')
+
+
+def cargar_entrada(clave):
+    """Retorna un dict nombre -> array de la entrada, o None si no esta en cache."""
+    if not cache_activa():
+        return None
+
+    ruta = _ruta_entrada(clave)
+    try:
+        with np.load(ruta, allow_pickle=False) as npz:
+            arrays = {nombre: npz[nombre] for nombre in npz.files}
+        os.utime(ruta)
+    except (OSError, ValueError):
+        return None
+    return arrays
+
+
+def guardar_entrada(clave, arrays):
+    """Guarda una entrada, reemplaza las versiones viejas del mismo archivo y aplica el limite."""
+    if not cache_activa():
+        return
+
+    directorio = directorio_cache()
+    try:
+        os.makedirs(directorio, exist_ok=True)
+
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+
+        ruta     = _ruta_entrada(clave)
+        ruta_tmp = ruta + '.tmp'
+        with open(ruta_tmp, 'wb') as f:
+            f.write(buffer.getbuffer())
+        os.replace(ruta_tmp, ruta)
+    except OSError as e:
+        print(f"[cache] WARN: no se pudo guardar la entrada: {e}")
+        return
+
+    prefijo = clave.split('_', 1)[0] + '_'
+    for nombre in os.listdir(directorio):
+        if nombre.startswith(prefijo) and nombre != clave + '.npz':
+            _eliminar(os.path.join(directorio, nombre))
+
+    _aplicar_limite()
+
+
+def _eliminar(ruta):
+    try:
+        os.remove(ruta)
+    except OSError:
+        pass
+
+
+def _aplicar_limite():
+    """Elimina las entradas usadas hace mas tiempo hasta quedar bajo el limite."""
+    directorio = directorio_cache()
+    limite     = _config['limite_mb'] * 1024 * 1024
+
+    entradas = []
+    for nombre in os.listdir(directorio):
+        if not nombre.endswith('.npz'):
+            continue
+        ruta = os.path.join(directorio, nombre)
+        try:
+            st = os.stat(ruta)
+        except OSError:
+            continue
+        entradas.append((st.st_mtime, st.st_size, ruta))
+
+    total = sum(tamano for _, tamano, _ in entradas)
+    for _, tamano, ruta in sorted(entradas):
+        if total <= limite:
+            break
+        _eliminar(ruta)
+        total -= tamano
+
+
+def invalidar_cache(filepath=None):
+    """Elimina las entradas de un archivo, o toda la cache si filepath es None."""
+    directorio = directorio_cache()
+    if not os.path.isdir(directorio):
+        return 0
+
+    prefijo    = _hash_ruta(filepath) + '_' if filepath is not None else ''
+    eliminadas = 0
+    for nombre in os.listdir(directorio):
+        if nombre.endswith('.npz') and nombre.startswith(prefijo):
+            _eliminar(os.path.join(directorio, nombre))
+            eliminadas += 1
+
+    print(f"[cache] {eliminadas} entrada(s) eliminada(s)")
+    return eliminadas
+
+
+# -----------------------------------------------------------------------------
+# SERIALIZACION DE PmdlModel
+# -----------------------------------------------------------------------------
+
+def modelo_a_arrays(info, prefijo=''):
+    """
+    Convierte un PmdlModel en arrays para guardar en la cache (todo decodificado).
+    Los vertices de todas las subpartes se concatenan en tres arrays por modelo.
+    """
+    coords = []
+    uvs    = []
+    pesos  = []
+    partes = []
+
+    for parte in info.partes:
+        subpartes = []
+        for sub in parte.subpartes:
+            coords.append(sub.coords)
+            uvs.append(sub.uvs)
+            pesos.append(sub.pesos.ravel())
+            subpartes.append([sub.num_vertices, sub.num_huesos, sub.huesos_ids, sub.offset,
+                              len(sub.coords)])
+        partes.append([
+            parte.capa, parte.opacidad, parte.offset, parte.longitud,
+            parte.flag_especial, parte.flag_bytes_raw, parte.nombre_flag, subpartes,
+        ])
+
+    meta = {
+        'nombre'               : info.nombre,
+        'filepath'             : info.filepath,
+        'tipo'                 : info.tipo,
+        'grosor'               : [info.grosor_x, info.grosor_y, info.grosor_z],
+        'cantidad_huesos'      : info.cantidad_huesos,
+        'offset_huesos'        : info.offset_huesos,
+        'cantidad_partes'      : info.cantidad_partes,
+        'offset_indice_partes' : info.offset_indice_partes,
+        'partes'               : partes,
+    }
+    return {
+        f"{prefijo}meta"  : np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8),
+        f"{prefijo}coords": np.concatenate(coords) if coords else np.zeros((0, 3), dtype=np.int16),
+        f"{prefijo}uvs"   : np.concatenate(uvs)    if uvs    else np.zeros((0, 2), dtype=np.uint8),
+        f"{prefijo}pesos" : np.concatenate(pesos)  if pesos  else np.zeros(0, dtype=np.float32),
+    }
+
+
+def modelo_desde_arrays(arrays, blob, prefijo=''):
+    """Reconstruye un PmdlModel desde una entrada de cache. Retorna None si falta."""
+    clave_meta = f"{prefijo}meta"
+    if clave_meta not in arrays:
+        return None
+
+    meta = json.loads(arrays[clave_meta].tobytes().decode('utf-8'))
+    info = PmdlModel(
+        nombre               = meta['nombre'],
+        filepath             = meta['filepath'],
+        tipo                 = meta['tipo'],
+        grosor_x             = meta['grosor'][0],
+        grosor_y             = meta['grosor'][1],
+        grosor_z             = meta['grosor'][2],
+        cantidad_huesos      = meta['cantidad_huesos'],
+        offset_huesos        = meta['offset_huesos'],
+        cantidad_partes      = meta['cantidad_partes'],
+        offset_indice_partes = meta['offset_indice_partes'],
+        blob                 = blob,
+    )
+
+    coords = arrays[f"{prefijo}coords"]
+    uvs    = arrays[f"{prefijo}uvs"]
+    pesos  = arrays[f"{prefijo}pesos"]
+    pos_v  = 0
+    pos_p  = 0
+
+    for i, (capa, opacidad, offset, longitud, flag, flag_raw, nombre_flag, subs) in enumerate(meta['partes']):
+        subpartes = []
+        for j, (num_vertices, num_huesos, huesos_ids, offset_sub, decodificados) in enumerate(subs):
+            fin_v = pos_v + decodificados
+            fin_p = pos_p + decodificados * num_huesos
+            subpartes.append(PmdlSubpart.desde_arrays(
+                indice       = j,
+                num_vertices = num_vertices,
+                num_huesos   = num_huesos,
+                huesos_ids   = huesos_ids,
+                offset       = offset_sub,
+                coords       = coords[pos_v:fin_v],
+                uvs          = uvs[pos_v:fin_v],
+                pesos        = pesos[pos_p:fin_p].reshape(decodificados, num_huesos),
+            ))
+            pos_v = fin_v
+            pos_p = fin_p
+        info.partes.append(PmdlPart(
+            indice         = i,
+            capa           = capa,
+            opacidad       = opacidad,
+            offset         = offset,
+            longitud       = longitud,
+            flag_especial  = flag,
+            flag_bytes_raw = flag_raw,
+            nombre_flag    = nombre_flag,
+            subpartes      = subpartes,
+        ))
+
+    return info
+
+
+def analizar_pmdl_cacheado(filepath):
+    """analizar_pmdl con cache en disco: en un acierto no se decodifica ningun vertice."""
+    with open(filepath, 'rb') as f:
+        blob = f.read()
+
+    if not cache_activa():
+        return analizar_pmdl_bytes(blob, os.path.basename(filepath), filepath)
+
+    clave   = clave_archivo(filepath, blob)
+    entrada = cargar_entrada(clave)
+    if entrada is not None:
+        info = modelo_desde_arrays(entrada, blob)
+        if info is not None:
+            return info, None
+
+    info, error = analizar_pmdl_bytes(blob, os.path.basename(filepath), filepath)
+    if error is None:
+        guardar_entrada(clave, modelo_a_arrays(info))
+    return info, error
@@ -0,0 +1,354 @@
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .nombres_huesos import cargar_nombres_huesos, obtener_nombre_hueso
+from .pmdl_parser    import leer_cabecera_pmdl
+from .formato_pmdl   import (
+    CABECERA, ENTRADA_PARTE, ENTRADA_SUBPARTE, HUESO, dtype_vertice, entradas_subpartes,
+)
+from .paleta_huesos  import ResolutorPaleta, CodificadorPaleta, ID_REPETIDO, recorrer_subpartes
+
+
+# Codificacion de un PMDL/PMDF a partir de los DatosMalla y DatosArmature ya leidos
+# de Blender (datos_malla). No importa bpy: exporter, exportar_lote y el export de
+# parches lo llaman desde el hilo principal o desde un pool de hilos.
+
+
+ESCALA_EXPORT = 0.015625
+GROSOR_MAXIMO = 512.0
+
+
+def pesos_norm_a_bytes(pesos):
+    """
+    Convierte pesos Blender (0.0-1.0) a big-endian uint16 del PMDL, todos de una vez.
+    Formula inversa del import: raw = round(peso * 32640 + 128)
+    Round-trip verificado: error maximo < 0.000005
+    Retorna un array '>u2' con la misma forma que 'pesos'.
+    """
+    pesos = np.asarray(pesos, dtype=np.float64)
+    raw   = np.clip(np.rint(pesos * 32640.0 + 128), 0x0081, 0x7FFF)
+    raw   = np.where(pesos <= 0.0, 0x0000, np.where(pesos >= 1.0, 0x8000, raw))
+    return raw.astype('>u2')
+
+
+def coords_pmdl_objeto(datos, factores, grosor_maximo=False):
+    """
+    Coordenadas PMDL (int16[vertices, 3]) de toda la malla en espacio mundo.
+    Conversion Blender -> PMDL: x = bx, y = -bz, z = by, divididas por
+    ESCALA_EXPORT * factor del eje (y multiplicadas por el factor con grosor maximo).
+    """
+    co     = datos.co
+    matriz = datos.matriz
+
+    # Misma aritmetica que matrix_world @ vert.co en mathutils: productos en float32,
+    # suma en double por fila y resultado en float32. Un co @ matriz.T en float32
+    # redondea distinto y cambiaria algun vertice en el ultimo bit.
+    productos = co[:, None, :] * matriz[None, :3, :3]
+    mundo     = (productos[..., 0].astype(np.float64) + productos[..., 1]
+                 + productos[..., 2] + matriz[:3, 3]).astype(np.float32)
+
+    factor_x, factor_y, factor_z = factores
+    bx, by, bz = mundo.astype(np.float64).T
+    pmdl = np.stack((
+         bx / (ESCALA_EXPORT * factor_x),
+        -bz / (ESCALA_EXPORT * factor_y),
+         by / (ESCALA_EXPORT * factor_z),
+    ), axis=1)
+    if grosor_maximo:
+        pmdl *= (factor_x, factor_y, factor_z)
+    return np.clip(np.rint(pmdl), -32768, 32767).astype(np.int16)
+
+
+def uvs_pmdl_objeto(datos):
+    """
+    UV PMDL (uint8[vertices, 2]) de cada vertice, tomada del primer loop que lo usa.
+    Retorna (uvs, con_uv); con_uv marca los vertices que tienen algun loop.
+    """
+    num_vertices = len(datos.co)
+    uvs    = np.zeros((num_vertices, 2), dtype=np.uint8)
+    con_uv = np.zeros(num_vertices, dtype=bool)
+
+    if datos.uv_loop is None or not len(datos.vertice_loop):
+        return uvs, con_uv
+
+    vertice_loop = datos.vertice_loop
+    uv_loop      = datos.uv_loop.astype(np.float64)
+
+    vertices, primeros = np.unique(vertice_loop, return_index=True)
+    u = uv_loop[primeros, 0] * 255.0
+    v = (1.0 - uv_loop[primeros, 1]) * 255.0
+    uvs[vertices]    = np.clip(np.rint(np.stack((u, v), axis=1)), 0, 255).astype(np.uint8)
+    con_uv[vertices] = True
+    return uvs, con_uv
+
+
+def reconstruir_bloque_huesos(armature, blob, offset_huesos, cantidad_huesos,
+                               renombrar_huesos=False, log=print):
+    """
+    Actualiza posiciones de huesos en el blob a partir del armature de Blender
+    ('armature' es el DatosArmature leido con leer_datos_armature).
+    Solo toca offsets 0x10, 0x20, 0x30 de cada hueso. El resto queda intacto.
+
+    Conversion Blender -> PMDL (inversa de bone_builder):
+      pmdl_x =  blender_x
+      pmdl_y = -blender_z
+      pmdl_z =  blender_y
+    """
+    nombres_map = cargar_nombres_huesos() if renombrar_huesos else {}
+
+    # Huesos en el orden del archivo (solo los que caben completos en el blob)
+    huesos = HUESO.iterar(blob, offset_huesos, cantidad_huesos)
+
+    for i, hueso in enumerate(huesos):
+        off      = offset_huesos + i * HUESO.tamano
+        posicion = armature.posiciones.get(obtener_nombre_hueso(hueso['id'], renombrar_huesos, nombres_map))
+        if posicion is None:
+            continue
+
+        # Posicion world del head del hueso y de su padre
+        (hx, hy, hz), head_padre = posicion
+        px, py, pz = hx, -hz, hy
+
+        if head_padre is not None:
+            phx, phy, phz = head_padre
+            ppx, ppy, ppz = phx, -phz, phy
+            w_padre = 1.0
+        else:
+            ppx, ppy, ppz = 0.0, 0.0, 0.0
+            w_padre = 0.0
+
+        dx, dy, dz = px - ppx, py - ppy, pz - ppz
+
+        HUESO.escribir(
+            blob, off,
+            pos        = (px, py, pz, 1.0),       # 0x10: posicion propia
+            pos_padre  = (ppx, ppy, ppz, w_padre), # 0x20: posicion del padre
+            diferencia = (dx, dy, dz, 1.0),       # 0x30: diferencia (redundante pero necesaria)
+        )
+
+    log(f"[export] {len(huesos)} huesos actualizados")
+
+
+def _recodificar_ids(blob, offset_entrada, entrada_sub, resolutor, codificador):
+    """
+    Resuelve los IDs de hueso de una subparte y los vuelve a escribir con los 0xFF
+    optimos. Los bytes del campo que la subparte no usa se conservan. Retorna los
+    IDs resueltos.
+    """
+    crudos      = entrada_sub['huesos_ids']
+    resueltos   = resolutor.resolver(crudos[:entrada_sub['num_huesos']])
+    codificados = codificador.codificar(resueltos)
+    ENTRADA_SUBPARTE.escribir(blob, offset_entrada, huesos_ids=codificados + crudos[len(codificados):])
+    return resueltos
+
+
+def codificar_pmdl(blob, mallas, armature, renombrar_huesos=False, grosor_maximo=False,
+                   forzar_completo=False, log=print):
+    """
+    Escribe geometria, UVs, pesos y huesos sobre un PMDL/PMDF en memoria.
+    'mallas' son los DatosMalla de cada parte en orden y 'armature' el DatosArmature
+    (o None), ya leidos de Blender: aqui no se toca bpy, asi que se puede llamar
+    desde otro hilo. Los mensajes van a 'log'.
+    Estrategia: patch sobre el blob original para mantener estructura intacta.
+    'blob' es cualquier buffer escribible que contenga solo el modelo (bytearray
+    o una ventana memoryview dentro de un parche); se modifica en su lugar y
+    nunca cambia de tamano.
+
+    Las partes (y el armature) cuya huella coincide con la guardada no cambiaron
+    desde el import y conservan sus bytes originales. Con forzar_completo se
+    recodifica todo.
+
+    Retorna un resumen {'reutilizadas', 'recodificadas', 'huesos', 'huellas', 'segundos'};
+    'huellas' son los pares (objeto, huella actual) para guardar_huellas.
+    """
+    inicio = time.perf_counter()
+
+    cabecera, error = leer_cabecera_pmdl(blob)
+    if error:
+        raise ValueError(error)
+
+    # Grosor del header
+    grosor_x = cabecera.grosor_x
+    grosor_y = cabecera.grosor_y
+    grosor_z = cabecera.grosor_z
+    factor_x = grosor_x / GROSOR_MAXIMO if grosor_x > 0 else 1.0
+    factor_y = grosor_y / GROSOR_MAXIMO if grosor_y > 0 else 1.0
+    factor_z = grosor_z / GROSOR_MAXIMO if grosor_z > 0 else 1.0
+
+    if grosor_maximo:
+        CABECERA.escribir(blob, 0, grosor=(GROSOR_MAXIMO,) * 3)
+        # Pasar a grosor maximo reescala las coordenadas de todas las partes
+        if (factor_x, factor_y, factor_z) != (1.0, 1.0, 1.0):
+            forzar_completo = True
+
+    nombres_map            = cargar_nombres_huesos() if renombrar_huesos else {}
+    offset_indice_partes   = cabecera.offset_indice_partes
+    cantidad_partes        = cabecera.cantidad_partes
+
+    log(f"\n[export] Exportando {len(mallas)} partes...")
+
+    # Las IDs de huesos se resuelven (0xFF -> ID real) y se vuelven a codificar con
+    # los 0xFF optimos en la misma pasada, con estado de columnas compartido entre
+    # TODAS las partes (igual que el juego las lee).
+    resolutor   = ResolutorPaleta()
+    codificador = CodificadorPaleta()
+
+    resumen = {'reutilizadas': 0, 'recodificadas': 0, 'huesos': None, 'huellas': [], 'segundos': 0.0}
+
+    entradas = ENTRADA_PARTE.iterar(blob, offset_indice_partes, min(len(mallas), cantidad_partes))
+    for i, (datos, entrada) in enumerate(zip(mallas, entradas)):
+        entrada_offset = offset_indice_partes + i * ENTRADA_PARTE.tamano
+        huella         = datos.huella()
+        reutilizar     = not forzar_completo and datos.huella_guardada == huella
+        resumen['huellas'].append((datos.objeto, huella))
+
+        # Custom properties (una parte sin cambios conserva su entrada tal cual)
+        props = {}
+        if 'PMDL_Capa' in datos.propiedades:
+            props['capa'] = int(datos.propiedades['PMDL_Capa'])
+        if 'PMDL_Opacidad' in datos.propiedades:
+            props['opacidad'] = int((float(datos.propiedades['PMDL_Opacidad']) / 100.0) * 65535.0)
+        if 'PMDL_Flag' in datos.propiedades:
+            props['flag_especial'] = int(datos.propiedades['PMDL_Flag'])
+        if props and not reutilizar:
+            ENTRADA_PARTE.escribir(blob, entrada_offset, **props)
+
+        part_offset = entrada['offset']
+        subpartes   = entradas_subpartes(blob, part_offset)
+
+        if reutilizar:
+            # Solo se recodifican sus IDs para no romper el estado de columnas
+            for sub_entrada, entrada_sub in subpartes:
+                _recodificar_ids(blob, sub_entrada, entrada_sub, resolutor, codificador)
+            resumen['reutilizadas'] += 1
+            log(f"[export]   Parte {i:02d}: sin cambios, se conservan sus bytes")
+            continue
+
+        # Con vertices soldados al importar, PMDL_Slots dice que vertice de la malla
+        # ocupa cada vertice del archivo; sin el, el orden es 1 a 1
+        slots = datos.propiedades.get('PMDL_Slots')
+        if slots is not None and len(slots) and slots.max() >= len(datos.co):
+            log(f"[export] WARN: {datos.nombre}: PMDL_Slots no coincide con la malla, se ignora")
+            slots = None
+
+        # Pesos, coordenadas y UVs de toda la malla de una vez; cada subparte toma
+        # sus filas (y sus columnas de pesos) por indice
+        indice_vg       = {nombre: g for g, nombre in enumerate(datos.grupos)}
+        coords_obj      = coords_pmdl_objeto(datos, (factor_x, factor_y, factor_z), grosor_maximo)
+        uvs_obj, con_uv = uvs_pmdl_objeto(datos)
+        total_malla     = len(slots) if slots is not None else len(datos.co)
+
+        vert_index = 0
+
+        for sub_idx, (sub_entrada, entrada_sub) in enumerate(subpartes):
+            num_vertices = entrada_sub['num_vertices']
+            num_huesos   = entrada_sub['num_huesos']
+            offset_sub   = entrada_sub['offset']
+
+            # IDs reales de esta subparte (0xFF sin ID previo se exporta como hueso 0)
+            huesos_ids_resueltos = _recodificar_ids(blob, sub_entrada, entrada_sub, resolutor, codificador)
+
+            columnas_vg = [
+                indice_vg.get(
+                    obtener_nombre_hueso(hid if hid != ID_REPETIDO else 0, renombrar_huesos, nombres_map),
+                    -1,
+                )
+                for hid in huesos_ids_resueltos
+            ]
+
+            # Vertices de la malla que ocupan esta subparte (los que falten no se escriben)
+            cantidad = max(0, min(num_vertices, total_malla - vert_index))
+            if slots is not None:
+                indices = slots[vert_index:vert_index + cantidad]
+            else:
+                indices = np.arange(vert_index, vert_index + cantidad, dtype=np.int64)
+            vert_index += cantidad
+
+            # Vista de los registros de vertice dentro del blob; los que no caben completos se omiten
+            dtype       = dtype_vertice(num_huesos)
+            pos_base    = part_offset + offset_sub
+            disponibles = max(0, len(blob) - pos_base) // dtype.itemsize
+            if disponibles < cantidad:
+                log(f"[export] WARN: fuera de rango parte {i} sub {sub_idx}: "
+                      f"{cantidad - disponibles} vertices sin escribir")
+                indices = indices[:disponibles]
+            if not len(indices):
+                continue
+            registros = np.frombuffer(blob, dtype=dtype, count=len(indices), offset=pos_base)
+
+            # PESOS usando los IDs resueltos (nunca 0xFF)
+            registros['pesos']  = pesos_norm_a_bytes(datos.pesos[indices][:, columnas_vg])
+            # COORDENADAS en espacio mundo (incluye traslacion, rotacion y escala del objeto)
+            registros['coords'] = coords_obj[indices]
+            # UVs (los vertices sin loop conservan la UV original)
+            tiene_uv = con_uv[indices]
+            registros['uv'][tiene_uv] = uvs_obj[indices[tiene_uv]]
+
+        resumen['recodificadas'] += 1
+        log(f"[export]   Parte {i:02d}: {vert_index} vertices")
+
+    # Partes sin objeto: solo se recodifican sus IDs para no romper el estado de columnas
+    for _, _, sub_entrada, entrada_sub in recorrer_subpartes(blob, offset_indice_partes,
+                                                             cantidad_partes, desde=len(mallas)):
+        _recodificar_ids(blob, sub_entrada, entrada_sub, resolutor, codificador)
+
+    # HUESOS
+    cantidad_huesos = cabecera.cantidad_huesos
+    offset_huesos   = cabecera.offset_huesos
+    if armature and cantidad_huesos > 0:
+        huella = armature.huella()
+        resumen['huellas'].append((armature.objeto, huella))
+        if not forzar_completo and armature.huella_guardada == huella:
+            resumen['huesos'] = 'reutilizados'
+            log("[export] Huesos sin cambios, se conservan sus bytes")
+        else:
+            reconstruir_bloque_huesos(
+                armature        = armature,
+                blob            = blob,
+                offset_huesos   = offset_huesos,
+                cantidad_huesos = cantidad_huesos,
+                renombrar_huesos= renombrar_huesos,
+                log             = log,
+            )
+            resumen['huesos'] = 'actualizados'
+
+    log(f"[export] Partes: {resumen['reutilizadas']} reutilizadas, "
+          f"{resumen['recodificadas']} recodificadas")
+    resumen['segundos'] = time.perf_counter() - inicio
+    return resumen
+
+
+def codificar_en_paralelo(trabajos, hilos=None):
+    """
+    Codifica varios modelos a la vez en un pool de hilos. Cada trabajo es un dict
+    con los argumentos de codificar_pmdl; su 'blob' tiene que ser un buffer propio
+    o una ventana que no se solape con la de ningun otro trabajo. La mayor parte
+    del trabajo es NumPy y hashlib, que sueltan el GIL con arrays grandes.
+
+    Los mensajes de cada modelo se imprimen juntos al terminar, en el orden de los
+    trabajos. Retorna, por trabajo, el resumen de codificar_pmdl o la excepcion
+    que lanzo (un modelo que falla no detiene a los demas).
+    """
+    def codificar(trabajo):
+        mensajes = []
+        try:
+            return codificar_pmdl(log=mensajes.append, **trabajo), mensajes
+        except Exception as e:
+            mensajes.append(traceback.format_exc())
+            return e, mensajes
+
+    if not trabajos:
+        return []
+
+    hilos = hilos or min(len(trabajos), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        resultados = list(pool.map(codificar, trabajos))
+
+    for _, mensajes in resultados:
+        for mensaje in mensajes:
+            print(mensaje)
+    return [resultado for resultado, _ in resultados]
@@ -0,0 +1,195 @@
+import hashlib
+
+import numpy as np
+
+
+# Lectura de objetos de Blender a arrays de NumPy, una sola vez por objeto y
+# siempre en el hilo principal. El exporter codifica solo a partir de estos datos,
+# sin tocar bpy, asi que varios modelos se pueden codificar en paralelo.
+# La huella de cada objeto (PMDL_Huella) se guarda al importar y permite saber al
+# exportar que partes no cambiaron, para conservar sus bytes originales.
+
+PROPIEDADES_PARTE = ('PMDL_Capa', 'PMDL_Opacidad', 'PMDL_Flag', 'PMDL_Slots')
+
+
+class DatosMalla:
+    """
+    Todo lo que el exporter necesita de un objeto mesh:
+      co           : float32[V, 3]     posiciones locales
+      matriz       : float32[4, 4]     matrix_world
+      vertice_loop : int32[L]          vertice de cada loop
+      uv_loop      : float32[L, 2]     UV de cada loop (None sin capa UV activa)
+      pesos        : float32[V, G + 1] peso de cada vertice en cada vertex group;
+                     la ultima columna siempre es 0.0 (indice -1 = hueso sin grupo)
+      grupos       : nombres de los vertex groups, por indice
+      propiedades  : PMDL_Capa / PMDL_Opacidad / PMDL_Flag / PMDL_Slots presentes
+    'objeto' y 'huella_guardada' (PMDL_Huella) solo se usan para decidir si la parte
+    cambio y para guardar la huella nueva; la codificacion no los toca.
+    """
+    __slots__ = (
+        'nombre', 'co', 'matriz', 'vertice_loop', 'uv_loop', 'pesos', 'grupos', 'propiedades',
+        'objeto', 'huella_guardada',
+    )
+
+    def __init__(self, nombre, co, matriz, vertice_loop, uv_loop, pesos, grupos, propiedades,
+                 objeto=None, huella_guardada=None):
+        self.nombre       = nombre
+        self.co           = co
+        self.matriz       = matriz
+        self.vertice_loop = vertice_loop
+        self.uv_loop      = uv_loop
+        self.pesos        = pesos
+        self.grupos       = grupos
+        self.propiedades  = propiedades
+        self.objeto          = objeto
+        self.huella_guardada = huella_guardada
+
+    def huella(self):
+        """Resumen de 128 bits de todo lo que afecta a los bytes exportados de la parte."""
+        h = hashlib.blake2b(digest_size=16)
+        for array in (self.co, self.matriz, self.vertice_loop, self.pesos):
+            h.update(repr(array.shape).encode())
+            h.update(array.tobytes())
+        if self.uv_loop is None:
+            h.update(b'sin_uv')
+        else:
+            h.update(self.uv_loop.tobytes())
+        h.update('\0'.join(self.grupos).encode())
+        for clave in PROPIEDADES_PARTE:
+            valor = self.propiedades.get(clave)
+            h.update(clave.encode())
+            h.update(valor.tobytes() if isinstance(valor, np.ndarray) else repr(valor).encode())
+        return h.hexdigest()
+
+
+def leer_datos_malla(obj):
+    """Lee de una vez posiciones, loops, UVs, pesos y propiedades PMDL de un objeto mesh."""
+    mesh = obj.data
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+
+    vertice_loop = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", vertice_loop)
+
+    uv_loop  = None
+    uv_layer = mesh.uv_layers.active
+    if uv_layer:
+        uv_loop = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uv_loop)
+        uv_loop = uv_loop.reshape(-1, 2)
+
+    # Los pesos no tienen foreach_get: un recorrido por vertice y luego una asignacion
+    filas, columnas, valores = [], [], []
+    for vert in mesh.vertices:
+        for g in vert.groups:
+            filas.append(vert.index)
+            columnas.append(g.group)
+            valores.append(g.weight)
+
+    cantidad_grupos = len(obj.vertex_groups)
+    pesos    = np.zeros((len(mesh.vertices), cantidad_grupos + 1), dtype=np.float32)
+    columnas = np.asarray(columnas, dtype=np.int64)
+    validos  = columnas < cantidad_grupos
+    pesos[np.asarray(filas, dtype=np.int64)[validos], columnas[validos]] = \
+        np.asarray(valores, dtype=np.float32)[validos]
+
+    propiedades = {}
+    for clave in PROPIEDADES_PARTE:
+        if clave in obj:
+            propiedades[clave] = obj[clave]
+    if 'PMDL_Slots' in propiedades:
+        propiedades['PMDL_Slots'] = np.asarray(list(propiedades['PMDL_Slots']), dtype=np.int64)
+
+    return DatosMalla(
+        nombre       = obj.name,
+        co           = co.reshape(-1, 3),
+        matriz       = np.array(obj.matrix_world, dtype=np.float32),
+        vertice_loop = vertice_loop,
+        uv_loop      = uv_loop,
+        pesos        = pesos,
+        grupos       = [vg.name for vg in obj.vertex_groups],
+        propiedades  = propiedades,
+        objeto          = obj,
+        huella_guardada = obj.get('PMDL_Huella'),
+    )
+
+
+class DatosArmature:
+    """
+    Lo que reconstruir_bloque_huesos necesita del armature: por nombre de pose bone,
+    (head en espacio mundo, head del padre en espacio mundo o None).
+    """
+    __slots__ = ('posiciones', 'objeto', 'huella_guardada')
+
+    def __init__(self, posiciones, objeto=None, huella_guardada=None):
+        self.posiciones      = posiciones
+        self.objeto          = objeto
+        self.huella_guardada = huella_guardada
+
+    def huella(self):
+        h = hashlib.blake2b(digest_size=16)
+        for nombre, (head, head_padre) in self.posiciones.items():
+            h.update(nombre.encode() + b'\0')
+            h.update(repr((head, head_padre)).encode())
+        return h.hexdigest()
+
+
+def leer_datos_armature(armature_obj):
+    """Posiciones en espacio mundo de cada pose bone y de su padre (matrix_world @ head)."""
+    posiciones = {}
+    for pb in armature_obj.pose.bones:
+        hw = armature_obj.matrix_world @ pb.head
+        if pb.parent:
+            phw        = armature_obj.matrix_world @ pb.parent.head
+            head_padre = (phw.x, phw.y, phw.z)
+        else:
+            head_padre = None
+        posiciones[pb.name] = ((hw.x, hw.y, hw.z), head_padre)
+
+    return DatosArmature(
+        posiciones      = posiciones,
+        objeto          = armature_obj,
+        huella_guardada = armature_obj.get('PMDL_Huella'),
+    )
+
+
+def leer_modelo(objetos, armature_obj=None):
+    """DatosMalla de cada objeto (en orden) y DatosArmature del armature, si hay."""
+    mallas   = [leer_datos_malla(obj) for obj in objetos]
+    armature = None
+    if armature_obj is not None and armature_obj.type == 'ARMATURE':
+        armature = leer_datos_armature(armature_obj)
+    return mallas, armature
+
+
+def huella_objeto(obj):
+    """Huella de un objeto mesh o armature (None para otros tipos)."""
+    if obj.type == 'MESH':
+        return leer_datos_malla(obj).huella()
+    if obj.type == 'ARMATURE':
+        return leer_datos_armature(obj).huella()
+    return None
+
+
+def registrar_huellas(objetos, context=None):
+    """
+    Guarda PMDL_Huella en cada objeto con su estado actual. Se llama al terminar
+    el import, cuando el estado de la escena coincide con el archivo original.
+    """
+    # matrix_world y las poses se calculan al evaluar el depsgraph
+    if context is not None:
+        context.view_layer.update()
+    for obj in objetos:
+        huella = huella_objeto(obj)
+        if huella is not None:
+            obj["PMDL_Huella"] = huella
+
+
+def guardar_huellas(huellas):
+    """
+    Guarda las huellas (obj, huella) calculadas durante un export. Solo tiene
+    sentido si se exporto sobre el mismo archivo del que se leyo el original.
+    """
+    for obj, huella in huellas:
+        obj["PMDL_Huella"] = huella
@@ -4,7 +4,7 @@ import importlib
 
 
 def verificar_e_instalar(nombre_paquete, nombre_importacion=None):
-    #Verifica si el paquete "pillow" está instalado o no, de no estarlo, lo instala al momento de instalar el addon
+    #Verifica si el paquete está instalado o no, de no estarlo, lo instala al momento de instalar el addon
     if nombre_importacion is None:
         nombre_importacion = nombre_paquete
 
@@ -54,7 +54,8 @@ def verificar_e_instalar(nombre_paquete, nombre_importacion=None):
 def instalar_dependencias():
     #Instala todas las dependencias requeridas por el addon.
     print("\n[deps] Verificando dependencias del addon...")
-    ok = verificar_e_instalar("Pillow", "PIL")
+    # NumPy viene con Blender; solo se instala si falta (builds de Python sin el)
+    ok = verificar_e_instalar("numpy")
     if ok:
         print("[deps] Todas las dependencias estan listas\n")
     else:
@@ -0,0 +1,238 @@
+import bpy
+import os
+import time
+from bpy.props import StringProperty, BoolProperty
+
+from .exporter         import objetos_pmdl
+from .codificador_pmdl import codificar_en_paralelo
+from .datos_malla      import leer_modelo, guardar_huellas
+
+
+# Exporta de una vez todas las colecciones PMDL de la escena (PMDL directos y parches),
+# cada una a su archivo original o a un directorio de salida. Primero se leen en el
+# hilo principal todas las mallas y los archivos originales (cada archivo una sola
+# vez); despues se codifican todos los modelos de todas las colecciones en un mismo
+# pool de hilos, y al final se escribe cada archivo.
+
+
+def colecciones_exportables():
+    """Colecciones importadas de un PMDL o de un parche, ordenadas por nombre."""
+    return sorted(
+        [c for c in bpy.data.collections if 'PMDL_Tipo' in c or c.get("PMDL_Patch_Filepath")],
+        key=lambda c: c.name
+    )
+
+
+def _preparar_coleccion(col, directorio_salida, originales):
+    """
+    Lee de Blender los modelos de una coleccion. Retorna (lote, error); el lote
+    tiene el blob a exportar, su destino y los modelos (nombre, inicio, fin, mallas, armature).
+    """
+    from .logic_patch.patch_importer import modelos_parche
+
+    origen = col.get("PMDL_Patch_Filepath", "")
+    tipo   = "Parche" if origen else "PMDL"
+    if not origen:
+        origen = col.get("PMDL_Filepath", "")
+    if not origen or not os.path.exists(origen):
+        return None, f"archivo original no encontrado: {origen}"
+
+    # Un mismo original puede estar importado en varias colecciones: se lee una vez
+    if origen not in originales:
+        with open(origen, 'rb') as f:
+            originales[origen] = f.read()
+    blob = bytearray(originales[origen])
+
+    if tipo == "Parche":
+        modelos, error = modelos_parche(col, len(blob))
+        if error:
+            return None, error
+    else:
+        objetos, armature_obj = objetos_pmdl(col)
+        if not objetos:
+            return None, "la coleccion no contiene objetos mesh"
+        modelos = [("PMDL", 0, len(blob), objetos, armature_obj)]
+
+    lote = {
+        'coleccion' : col,
+        'tipo'      : tipo,
+        'origen'    : origen,
+        'destino'   : os.path.join(directorio_salida, os.path.basename(origen)) if directorio_salida else origen,
+        'blob'      : blob,
+        'modelos'   : [],
+        'renombrar' : bool(col.get("PMDL_Renombrar_Huesos", True)),
+    }
+    for nombre, inicio, fin, objetos, armature_obj in modelos:
+        mallas, armature = leer_modelo(objetos, armature_obj)
+        lote['modelos'].append((nombre, inicio, fin, mallas, armature))
+    return lote, None
+
+
+def exportar_lote(colecciones, directorio_salida="", grosor_maximo=False, forzar_completo=False):
+    """
+    Exporta cada coleccion a su archivo original (o a directorio_salida con el mismo
+    nombre de archivo). Retorna una fila de resumen por coleccion:
+    {'coleccion', 'tipo', 'destino', 'estado', 'reutilizadas', 'recodificadas',
+     'lectura', 'codificacion', 'escritura'} con los tiempos en segundos.
+    """
+    from .logic_patch.patch_importer import aplicar_resultados_parche
+
+    inicio_total = time.perf_counter()
+    originales   = {}
+    destinos     = set()
+    lotes        = []
+    filas        = []
+
+    # 1. Leer originales y mallas (hilo principal)
+    for col in colecciones:
+        t0          = time.perf_counter()
+        lote, error = _preparar_coleccion(col, directorio_salida, originales)
+        fila = {
+            'coleccion'     : col.name,
+            'tipo'          : lote['tipo'] if lote else '-',
+            'destino'       : lote['destino'] if lote else '',
+            'estado'        : 'OK',
+            'reutilizadas'  : 0,
+            'recodificadas' : 0,
+            'lectura'       : time.perf_counter() - t0,
+            'codificacion'  : 0.0,
+            'escritura'     : 0.0,
+        }
+        filas.append(fila)
+
+        if lote is not None:
+            destino_normal = os.path.normcase(os.path.abspath(lote['destino']))
+            if destino_normal in destinos:
+                error = f"otra coleccion ya exporta a {lote['destino']}"
+            destinos.add(destino_normal)
+        if error:
+            fila['estado'] = f"ERROR: {error}"
+            print(f"[lote] WARN: {col.name}: {error}, se omite")
+            continue
+        lote['fila'] = fila
+        lotes.append(lote)
+
+    # 2. Codificar todos los modelos de todas las colecciones a la vez
+    trabajos = []
+    for lote in lotes:
+        vista = memoryview(lote['blob'])
+        lote['vista'] = vista
+        for _, inicio, fin, mallas, armature in lote['modelos']:
+            trabajos.append(dict(
+                blob             = vista[inicio:fin],
+                mallas           = mallas,
+                armature         = armature,
+                renombrar_huesos = lote['renombrar'],
+                grosor_maximo    = grosor_maximo,
+                forzar_completo  = forzar_completo,
+            ))
+    resultados = codificar_en_paralelo(trabajos)
+
+    # 3. Revisar resultados y escribir cada archivo
+    posicion = 0
+    for lote in lotes:
+        fila       = lote['fila']
+        cantidad   = len(lote['modelos'])
+        propios    = resultados[posicion : posicion + cantidad]
+        posicion  += cantidad
+
+        if lote['tipo'] == "Parche":
+            resumenes, error = aplicar_resultados_parche(
+                lote['modelos'], propios, lote['vista'], lote['origen']
+            )
+        elif isinstance(propios[0], Exception):
+            resumenes, error = None, str(propios[0])
+        else:
+            resumenes, error = propios, None
+        fila['codificacion'] = sum(r['segundos'] for r in propios if not isinstance(r, Exception))
+        if error:
+            fila['estado'] = f"ERROR: {error}"
+            continue
+
+        t0 = time.perf_counter()
+        try:
+            with open(lote['destino'], 'wb') as f:
+                f.write(lote['blob'])
+        except OSError as e:
+            fila['estado'] = f"ERROR: {e}"
+            continue
+        fila['escritura'] = time.perf_counter() - t0
+
+        # Si se sobrescribio el original, las huellas pasan a describir el nuevo contenido
+        if os.path.samefile(lote['destino'], lote['origen']):
+            for resumen in resumenes:
+                guardar_huellas(resumen['huellas'])
+
+        fila['reutilizadas']  = sum(r['reutilizadas'] for r in resumenes)
+        fila['recodificadas'] = sum(r['recodificadas'] for r in resumenes)
+
+    imprimir_resumen(filas, time.perf_counter() - inicio_total)
+    return filas
+
+
+def imprimir_resumen(filas, segundos_total):
+    print(f"\n{'='*96}")
+    print(f"{'Coleccion':<24} {'Tipo':<6} {'Reutil.':>7} {'Recod.':>6} "
+          f"{'Lectura':>9} {'Codif.':>9} {'Escrit.':>9}  Estado")
+    print(f"{'-'*96}")
+    for fila in filas:
+        print(f"{fila['coleccion'][:24]:<24} {fila['tipo']:<6} {fila['reutilizadas']:>7} "
+              f"{fila['recodificadas']:>6} {1e3 * fila['lectura']:>7.1f}ms "
+              f"{1e3 * fila['codificacion']:>7.1f}ms {1e3 * fila['escritura']:>7.1f}ms  {fila['estado']}")
+    print(f"{'-'*96}")
+    print(f"[lote] {len(filas)} colecciones en {segundos_total:.2f}s")
+    print(f"{'='*96}")
+
+
+class ExportLotePMDL(bpy.types.Operator):
+    """Exportar todas las colecciones PMDL y parches TTT de la escena"""
+    bl_idname  = "export_scene.pmdl_lote"
+    bl_label   = "Exportar Todo (PMDL/Parches)"
+    bl_options = {'REGISTER'}
+
+    directorio_salida: StringProperty(
+        name="Directorio de Salida",
+        description="Vacio: cada coleccion sobrescribe su archivo original",
+        subtype='DIR_PATH',
+        default="",
+    )
+    grosor_maximo: BoolProperty(
+        name="Grosor Maximo",
+        description="Exportar con grosor maximo (512.0) ajustando vertices automaticamente",
+        default=False,
+    )
+    forzar_completo: BoolProperty(
+        name="Recodificar Todo",
+        description="Recodificar todas las partes y huesos aunque no hayan cambiado desde el import",
+        default=False,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        colecciones = colecciones_exportables()
+        if not colecciones:
+            self.report({'ERROR'}, "No se encontro ninguna coleccion de PMDL en la escena")
+            return {'CANCELLED'}
+
+        directorio = bpy.path.abspath(self.directorio_salida) if self.directorio_salida else ""
+        if directorio and not os.path.isdir(directorio):
+            self.report({'ERROR'}, f"Directorio de salida no encontrado: {directorio}")
+            return {'CANCELLED'}
+
+        filas   = exportar_lote(colecciones, directorio, self.grosor_maximo, self.forzar_completo)
+        errores = sum(1 for fila in filas if fila['estado'] != 'OK')
+        if errores == len(filas):
+            self.report({'ERROR'}, "No se pudo exportar ninguna coleccion (ver consola)")
+            return {'CANCELLED'}
+        if errores:
+            self.report({'WARNING'}, f"Exportadas {len(filas) - errores} colecciones, "
+                                     f"{errores} con errores (ver consola)")
+        else:
+            self.report({'INFO'}, f"Exportadas {len(filas)} colecciones")
+        return {'FINISHED'}
+
+
+def menu_func_export_lote(self, context):
+    self.layout.operator(ExportLotePMDL.bl_idname, text="Todo PMDL/Parches TTT (lote)")
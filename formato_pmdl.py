@@ -0,0 +1,199 @@
+import struct
+
+import numpy as np
+
+
+# Tipos struct -> tipos NumPy (little-endian, como el resto del formato)
+_TIPOS_DTYPE = {
+    'B': 'u1', 'b': 'i1',
+    'H': '<u2', 'h': '<i2',
+    'I': '<u4', 'i': '<i4',
+    'f': '<f4',
+}
+
+
+class Registro:
+    """
+    Registro binario de tamano fijo del formato PMDL.
+
+    Se declara una sola vez como lista de campos (nombre, offset, tipo struct[, cantidad])
+    y a partir de ella se construyen:
+      - struct : struct.Struct precompilado que lee el registro completo de una vez
+      - dtype  : dtype de NumPy para leer/escribir tablas enteras de registros
+
+    Los huecos no declarados se saltan al leer y no se tocan al escribir, de modo
+    que escribir() nunca pisa datos que todavia no entendemos.
+    """
+    __slots__ = ('nombre', 'tamano', 'struct', 'dtype', 'nombres', '_tuplas', '_escritura')
+
+    def __init__(self, nombre, tamano, campos):
+        self.nombre     = nombre
+        self.tamano     = tamano
+        self.nombres    = []
+        self._tuplas    = []   # (nombre, primer valor, cantidad) de los campos con varios valores
+        self._escritura = {}   # nombre -> (offset, struct.Struct del campo, es_tupla)
+
+        formato  = '<'
+        pos      = 0
+        n_valor  = 0
+        dt_formatos, dt_offsets = [], []
+
+        for campo in sorted(campos, key=lambda c: c[1]):
+            nombre_campo, offset, tipo = campo[:3]
+            cantidad = campo[3] if len(campo) > 3 else 1
+
+            if offset < pos:
+                raise ValueError(f"{nombre}: campo '{nombre_campo}' solapado en 0x{offset:X}")
+            if offset > pos:
+                formato += f'{offset - pos}x'
+
+            if tipo == 's':
+                codigo = f'{cantidad}s'
+                n_valores = 1
+                dt_formatos.append(f'S{cantidad}')
+            else:
+                codigo = f'{cantidad}{tipo}'
+                n_valores = cantidad
+                dt_formatos.append((_TIPOS_DTYPE[tipo], (cantidad,)) if cantidad > 1 else _TIPOS_DTYPE[tipo])
+
+            formato += codigo
+            es_tupla = n_valores > 1
+            if es_tupla:
+                self._tuplas.append((nombre_campo, n_valor, cantidad))
+            self._escritura[nombre_campo] = (offset, struct.Struct('<' + codigo), es_tupla)
+            self.nombres.append(nombre_campo)
+            dt_offsets.append(offset)
+
+            n_valor += n_valores
+            pos      = offset + struct.calcsize('<' + codigo)
+
+        if pos > tamano:
+            raise ValueError(f"{nombre}: los campos ocupan 0x{pos:X} bytes, mas que 0x{tamano:X}")
+        if pos < tamano:
+            formato += f'{tamano - pos}x'
+
+        self.struct = struct.Struct(formato)
+        self.dtype  = np.dtype({
+            'names'   : self.nombres,
+            'formats' : dt_formatos,
+            'offsets' : dt_offsets,
+            'itemsize': tamano,
+        })
+
+    def _a_dict(self, valores):
+        if not self._tuplas:
+            return dict(zip(self.nombres, valores))
+
+        # Reagrupar los campos con varios valores en tuplas
+        planos = []
+        pos    = 0
+        for _, inicio, cantidad in self._tuplas:
+            planos.extend(valores[pos:inicio])
+            planos.append(valores[inicio:inicio + cantidad])
+            pos = inicio + cantidad
+        planos.extend(valores[pos:])
+        return dict(zip(self.nombres, planos))
+
+    def leer(self, blob, offset=0):
+        """Lee un registro completo con una sola llamada. Retorna dict campo -> valor."""
+        return self._a_dict(self.struct.unpack_from(blob, offset))
+
+    def iterar(self, blob, offset, cantidad):
+        """Lista de los 'cantidad' registros consecutivos (acotada al tamano del buffer)."""
+        cantidad = min(cantidad, max(0, len(blob) - offset) // self.tamano)
+        vista    = memoryview(blob)[offset : offset + cantidad * self.tamano]
+        return [self._a_dict(valores) for valores in self.struct.iter_unpack(vista)]
+
+    def tuplas(self, blob, offset, cantidad):
+        """
+        Como iterar(), pero cada registro es la tupla de struct sin armar el dict
+        (valores en el orden de 'nombres', los campos con varios valores aplanados).
+        Para los recorridos de tablas grandes.
+        """
+        cantidad = min(cantidad, max(0, len(blob) - offset) // self.tamano)
+        return self.struct.iter_unpack(memoryview(blob)[offset : offset + cantidad * self.tamano])
+
+    def escribir(self, blob, offset=0, **campos):
+        """
+        Escribe los campos indicados de un registro, una llamada pack_into por campo.
+        Los campos no indicados y los huecos no declarados se conservan.
+        """
+        for nombre, valor in campos.items():
+            offset_campo, codec, es_tupla = self._escritura[nombre]
+            if es_tupla:
+                codec.pack_into(blob, offset + offset_campo, *valor)
+            else:
+                codec.pack_into(blob, offset + offset_campo, valor)
+
+    def tabla(self, blob, offset, cantidad):
+        """Vista NumPy de 'cantidad' registros consecutivos (escribible si el buffer lo es)."""
+        cantidad = min(cantidad, max(0, len(blob) - offset) // self.tamano)
+        return np.frombuffer(blob, dtype=self.dtype, count=cantidad, offset=offset)
+
+
+# -----------------------------------------------------------------------------
+# REGISTROS DEL FORMATO
+# -----------------------------------------------------------------------------
+
+CABECERA = Registro('cabecera', 0x64, [
+    ('firma'               , 0x00, 's', 4),
+    ('cantidad_huesos'     , 0x08, 'I'),
+    ('grosor'              , 0x40, 'f', 3),
+    ('offset_huesos'       , 0x50, 'I'),
+    ('cantidad_partes'     , 0x5C, 'I'),
+    ('offset_indice_partes', 0x60, 'I'),
+])
+
+ENTRADA_PARTE = Registro('entrada_parte', 0x20, [
+    ('capa'         , 0x00, 'H'),
+    ('opacidad'     , 0x02, 'H'),
+    ('offset'       , 0x04, 'I'),
+    ('longitud'     , 0x08, 'I'),
+    ('flag_especial', 0x0C, 'I'),
+])
+
+# Cada parte empieza con la cantidad de subpartes, seguida de sus entradas
+CABECERA_PARTE = Registro('cabecera_parte', 0x04, [
+    ('cantidad_subpartes', 0x00, 'I'),
+])
+
+ENTRADA_SUBPARTE = Registro('entrada_subparte', 0x10, [
+    ('num_vertices', 0x00, 'H'),
+    ('num_huesos'  , 0x02, 'H'),
+    ('huesos_ids'  , 0x04, 's', 8),
+    ('offset'      , 0x0C, 'I'),
+])
+
+HUESO = Registro('hueso', 0xA0, [
+    ('marcador'  , 0x00, 'I'),
+    ('pop_level' , 0x04, 'B'),
+    ('constante' , 0x08, 'B'),
+    ('id'        , 0x0A, 'B'),
+    ('pos'       , 0x10, 'f', 4),
+    ('pos_padre' , 0x20, 'f', 4),
+    ('diferencia', 0x30, 'f', 4),
+    ('local'     , 0x40, 'f', 4),
+    ('escala'    , 0x50, 'f', 4),
+])
+
+
+def entradas_subpartes(blob, part_offset):
+    """
+    Entradas de subparte de la parte que empieza en 'part_offset', acotadas al buffer.
+    Retorna [(offset de la entrada, dict de ENTRADA_SUBPARTE)].
+    """
+    if part_offset + CABECERA_PARTE.tamano > len(blob):
+        return []
+    cantidad = CABECERA_PARTE.leer(blob, part_offset)['cantidad_subpartes']
+    inicio   = part_offset + CABECERA_PARTE.tamano
+    return [(inicio + j * ENTRADA_SUBPARTE.tamano, entrada)
+            for j, entrada in enumerate(ENTRADA_SUBPARTE.iterar(blob, inicio, cantidad))]
+
+
+def dtype_vertice(num_huesos):
+    """Registro de un vertice: pesos big-endian, UV uint8 y coordenadas int16."""
+    return np.dtype([
+        ('pesos' , '>u2', (num_huesos,)),
+        ('uv'    , 'u1' , (2,)),
+        ('coords', '<i2', (3,)),
+    ])
@@ -3,6 +3,7 @@ from bpy.props import StringProperty, BoolProperty
 from bpy_extras.io_utils import ImportHelper
 
 from .pmdl_parser import analizar_pmdl
+from .cache_parse import analizar_pmdl_cacheado
 from .builder import crear_mesh_blender
 from .rutas_recientes import (
     aplicar_ruta_inicial, set_ruta,
@@ -28,12 +29,28 @@ class ImportPMDL(bpy.types.Operator, ImportHelper):
         default=True,
     )
 
+    usar_cache: BoolProperty(
+        name="Usar Cache",
+        description="Reutilizar la geometria decodificada de importaciones anteriores del mismo archivo",
+        default=True,
+    )
+
+    soldar_vertices: BoolProperty(
+        name="Soldar Vertices",
+        description="Unir los vertices repetidos entre tiras (misma posicion, UV y pesos). "
+                    "El exportador sigue escribiendo todos los vertices del archivo",
+        default=False,
+    )
+
     def invoke(self, context, event):
         aplicar_ruta_inicial(self, _CLAVE_IMPORT_PMDL, "")
         return super().invoke(context, event)
 
     def execute(self, context):
-        info, error = analizar_pmdl(self.filepath)
+        if self.usar_cache:
+            info, error = analizar_pmdl_cacheado(self.filepath)
+        else:
+            info, error = analizar_pmdl(self.filepath)
 
         if error:
             self.report({'ERROR'}, error)
@@ -41,7 +58,8 @@ class ImportPMDL(bpy.types.Operator, ImportHelper):
 
         set_ruta(_CLAVE_IMPORT_PMDL, self.filepath)
 
-        objetos = crear_mesh_blender(info, 0.015625, self.renombrar_huesos, context)
+        objetos = crear_mesh_blender(info, 0.015625, self.renombrar_huesos, context,
+                                     soldar=self.soldar_vertices)
 
         bpy.ops.object.select_all(action='DESELECT')
         for obj in objetos:
@@ -1 +1,2 @@
-from .patch_importer import ImportPatch, ExportPatch, menu_func_import_patch, menu_func_export_patch
\ No newline at end of file
+from .patch_importer import ImportPatch, ExportPatch, menu_func_import_patch, menu_func_export_patch
+from .paleta_parche  import AplicarPaletaParches, menu_func_paleta_lote
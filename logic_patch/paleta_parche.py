@@ -0,0 +1,82 @@
+import bpy
+import os
+from bpy.props import StringProperty, IntProperty, CollectionProperty
+from bpy_extras.io_utils import ImportHelper
+
+from .recoloreado import leer_archivo_paleta, aplicar_paleta_a_parches
+
+
+class AplicarPaletaParches(bpy.types.Operator, ImportHelper):
+    """Aplicar una paleta a la textura de varios parches DBZ TTT (recoloreados)"""
+    bl_idname  = "export_scene.ttt_paleta_lote"
+    bl_label   = "Aplicar Paleta a Parches"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".PCK1"
+    filter_glob: StringProperty(
+        default="*.PCK1;*.pak;*.unk",
+        options={'HIDDEN'},
+    )
+    files: CollectionProperty(
+        type=bpy.types.OperatorFileListElement,
+        options={'HIDDEN', 'SKIP_SAVE'},
+    )
+    directory: StringProperty(
+        subtype='DIR_PATH',
+        options={'HIDDEN'},
+    )
+
+    paleta_filepath: StringProperty(
+        name="Archivo de Paleta",
+        description="Paleta RGBA cruda (0x40 o 0x400 bytes) o un parche ya recoloreado del que tomar la paleta",
+        subtype='FILE_PATH',
+        default="",
+    )
+    indice_textura: IntProperty(
+        name="Textura",
+        description="Textura del parche a la que se aplica la paleta (1 = la principal)",
+        default=1,
+        min=1,
+        max=8,
+    )
+    directorio_salida: StringProperty(
+        name="Directorio de Salida",
+        description="Vacio: se sobrescribe cada parche seleccionado",
+        subtype='DIR_PATH',
+        default="",
+    )
+
+    def execute(self, context):
+        rutas = [os.path.join(self.directory, f.name) for f in self.files if f.name]
+        if not rutas and self.filepath:
+            rutas = [self.filepath]
+        if not rutas:
+            self.report({'ERROR'}, "No se selecciono ningun parche")
+            return {'CANCELLED'}
+
+        paleta_bytes, error = leer_archivo_paleta(bpy.path.abspath(self.paleta_filepath),
+                                                  self.indice_textura - 1)
+        if error:
+            self.report({'ERROR'}, error)
+            return {'CANCELLED'}
+
+        directorio = bpy.path.abspath(self.directorio_salida) if self.directorio_salida else ""
+        if directorio and not os.path.isdir(directorio):
+            self.report({'ERROR'}, f"Directorio de salida no encontrado: {directorio}")
+            return {'CANCELLED'}
+
+        resultados = aplicar_paleta_a_parches(rutas, paleta_bytes, self.indice_textura - 1, directorio)
+        errores    = sum(1 for _, error in resultados if error)
+        if errores == len(resultados):
+            self.report({'ERROR'}, "No se pudo aplicar la paleta a ningun parche (ver consola)")
+            return {'CANCELLED'}
+        if errores:
+            self.report({'WARNING'}, f"Paleta aplicada a {len(resultados) - errores} parches, "
+                                     f"{errores} con errores (ver consola)")
+        else:
+            self.report({'INFO'}, f"Paleta aplicada a {len(resultados)} parches")
+        return {'FINISHED'}
+
+
+def menu_func_paleta_lote(self, context):
+    self.layout.operator(AplicarPaletaParches.bl_idname, text="Paleta a Parches TTT (lote)")
@@ -3,6 +3,7 @@ from bpy.props import StringProperty, BoolProperty
 from bpy_extras.io_utils import ImportHelper
 import io
 import os
+import time
 
 from .patch_parser import leer_parche, leer_caras_pmdf
 from .tex_decoder  import textura_a_blender
@@ -36,6 +37,20 @@ class ImportPatch(bpy.types.Operator, ImportHelper):
         default=True,
     )
 
+    usar_cache: BoolProperty(
+        name="Usar Cache",
+        description="Reutilizar la geometria decodificada de importaciones anteriores del mismo archivo "
+                    "y las texturas ya decodificadas (de cualquier parche con los mismos bytes)",
+        default=True,
+    )
+
+    soldar_vertices: BoolProperty(
+        name="Soldar Vertices",
+        description="Unir los vertices repetidos entre tiras (misma posicion, UV y pesos). "
+                    "El exportador sigue escribiendo todos los vertices del archivo",
+        default=False,
+    )
+
     def invoke(self, context, event):
         aplicar_ruta_inicial(self, _CLAVE_IMPORT_PATCH, "")
         return super().invoke(context, event)
@@ -49,24 +64,25 @@ class ImportPatch(bpy.types.Operator, ImportHelper):
             self.report({'ERROR'}, f"Error al leer parche: {error}")
             return {'CANCELLED'}
 
-        # 2. Parsear PMDL principal
-        info_pmdl, error_pmdl = _analizar_pmdl_desde_bytes(
-            info_patch['pmdl_datos'],
-            nombre=info_patch['nombre']
+        # 2. Parsear PMDL principal y caras PMDF (o recuperarlos de la cache)
+        caras = leer_caras_pmdf(info_patch['blob'])
+        info_pmdl, modelos_caras, error_pmdl = _analizar_parche(
+            info_patch, caras, self.filepath, self.usar_cache
         )
         if error_pmdl:
             self.report({'ERROR'}, f"Error al parsear PMDL: {error_pmdl}")
             return {'CANCELLED'}
 
-        # 3. Decodificar textura
-        bl_imagen = textura_a_blender(
-            blob           = info_patch['blob'],
-            indices_offset = info_patch['indices_offset'],
-            paleta_offset  = info_patch['paleta_offset'],
-            nombre         = info_patch['nombre'],
-        )
+        # 3. Registrar texturas (la primera va al material; las demas quedan como <nombre>_2_tex, ...).
+        #    Se decodifican solo si su contenido no esta ya en Blender, en memoria o en la cache
+        bl_imagen = None
+        for i, textura in enumerate(info_patch['texturas']):
+            imagen = textura_a_blender(info_patch['blob'], textura, nombre_textura(info_patch['nombre'], i),
+                                       self.usar_cache)
+            if i == 0:
+                bl_imagen = imagen
         if bl_imagen is None:
-            self.report({'WARNING'}, "No se pudo decodificar la textura (Pillow instalado?)")
+            self.report({'WARNING'}, "No se pudo registrar la textura en Blender")
 
         # 4. Crear mesh + armature principal
         objetos = crear_mesh_blender(
@@ -74,6 +90,7 @@ class ImportPatch(bpy.types.Operator, ImportHelper):
             escala           = 0.015625,
             renombrar_huesos = self.renombrar_huesos,
             context          = context,
+            soldar           = self.soldar_vertices,
         )
 
         # Obtener coleccion y armature reales desde el atributo expuesto por crear_mesh_blender
@@ -97,16 +114,19 @@ class ImportPatch(bpy.types.Operator, ImportHelper):
 
         # 7. Importar caras PMDF extra como sub-colecciones
         caras_importadas = 0
-        caras = leer_caras_pmdf(info_patch['blob'])
         for cara in caras:
+            if cara['nombre'] not in modelos_caras:
+                continue
             try:
                 objetos_cara = _importar_cara_pmdf(
                     cara             = cara,
+                    info_cara        = modelos_caras[cara['nombre']],
                     col_principal    = col_principal,
                     armature_obj     = armature_obj,
                     renombrar_huesos = self.renombrar_huesos,
                     context          = context,
                     ocultar          = self.ocultar_pmdf,
+                    soldar           = self.soldar_vertices,
                 )
                 if objetos_cara is None:
                     continue
@@ -149,24 +169,17 @@ def _buscar_layer_collection(layer_col, nombre):
     return None
 
 
-def _importar_cara_pmdf(cara, col_principal, armature_obj, renombrar_huesos,
-                        context, ocultar=True):
-    # Importa cara PMDF como sub-coleccion hija de col_principal
+def _importar_cara_pmdf(cara, info_cara, col_principal, armature_obj, renombrar_huesos,
+                        context, ocultar=True, soldar=False):
+    # Importa cara PMDF (ya parseada) como sub-coleccion hija de col_principal
     from ..builder import _crear_objeto_mesh, crear_material_tex_ttt
     from ..bone_builder import cargar_nombres_huesos
+    from ..datos_malla import registrar_huellas
 
     if col_principal is None:
         print(f"[patch] WARN: {cara['nombre']} - col_principal es None")
         return None
 
-    info_cara, error_cara = _analizar_pmdl_desde_bytes(
-        cara['datos'],
-        nombre=cara['nombre']
-    )
-    if error_cara:
-        print(f"[patch] WARN: {cara['nombre']} no se pudo parsear: {error_cara}")
-        return None
-
     # Crear subcoleccion con el nombre de la cara dentro de col_principal
     nombre_subcol = cara['nombre']
     if nombre_subcol in bpy.data.collections:
@@ -213,81 +226,74 @@ def _importar_cara_pmdf(cara, col_principal, armature_obj, renombrar_huesos,
             nombres_huesos   = nombres_huesos,
             prefijo_nombre   = cara['nombre'],
             pmdf_cara        = cara['nombre'],
+            soldar           = soldar,
         )
         objetos_cara.append(obj)
 
+    registrar_huellas(objetos_cara, context)
     return objetos_cara
 
 
 
-def _analizar_pmdl_desde_bytes(pmdl_bytes, nombre):
-    import struct
-    import os
-
-    # Importar utilidades del addon principal
-    from ..binary_utils import (
-        FLAGS_ESPECIALES,
-        leer_uint32, leer_uint16, leer_uint8, leer_int16, leer_float32
+def _analizar_parche(info_patch, caras, filepath, usar_cache):
+    """
+    Parsea el PMDL principal y las caras PMDF del parche. Con usar_cache se
+    recuperan de la cache en disco si el parche no cambio, o se guardan en ella
+    tras decodificarlos (las texturas tienen su propia cache, ver tex_decoder).
+    Retorna (info_pmdl, modelos_caras, error); modelos_caras es nombre -> modelo.
+    """
+    from ..cache_parse import (
+        cache_activa, clave_archivo, cargar_entrada, guardar_entrada,
+        modelo_a_arrays, modelo_desde_arrays
     )
-    from ..pmdl_parser import analizar_subpartes
-
-    blob = pmdl_bytes
-
-    firma = blob[0:4].decode('ascii', errors='ignore')
-    if firma not in ('pMdl', 'pMdF'):
-        return None, f"Firma invalida: {firma}"
-
-    info = {}
-    info['nombre']   = nombre + '.pmdl'
-    info['filepath'] = ''
-    info['tipo']     = firma
-
-    info['grosor_x'] = leer_float32(blob, 0x40)
-    info['grosor_y'] = leer_float32(blob, 0x44)
-    info['grosor_z'] = leer_float32(blob, 0x48)
-
-    info['cantidad_huesos']      = leer_uint32(blob, 0x08)
-    info['offset_huesos']        = leer_uint32(blob, 0x50)
-    info['cantidad_partes']      = leer_uint32(blob, 0x5C)
-    info['offset_indice_partes'] = leer_uint32(blob, 0x60)
 
-    info['blob'] = blob
-
-    ids_previas_global = [None, None, None, None]
-    partes = []
-
-    for i in range(info['cantidad_partes']):
-        entrada_offset = info['offset_indice_partes'] + (i * 0x20)
+    clave   = None
+    entrada = None
+    if usar_cache and cache_activa():
+        clave   = clave_archivo(filepath, info_patch['blob'])
+        entrada = cargar_entrada(clave)
+
+    if entrada is not None:
+        info_pmdl = modelo_desde_arrays(entrada, info_patch['pmdl_datos'], 'pmdl_')
+        if info_pmdl is not None:
+            modelos_caras = {}
+            for cara in caras:
+                info_cara = modelo_desde_arrays(entrada, cara['datos'], cara['nombre'] + '_')
+                if info_cara is not None:
+                    modelos_caras[cara['nombre']] = info_cara
+            return info_pmdl, modelos_caras, None
+
+    info_pmdl, error = _analizar_pmdl_desde_bytes(
+        info_patch['pmdl_datos'],
+        nombre=info_patch['nombre']
+    )
+    if error:
+        return None, {}, error
 
-        if entrada_offset + 0x20 > len(blob):
-            break
+    modelos_caras = {}
+    for cara in caras:
+        try:
+            info_cara, error_cara = _analizar_pmdl_desde_bytes(cara['datos'], nombre=cara['nombre'])
+        except Exception as e:
+            error_cara = e
+        if error_cara:
+            print(f"[patch] WARN: {cara['nombre']} no se pudo parsear: {error_cara}")
+            continue
+        modelos_caras[cara['nombre']] = info_cara
 
-        capa          = leer_uint16(blob, entrada_offset + 0x00)
-        opacidad      = leer_uint16(blob, entrada_offset + 0x02)
-        part_offset   = leer_uint32(blob, entrada_offset + 0x04)
-        part_length   = leer_uint32(blob, entrada_offset + 0x08)
-        flag_especial = leer_uint32(blob, entrada_offset + 0x0C)
-        flag_bytes    = blob[entrada_offset + 0x0C : entrada_offset + 0x10]
-        nombre_flag   = FLAGS_ESPECIALES.get(flag_especial, "Desconocido")
+    if clave is not None:
+        arrays = modelo_a_arrays(info_pmdl, 'pmdl_')
+        for nombre, info_cara in modelos_caras.items():
+            arrays.update(modelo_a_arrays(info_cara, nombre + '_'))
+        guardar_entrada(clave, arrays)
 
-        datos_parte = blob[part_offset : part_offset + part_length]
-        subpartes, ids_previas_global = analizar_subpartes(datos_parte, ids_previas_global)
+    return info_pmdl, modelos_caras, None
 
-        partes.append({
-            'indice'            : i,
-            'capa'              : capa,
-            'opacidad'          : opacidad,
-            'offset'            : part_offset,
-            'longitud'          : part_length,
-            'flag_especial'     : flag_especial,
-            'flag_bytes_raw'    : flag_bytes.hex(),
-            'nombre_flag'       : nombre_flag,
-            'subpartes'         : subpartes,
-            'cantidad_subpartes': len(subpartes),
-        })
 
-    info['partes'] = partes
-    return info, None
+def _analizar_pmdl_desde_bytes(pmdl_bytes, nombre):
+    # PMDL/PMDF embebido en el parche: mismo motor que los archivos sueltos
+    from ..pmdl_parser import analizar_pmdl_bytes
+    return analizar_pmdl_bytes(pmdl_bytes, nombre + '.pmdl')
 
 
 def _asignar_textura_a_material(bl_imagen):
@@ -310,32 +316,6 @@ def menu_func_import_patch(self, context):
 
 
 
-def _exportar_a_bytes(exportar_pmdl_fn, objetos, armature_obj,
-                      blob_original, renombrar, grosor_maximo=False):
-    # Exporta PMDL/PMDF a bytes via archivo temporal
-    import tempfile
-    with tempfile.NamedTemporaryFile(suffix='.pmdl', delete=False) as tmp:
-        tmp_path = tmp.name
-    try:
-        exportar_pmdl_fn(
-            filepath         = tmp_path,
-            objetos          = objetos,
-            armature_obj     = armature_obj,
-            blob_original    = blob_original,
-            renombrar_huesos = renombrar,
-            grosor_maximo    = grosor_maximo,
-        )
-        with open(tmp_path, 'rb') as f:
-            return f.read()
-    except Exception as e:
-        print(f'[patch_export] ERROR: {e}')
-        import traceback
-        traceback.print_exc()
-        return None
-    finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
-
 # -----------------------------------------------------------------------------
 # EXPORT DE PARCHE
 # -----------------------------------------------------------------------------
@@ -358,6 +338,17 @@ class ExportPatch(bpy.types.Operator, ImportHelper):
         description="Exportar con grosor maximo (512.0)",
         default=False,
     )
+    forzar_completo: BoolProperty(
+        name="Recodificar Todo",
+        description="Recodificar todas las partes y huesos aunque no hayan cambiado desde el import",
+        default=False,
+    )
+    exportar_textura: BoolProperty(
+        name="Exportar Textura",
+        description="Escribir en el parche la textura editada en Blender (<parche>_tex), "
+                    "cuantizada a la paleta de la textura",
+        default=False,
+    )
 
     def invoke(self, context, event):
         col = self._coleccion_pmdl(context)
@@ -379,9 +370,8 @@ class ExportPatch(bpy.types.Operator, ImportHelper):
         return super().invoke(context, event)
 
     def execute(self, context):
-        from ..exporter import exportar_pmdl
-        from .patch_parser import CARAS_PMDF
-        import tempfile
+        from ..codificador_pmdl import codificar_en_paralelo
+        from ..datos_malla import leer_modelo, guardar_huellas
 
         col = self._coleccion_pmdl(context)
         if not col:
@@ -398,14 +388,7 @@ class ExportPatch(bpy.types.Operator, ImportHelper):
             self.report({'ERROR'}, f"Archivo de parche original no encontrado: {patch_filepath}")
             return {'CANCELLED'}
 
-        pmdl_inicio = col.get("PMDL_Patch_PMDL_Inicio", 0)
-        pmdl_fin    = col.get("PMDL_Patch_PMDL_Fin", 0)
-        if not pmdl_inicio or not pmdl_fin:
-            self.report({'ERROR'}, "Offsets del PMDL no encontrados. Reimporta el parche.")
-            return {'CANCELLED'}
-
-        armature_obj = next((o for o in col.objects if o.type == 'ARMATURE'), None)
-        renombrar    = bool(col.get("PMDL_Renombrar_Huesos", True))
+        renombrar = bool(col.get("PMDL_Renombrar_Huesos", True))
 
         # Leer parche original
         with open(patch_filepath, 'rb') as f:
@@ -417,68 +400,59 @@ class ExportPatch(bpy.types.Operator, ImportHelper):
             fp += ".PCK1"
         self.filepath = fp
 
-        objetos_principales = sorted(
-            [o for o in col.objects if o.type == 'MESH' and 'PMDF_Cara' not in o],
-            key=lambda o: self._indice_parte(o.name)
-        )
-        if not objetos_principales:
-            self.report({'ERROR'}, "La coleccion no contiene meshes del PMDL principal")
+        modelos, error = modelos_parche(col, len(patch_blob))
+        if error:
+            self.report({'ERROR'}, error)
             return {'CANCELLED'}
 
-        # Extraer blob PMDL desde el parche como referencia
-        blob_pmdl_orig = bytes(patch_blob[pmdl_inicio:pmdl_fin])
-        pmdl_nuevo = _exportar_a_bytes(
-            exportar_pmdl, objetos_principales, armature_obj,
-            blob_pmdl_orig, renombrar, self.grosor_maximo,
-        )
-        if pmdl_nuevo is None:
-            self.report({'ERROR'}, "Error al exportar el PMDL principal")
-            return {'CANCELLED'}
-        if len(pmdl_nuevo) != pmdl_fin - pmdl_inicio:
-            self.report({'ERROR'}, "PMDL principal: tamano exportado diferente al original")
+        # 1. Leer las mallas de Blender (solo en el hilo principal)
+        # 2. Codificar todos los modelos a la vez, cada uno sobre su propio rango del
+        #    parche (sin copias ni archivos temporales; el tamano no puede cambiar)
+        vista_parche = memoryview(patch_blob)
+        trabajos     = []
+        for _, inicio, fin, objetos, armature in modelos:
+            mallas, datos_armature = leer_modelo(objetos, armature)
+            trabajos.append(dict(
+                blob             = vista_parche[inicio:fin],
+                mallas           = mallas,
+                armature         = datos_armature,
+                renombrar_huesos = renombrar,
+                grosor_maximo    = self.grosor_maximo,
+                forzar_completo  = self.forzar_completo,
+            ))
+        resultados = codificar_en_paralelo(trabajos)
+
+        resumenes, error = aplicar_resultados_parche(modelos, resultados, vista_parche, patch_filepath)
+        if error:
+            self.report({'ERROR'}, error)
             return {'CANCELLED'}
-        patch_blob[pmdl_inicio:pmdl_fin] = pmdl_nuevo
 
-        # EXPORTAR PMDFs DE CARAS EXTRA
-        for nombre_cara, off_ini_idx, off_fin_idx in CARAS_PMDF:
-            ini_cara = col.get(f"PMDF_{nombre_cara}_Inicio", 0)
-            fin_cara = col.get(f"PMDF_{nombre_cara}_Fin", 0)
-            if not ini_cara or not fin_cara:
-                continue
-
-            # Buscar en la sub-coleccion de la cara (no en col.objects directo)
-            subcol_cara = bpy.data.collections.get(nombre_cara)
-            if subcol_cara is None:
-                continue
-            objetos_cara = sorted(
-                [o for o in subcol_cara.objects
-                 if o.type == 'MESH' and o.get("PMDF_Cara") == nombre_cara],
-                key=lambda o: self._indice_parte(o.name)
-            )
-            if not objetos_cara:
-                continue
-
-            blob_cara_orig = bytes(patch_blob[ini_cara:fin_cara])
-            # Caras no exportan huesos
-            pmdf_nuevo = _exportar_a_bytes(
-                exportar_pmdl, objetos_cara, None,
-                blob_cara_orig, renombrar, self.grosor_maximo,
-            )
-            if pmdf_nuevo is None:
-                print(f"[patch_export] WARN: error exportando {nombre_cara}, se omite")
-                continue
-            if len(pmdf_nuevo) != fin_cara - ini_cara:
-                print(f"[patch_export] WARN: {nombre_cara} tamano diferente, se omite")
-                continue
-            patch_blob[ini_cara:fin_cara] = pmdf_nuevo
-            print(f"[patch_export] {nombre_cara}: OK")
+        # 3. Textura(s) editadas en Blender
+        texturas_escritas = 0
+        if self.exportar_textura:
+            estados, error = texturas_a_parche(patch_blob, patch_filepath)
+            if error:
+                self.report({'ERROR'}, error)
+                return {'CANCELLED'}
+            texturas_escritas = sum(1 for estado in estados if estado != 'sin cambios')
 
         with open(self.filepath, 'wb') as f:
             f.write(patch_blob)
 
+        # Si se sobrescribio el parche original, las huellas pasan a describir el nuevo contenido
+        if os.path.samefile(self.filepath, patch_filepath):
+            for resumen in resumenes:
+                guardar_huellas(resumen['huellas'])
+
+        reutilizadas  = sum(r['reutilizadas'] for r in resumenes)
+        recodificadas = sum(r['recodificadas'] for r in resumenes)
         set_ruta(_CLAVE_EXPORT_PATCH, self.filepath)
+        print(f"[patch_export] Partes: {reutilizadas} reutilizadas, {recodificadas} recodificadas")
         print(f"[patch_export] Parche guardado en: {self.filepath}")
-        self.report({'INFO'}, "Parche exportado correctamente")
+        mensaje = f"Parche exportado correctamente ({reutilizadas} partes sin cambios, {recodificadas} recodificadas"
+        if self.exportar_textura:
+            mensaje += f", {texturas_escritas} texturas escritas"
+        self.report({'INFO'}, mensaje + ")")
         return {'FINISHED'}
 
     def _coleccion_pmdl(self, context):
@@ -500,10 +474,122 @@ class ExportPatch(bpy.types.Operator, ImportHelper):
         m = re.search(r'\.(\d{3})$', name)
         return int(m.group(1)) if m else 0
 
-    def _indice_parte(self, name):
-        import re
-        m = re.search(r'Part[ea]_(\d+)', name)
-        return int(m.group(1)) if m else 9999
+
+def modelos_parche(col, tamano_parche):
+    """
+    Modelos de la coleccion de un parche en el orden en que se exportan:
+    [(nombre, inicio, fin, objetos, armature)]. El primero es el PMDL principal;
+    las caras PMDF no exportan huesos. Retorna (modelos, error).
+    """
+    from ..exporter import indice_parte
+    from .patch_parser import CARAS_PMDF
+
+    pmdl_inicio = col.get("PMDL_Patch_PMDL_Inicio", 0)
+    pmdl_fin    = col.get("PMDL_Patch_PMDL_Fin", 0)
+    if not pmdl_inicio or not pmdl_fin:
+        return None, "Offsets del PMDL no encontrados. Reimporta el parche."
+    if pmdl_fin > tamano_parche:
+        return None, "PMDL principal: rango fuera del parche. Reimporta."
+
+    armature_obj        = next((o for o in col.objects if o.type == 'ARMATURE'), None)
+    objetos_principales = sorted(
+        [o for o in col.objects if o.type == 'MESH' and 'PMDF_Cara' not in o],
+        key=lambda o: indice_parte(o.name)
+    )
+    if not objetos_principales:
+        return None, "La coleccion no contiene meshes del PMDL principal"
+
+    modelos = [("PMDL", pmdl_inicio, pmdl_fin, objetos_principales, armature_obj)]
+    for nombre_cara, _, _ in CARAS_PMDF:
+        ini_cara = col.get(f"PMDF_{nombre_cara}_Inicio", 0)
+        fin_cara = col.get(f"PMDF_{nombre_cara}_Fin", 0)
+        if not ini_cara or not fin_cara:
+            continue
+        if fin_cara > tamano_parche:
+            print(f"[patch_export] WARN: {nombre_cara} fuera del parche, se omite")
+            continue
+
+        # Buscar en la sub-coleccion de la cara (no en col.objects directo)
+        subcol_cara = bpy.data.collections.get(nombre_cara)
+        if subcol_cara is None:
+            continue
+        objetos_cara = sorted(
+            [o for o in subcol_cara.objects
+             if o.type == 'MESH' and o.get("PMDF_Cara") == nombre_cara],
+            key=lambda o: indice_parte(o.name)
+        )
+        if not objetos_cara:
+            continue
+        modelos.append((nombre_cara, ini_cara, fin_cara, objetos_cara, None))
+
+    return modelos, None
+
+
+def aplicar_resultados_parche(modelos, resultados, vista_parche, patch_filepath):
+    """
+    Revisa lo que devolvio codificar_en_paralelo para cada modelo del parche.
+    Una cara que fallo pudo quedar a medio escribir: su rango se recupera del
+    parche original y se omite. Retorna (resumenes, error); es un error que
+    falle el PMDL principal.
+    """
+    if isinstance(resultados[0], Exception):
+        print(f"[patch_export] ERROR: {resultados[0]}")
+        return None, "Error al exportar el PMDL principal"
+
+    resumenes = [resultados[0]]
+    for (nombre_cara, ini_cara, fin_cara, _, _), resumen in zip(modelos[1:], resultados[1:]):
+        if isinstance(resumen, Exception):
+            with open(patch_filepath, 'rb') as f:
+                f.seek(ini_cara)
+                vista_parche[ini_cara:fin_cara] = f.read(fin_cara - ini_cara)
+            print(f"[patch_export] WARN: error exportando {nombre_cara} ({resumen}), se omite")
+            continue
+        resumenes.append(resumen)
+        print(f"[patch_export] {nombre_cara}: OK")
+    return resumenes, None
+
+
+def nombre_textura(nombre_parche, i):
+    """Nombre (sin el sufijo _tex) de la imagen de la textura i de un parche."""
+    return nombre_parche if i == 0 else f"{nombre_parche}_{i + 1}"
+
+
+def texturas_a_parche(patch_blob, patch_filepath):
+    """
+    Escribe sobre el parche las imagenes <nombre>_tex, <nombre>_2_tex, ... de Blender.
+    Las texturas sin imagen se dejan como estan. Retorna (estados, error) con el
+    estado de tex_encoder.textura_a_parche de cada textura escrita.
+    """
+    from .patch_parser import leer_texturas
+    from .tex_decoder  import huella_pixeles, huellas_textura
+    from .tex_encoder  import rgba_desde_imagen_blender, textura_a_parche
+
+    texturas, error = leer_texturas(patch_blob)
+    if error:
+        return None, error
+
+    nombre_parche = os.path.splitext(os.path.basename(patch_filepath))[0]
+    estados       = []
+    for i, textura in enumerate(texturas):
+        nombre_img = nombre_textura(nombre_parche, i) + "_tex"
+        bl_img     = bpy.data.images.get(nombre_img)
+        if bl_img is None:
+            print(f"[patch_export] WARN: no hay imagen '{nombre_img}', la textura {i + 1} no cambia")
+            continue
+        if tuple(bl_img.size) != (textura['formato'].ancho, textura['formato'].alto):
+            return None, (f"La imagen '{nombre_img}' es de {bl_img.size[0]}x{bl_img.size[1]}, "
+                          f"la textura del parche es {textura['formato']}")
+
+        t0     = time.perf_counter()
+        rgba   = rgba_desde_imagen_blender(bl_img)
+        estado = textura_a_parche(patch_blob, textura, rgba)
+        estados.append(estado)
+        # Sin perdida la imagen ya es la textura escrita: al reimportar se reutiliza tal cual
+        if estado != 'cuantizada':
+            bl_img["PMDL_Tex_Huella"]  = huellas_textura(patch_blob, textura)[1]
+            bl_img["PMDL_Tex_Pixeles"] = huella_pixeles(rgba)
+        print(f"[patch_export] Textura '{nombre_img}': {estado} ({1e3 * (time.perf_counter() - t0):.0f} ms)")
+    return estados, None
 
 
 def menu_func_export_patch(self, context):
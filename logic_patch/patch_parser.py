@@ -1,6 +1,8 @@
 import struct
 import os
 
+from .tex_codec import TEX_HEADER, detectar_texturas
+
 
 def leer_offset_be(blob, pos):
     if pos + 4 > len(blob):
@@ -9,32 +11,76 @@ def leer_offset_be(blob, pos):
 
 
 def validar_y_corregir_indice(blob):
-    data = bytearray(blob)
+    """
+    Pone a cero el indice en 0x7CC-0x7CF. Un bytearray se corrige en el sitio; un
+    bytes inmutable se copia solo si hace falta corregirlo.
+    """
+    if len(blob) < 0x7D0:
+        return blob
+
+    if blob[0x7CC:0x7D0] != b'\x00\x00\x00\x00':
+        if isinstance(blob, bytes):
+            blob = bytearray(blob)
+        blob[0x7CC:0x7D0] = b'\x00\x00\x00\x00'
+        print("[patch] Indice corregido en 0x7CC-0x7CF")
 
-    if len(data) < 0x7D0:
-        return data
+    return blob
 
-    if data[0x7CC:0x7D0] != b'\x00\x00\x00\x00':
-        data[0x7CC] = 0x00
-        data[0x7CD] = 0x00
-        data[0x7CE] = 0x00
-        data[0x7CF] = 0x00
-        print("[patch] Indice corregido en 0x7CC-0x7CF")
 
-    return data
+def _leer_archivo(filepath):
+    # Un solo buffer por parche: bytearray leido en el sitio
+    with open(filepath, 'rb') as f:
+        blob = bytearray(os.fstat(f.fileno()).st_size)
+        f.readinto(blob)
+        return blob
+
+
+def leer_texturas(blob):
+    """
+    Texturas del parche (rango 0x30 -> 0x34 del indice). Retorna (texturas, error);
+    cada textura es {'formato', 'inicio', 'indices_offset', 'paleta_offset'}.
+    """
+    tex_inicio = leer_offset_be(blob, 0x30)
+    tex_fin    = leer_offset_be(blob, 0x34)
+
+    if tex_inicio == 0 or tex_fin == 0 or tex_fin <= tex_inicio:
+        return None, "No se encontro una textura valida en el parche (offsets invalidos)"
+
+    if tex_fin > len(blob):
+        return None, f"Textura fuera de rango del archivo"
+
+    # Layout de la(s) textura(s): formato deducido del tamano del rango
+    texturas = []
+    for formato, relativo in detectar_texturas(tex_fin - tex_inicio):
+        indices_offset = tex_inicio + relativo + TEX_HEADER
+        paleta_offset  = indices_offset + formato.tamano_indices
+        if paleta_offset + formato.tamano_paleta > len(blob):
+            if not texturas:
+                return None, "Textura incompleta: no hay suficientes bytes para indices + paleta"
+            break
+        texturas.append({
+            'formato'        : formato,
+            'inicio'         : tex_inicio + relativo,
+            'indices_offset' : indices_offset,
+            'paleta_offset'  : paleta_offset,
+        })
+    return texturas, None
 
 
 def leer_parche(filepath):
+    """
+    Lee un parche PCK1. Todo el archivo queda en un unico buffer ('blob') y el
+    PMDL embebido ('pmdl_datos') es una ventana memoryview sobre el, sin copias.
+    """
     try:
-        with open(filepath, 'rb') as f:
-            raw = f.read()
+        blob = _leer_archivo(filepath)
     except Exception as e:
         return None, f"No se pudo leer el archivo: {e}"
 
-    if len(raw) < 0x40:
+    if len(blob) < 0x40:
         return None, "Archivo demasiado pequeno para ser un parche valido"
 
-    blob = validar_y_corregir_indice(raw)
+    blob = validar_y_corregir_indice(blob)
 
     # Leer offsets del PMDL
     pmdl_inicio = leer_offset_be(blob, 0x0C)
@@ -47,33 +93,18 @@ def leer_parche(filepath):
         return None, f"PMDL fuera de rango del archivo (fin=0x{pmdl_fin:X}, archivo=0x{len(blob):X})"
 
     # Verificar firma del PMDL
-    firma = blob[pmdl_inicio:pmdl_inicio+4]
+    firma = bytes(blob[pmdl_inicio:pmdl_inicio+4])
     if firma not in (b'pMdl', b'pMdF'):
         return None, f"Firma del PMDL invalida en 0x{pmdl_inicio:X}: {firma.hex()}"
 
-    pmdl_datos = bytes(blob[pmdl_inicio:pmdl_fin])
+    pmdl_datos = memoryview(blob)[pmdl_inicio:pmdl_fin]
 
-    # Leer offsets de la textura
-    tex_inicio = leer_offset_be(blob, 0x30)
+    texturas, error = leer_texturas(blob)
+    if error:
+        return None, error
+    tex_inicio = texturas[0]['inicio']
     tex_fin    = leer_offset_be(blob, 0x34)
 
-    if tex_inicio == 0 or tex_fin == 0 or tex_fin <= tex_inicio:
-        return None, "No se encontro una textura valida en el parche (offsets invalidos)"
-
-    if tex_fin > len(blob):
-        return None, f"Textura fuera de rango del archivo"
-
-    # Layout interno de la textura
-    TEX_HEADER        = 0x80
-    TEX_INDICES_SIZE  = 0x10000   # 256 * 256
-    TEX_PALETA_SIZE   = 0x400     # 256 colores * 4 bytes RGBA
-
-    indices_offset = tex_inicio + TEX_HEADER
-    paleta_offset  = indices_offset + TEX_INDICES_SIZE
-
-    if paleta_offset + TEX_PALETA_SIZE > len(blob):
-        return None, "Textura incompleta: no hay suficientes bytes para indices + paleta"
-
     nombre = os.path.splitext(os.path.basename(filepath))[0]
 
     info = {
@@ -86,13 +117,16 @@ def leer_parche(filepath):
         'pmdl_tamano'    : pmdl_fin - pmdl_inicio,
         'tex_inicio'     : tex_inicio,
         'tex_fin'        : tex_fin,
-        'indices_offset' : indices_offset,
-        'paleta_offset'  : paleta_offset,
+        'indices_offset' : texturas[0]['indices_offset'],
+        'paleta_offset'  : texturas[0]['paleta_offset'],
+        'texturas'       : texturas,
     }
 
     print(f"[patch] PMDL: 0x{pmdl_inicio:X} -> 0x{pmdl_fin:X}  ({info['pmdl_tamano']} bytes)")
     print(f"[patch] Textura: 0x{tex_inicio:X} -> 0x{tex_fin:X}")
-    print(f"[patch] Indices: 0x{indices_offset:X}  Paleta: 0x{paleta_offset:X}")
+    for textura in texturas:
+        print(f"[patch] Textura {textura['formato']}: Indices: 0x{textura['indices_offset']:X}  "
+              f"Paleta: 0x{textura['paleta_offset']:X}")
 
     return info, None
 
@@ -111,7 +145,9 @@ CARAS_PMDF = [
 
 
 def leer_caras_pmdf(blob):
+    # 'datos' de cada cara es una ventana memoryview sobre el blob del parche
     caras = []
+    vista = memoryview(blob)
 
     for nombre, off_inicio, off_fin in CARAS_PMDF:
         inicio = leer_offset_be(blob, off_inicio)
@@ -122,11 +158,11 @@ def leer_caras_pmdf(blob):
             continue
 
         # Verificar firma
-        firma = blob[inicio:inicio + 4]
+        firma = bytes(blob[inicio:inicio + 4])
         if firma not in (b'pMdl', b'pMdF'):
             continue
 
-        datos = bytes(blob[inicio:fin])
+        datos = vista[inicio:fin]
         caras.append({
             'nombre' : nombre,
             'datos'  : datos,
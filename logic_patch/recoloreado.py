@@ -0,0 +1,81 @@
+import os
+import time
+
+from .patch_parser import leer_texturas
+
+
+# Aplica una misma paleta a la textura de muchos parches (variantes de color de un
+# traje): solo se reescriben los bytes de la paleta de cada archivo, los indices y
+# el resto del parche quedan igual. La paleta sale de un archivo de paleta crudo
+# (RGBA, 16 o 256 colores) o de otro parche ya recoloreado.
+
+
+def leer_archivo_paleta(filepath, indice_textura=0):
+    """
+    Bytes de una paleta RGBA desde un archivo de paleta crudo (0x40 o 0x400 bytes)
+    o desde la textura 'indice_textura' de un parche. Retorna (paleta_bytes, error).
+    """
+    if not os.path.exists(filepath):
+        return None, f"Archivo de paleta no encontrado: {filepath}"
+    with open(filepath, 'rb') as f:
+        datos = f.read()
+
+    if len(datos) in (16 * 4, 256 * 4):
+        return datos, None
+
+    texturas, error = leer_texturas(datos)
+    if error:
+        return None, f"{os.path.basename(filepath)} no es una paleta ni un parche con textura ({error})"
+    if indice_textura >= len(texturas):
+        return None, f"{os.path.basename(filepath)} solo tiene {len(texturas)} textura(s)"
+    textura = texturas[indice_textura]
+    inicio  = textura['paleta_offset']
+    return datos[inicio : inicio + textura['formato'].tamano_paleta], None
+
+
+def aplicar_paleta(blob, paleta_bytes, indice_textura=0):
+    """Reescribe en el parche (bytearray) la paleta de una de sus texturas. Retorna un error o None."""
+    texturas, error = leer_texturas(blob)
+    if error:
+        return error
+    if indice_textura >= len(texturas):
+        return f"el parche solo tiene {len(texturas)} textura(s)"
+
+    textura = texturas[indice_textura]
+    formato = textura['formato']
+    if len(paleta_bytes) != formato.tamano_paleta:
+        return f"la paleta tiene {len(paleta_bytes) // 4} colores y la textura ({formato}) usa {formato.colores}"
+
+    inicio = textura['paleta_offset']
+    blob[inicio : inicio + formato.tamano_paleta] = paleta_bytes
+    return None
+
+
+def aplicar_paleta_a_parches(rutas, paleta_bytes, indice_textura=0, directorio_salida=""):
+    """
+    Aplica la paleta a cada parche, sobrescribiendolo o escribiendo una copia en
+    directorio_salida. Retorna [(ruta, error o None)].
+    """
+    inicio_total = time.perf_counter()
+    resultados   = []
+    for ruta in rutas:
+        try:
+            with open(ruta, 'rb') as f:
+                blob = bytearray(f.read())
+            error = aplicar_paleta(blob, paleta_bytes, indice_textura)
+            if not error:
+                destino = os.path.join(directorio_salida, os.path.basename(ruta)) if directorio_salida else ruta
+                with open(destino, 'wb') as f:
+                    f.write(blob)
+        except OSError as e:
+            error = str(e)
+
+        resultados.append((ruta, error))
+        if error:
+            print(f"[paleta] WARN: {os.path.basename(ruta)}: {error}, se omite")
+        else:
+            print(f"[paleta] {os.path.basename(ruta)}: OK")
+
+    correctos = sum(1 for _, error in resultados if not error)
+    print(f"[paleta] Paleta aplicada a {correctos}/{len(rutas)} parches en {time.perf_counter() - inicio_total:.2f}s")
+    return resultados
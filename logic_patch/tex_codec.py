@@ -0,0 +1,199 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+# Texturas indexadas de PSP (CLUT de 4 u 8 bits) en el layout entrelazado del GE:
+# la imagen se guarda en bloques de 16 bytes x 8 filas (16x8 pixeles a 8 bpp,
+# 32x8 a 4 bpp), de izquierda a derecha y de arriba a abajo, y el juego la guarda
+# invertida verticalmente. A 4 bpp cada byte lleva dos pixeles, primero el nibble bajo.
+#
+# Para cada (ancho, alto, bpp) se calcula una sola vez la permutacion entre el
+# orden del archivo y el de la imagen (volteo incluido); decodificar y codificar
+# son entonces un unico gather de NumPy.
+#
+# Layout de una textura dentro del parche: cabecera de 0x80 bytes, indices y
+# paleta RGBA de 2**bpp colores.
+
+TEX_HEADER   = 0x80
+BYTES_BLOQUE = 16
+FILAS_BLOQUE = 8
+
+
+class FormatoTextura:
+    """Dimensiones y profundidad (4 u 8 bits por pixel) de una textura indexada."""
+    __slots__ = ('ancho', 'alto', 'bpp')
+
+    def __init__(self, ancho, alto, bpp):
+        if bpp not in (4, 8):
+            raise ValueError(f"Profundidad no soportada: {bpp} bpp")
+        ancho_bloque = min(BYTES_BLOQUE * 8 // bpp, ancho)
+        if ancho <= 0 or alto <= 0 or ancho % ancho_bloque or alto % FILAS_BLOQUE:
+            raise ValueError(f"Dimensiones no validas para texturas entrelazadas: {ancho}x{alto}")
+        self.ancho = ancho
+        self.alto  = alto
+        self.bpp   = bpp
+
+    @property
+    def colores(self):
+        return 1 << self.bpp
+
+    @property
+    def tamano_indices(self):
+        return self.ancho * self.alto * self.bpp // 8
+
+    @property
+    def tamano_paleta(self):
+        return self.colores * 4
+
+    @property
+    def tamano_total(self):
+        return TEX_HEADER + self.tamano_indices + self.tamano_paleta
+
+    def __eq__(self, otro):
+        return isinstance(otro, FormatoTextura) and \
+            (self.ancho, self.alto, self.bpp) == (otro.ancho, otro.alto, otro.bpp)
+
+    def __hash__(self):
+        return hash((self.ancho, self.alto, self.bpp))
+
+    def __repr__(self):
+        return f"{self.ancho}x{self.alto} {self.bpp}bpp"
+
+
+# Formato de todas las texturas de parche conocidas hasta ahora
+FORMATO_PARCHE = FormatoTextura(256, 256, 8)
+
+# Candidatos para detectar el formato por tamano, en orden de preferencia
+# (a igual tamano gana el mas ancho)
+FORMATOS_CONOCIDOS = [FORMATO_PARCHE] + [
+    formato
+    for formato in (
+        FormatoTextura(ancho, alto, bpp)
+        for bpp in (8, 4)
+        for ancho, alto in (
+            (512, 512), (512, 256), (256, 512), (256, 256), (256, 128), (128, 256),
+            (128, 128), (128, 64), (64, 128), (64, 64), (64, 32), (32, 64), (32, 32),
+        )
+    )
+    if formato != FORMATO_PARCHE
+]
+
+MAX_TEXTURAS = 8
+
+
+@lru_cache(maxsize=None)
+def tabla_swizzle(ancho, alto, bpp):
+    """
+    Permutacion entre el orden del archivo y el de la imagen (ya volteada).
+    Retorna (pixel_en_archivo, pixel_en_imagen), dos arrays int32 de solo lectura:
+      - pixel_en_archivo[k] : posicion en el archivo del pixel k de la imagen (row-major)
+      - pixel_en_imagen[j]  : pixel de la imagen que va en la posicion j del archivo
+    """
+    ancho_bloque = min(BYTES_BLOQUE * 8 // bpp, ancho)
+    y, x         = np.indices((alto, ancho), dtype=np.int32)
+
+    bloque_y, fila    = np.divmod(y, FILAS_BLOQUE)
+    bloque_x, columna = np.divmod(x, ancho_bloque)
+    bloque            = bloque_y * (ancho // ancho_bloque) + bloque_x
+    en_archivo        = (bloque * FILAS_BLOQUE + fila) * ancho_bloque + columna
+
+    pixel_en_archivo = np.ascontiguousarray(en_archivo[::-1]).ravel()
+    pixel_en_imagen  = np.empty_like(pixel_en_archivo)
+    pixel_en_imagen[pixel_en_archivo] = np.arange(len(pixel_en_archivo), dtype=np.int32)
+
+    pixel_en_archivo.setflags(write=False)
+    pixel_en_imagen.setflags(write=False)
+    return pixel_en_archivo, pixel_en_imagen
+
+
+def desempaquetar_indices(datos, bpp):
+    """Bytes de indices -> un indice uint8 por pixel, en el orden del archivo."""
+    datos = np.frombuffer(datos, dtype=np.uint8)
+    if bpp == 8:
+        return datos
+    indices       = np.empty(len(datos) * 2, dtype=np.uint8)
+    indices[0::2] = datos & 0x0F
+    indices[1::2] = datos >> 4
+    return indices
+
+
+def empaquetar_indices(indices, bpp):
+    """Un indice por pixel en el orden del archivo -> bytes de indices."""
+    indices = np.asarray(indices, dtype=np.uint8)
+    if bpp == 8:
+        return indices.tobytes()
+    return (indices[0::2] & 0x0F | (indices[1::2] & 0x0F) << 4).astype(np.uint8).tobytes()
+
+
+def indices_a_imagen(indices, formato):
+    """Indices en el orden del archivo -> uint8[alto, ancho] en el orden de la imagen."""
+    pixel_en_archivo, _ = tabla_swizzle(formato.ancho, formato.alto, formato.bpp)
+    return indices[pixel_en_archivo].reshape(formato.alto, formato.ancho)
+
+
+def imagen_a_indices(imagen, formato):
+    """uint8[alto, ancho] en el orden de la imagen -> bytes de indices del archivo."""
+    _, pixel_en_imagen = tabla_swizzle(formato.ancho, formato.alto, formato.bpp)
+    return empaquetar_indices(np.asarray(imagen).reshape(-1)[pixel_en_imagen], formato.bpp)
+
+
+def leer_paleta(blob, paleta_offset, formato):
+    """Paleta uint8[colores, 4] RGBA; las entradas fuera del blob se leen como negro opaco."""
+    paleta       = np.zeros((formato.colores, 4), dtype=np.uint8)
+    paleta[:, 3] = 255
+    completos    = min(formato.colores, max(0, len(blob) - paleta_offset) // 4)
+    if completos:
+        paleta[:completos] = np.frombuffer(blob, dtype=np.uint8, count=completos * 4,
+                                           offset=paleta_offset).reshape(-1, 4)
+    return paleta
+
+
+def decodificar_rgba(blob, indices_offset, paleta_offset, formato=FORMATO_PARCHE):
+    """
+    Decodifica una textura indexada a un array uint8[alto, ancho, 4] RGBA, ya volteado.
+    Los pixeles cuyos indices quedan fuera del blob quedan transparentes.
+    """
+    paleta = leer_paleta(blob, paleta_offset, formato)
+
+    total  = formato.ancho * formato.alto
+    leidos = min(formato.tamano_indices, max(0, len(blob) - indices_offset))
+    lineal = np.zeros((total, 4), dtype=np.uint8)
+    if leidos:
+        indices = desempaquetar_indices(
+            np.frombuffer(blob, dtype=np.uint8, count=leidos, offset=indices_offset), formato.bpp
+        )
+        lineal[:len(indices)] = paleta[indices]
+
+    pixel_en_archivo, _ = tabla_swizzle(formato.ancho, formato.alto, formato.bpp)
+    return lineal[pixel_en_archivo].reshape(formato.alto, formato.ancho, 4)
+
+
+def codificar_textura(indices_imagen, paleta, formato=FORMATO_PARCHE):
+    """
+    Codifica una imagen indexada (uint8[alto, ancho], orden de la imagen) y su
+    paleta RGBA. Retorna (bytes de indices, bytes de paleta) listos para el parche.
+    """
+    paleta_bytes = np.zeros((formato.colores, 4), dtype=np.uint8)
+    paleta       = np.asarray(paleta, dtype=np.uint8).reshape(-1, 4)[:formato.colores]
+    paleta_bytes[:len(paleta)] = paleta
+    return imagen_a_indices(indices_imagen, formato), paleta_bytes.tobytes()
+
+
+def detectar_texturas(tamano):
+    """
+    Formato de las texturas de un rango del parche a partir de su tamano.
+    Retorna [(formato, offset relativo)]: una textura si el tamano coincide con
+    algun formato conocido, varias seguidas si es un multiplo exacto de uno y, si
+    no, el formato de siempre (256x256 a 8 bpp).
+    """
+    for formato in FORMATOS_CONOCIDOS:
+        if tamano == formato.tamano_total:
+            return [(formato, 0)]
+
+    for formato in FORMATOS_CONOCIDOS:
+        cantidad, resto = divmod(tamano, formato.tamano_total)
+        if not resto and 2 <= cantidad <= MAX_TEXTURAS:
+            return [(formato, i * formato.tamano_total) for i in range(cantidad)]
+
+    return [(FORMATO_PARCHE, 0)]
@@ -1,104 +1,161 @@
-def decodificar_textura(blob, indices_offset, paleta_offset):
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from .tex_codec   import desempaquetar_indices, indices_a_imagen, leer_paleta
+from .tex_encoder import rgba_desde_imagen_blender
+
+
+# Las texturas decodificadas se identifican por su contenido (huella de los bytes de
+# indices y paleta), no por el archivo: variantes de un mismo traje suelen compartir
+# el bloque de indices y reimportar un parche no cambia nada. Se reutilizan, en orden:
+#   1. la imagen de Blender que ya tiene esa huella (PMDL_Tex_Huella), si sus pixeles
+#      siguen siendo los registrados (PMDL_Tex_Pixeles): pintar y guardar o empaquetar
+#      la imagen no cambia su huella de textura pero si la de sus pixeles,
+#   2. el RGBA en memoria o, con usar_cache, en la cache en disco (cache_parse),
+#   3. la imagen de indices ya desentrelazada, si solo cambio la paleta.
+
+MAX_TEXTURAS_MEMORIA = 16
+
+_memoria_rgba    = OrderedDict()   # huella -> uint8[alto, ancho, 4], solo lectura
+_memoria_indices = OrderedDict()   # huella de los indices -> uint8[alto, ancho], solo lectura
+
+
+def huellas_textura(blob, textura):
+    """(huella de los indices, huella de la textura) de una textura del parche (dict de leer_texturas)."""
+    formato = textura['formato']
+    inicio  = textura['indices_offset']
+    datos   = memoryview(blob)
+
+    h = hashlib.blake2b(repr(formato).encode('ascii'), digest_size=16)
+    h.update(datos[inicio : inicio + formato.tamano_indices])
+    huella_indices = h.hexdigest()
+
+    h.update(datos[textura['paleta_offset'] : textura['paleta_offset'] + formato.tamano_paleta])
+    return huella_indices, h.hexdigest()
+
+
+def huella_pixeles(rgba):
+    """Huella de los pixeles uint8[alto, ancho, 4] de una imagen (PMDL_Tex_Pixeles)."""
+    return hashlib.blake2b(np.ascontiguousarray(rgba, dtype=np.uint8), digest_size=16).hexdigest()
+
+
+def _recordar(memoria, huella, array):
+    array.setflags(write=False)
+    memoria[huella] = array
+    memoria.move_to_end(huella)
+    while len(memoria) > MAX_TEXTURAS_MEMORIA:
+        memoria.popitem(last=False)
+    return array
+
+
+def _recuperar(memoria, huella):
+    array = memoria.get(huella)
+    if array is not None:
+        memoria.move_to_end(huella)
+    return array
+
+
+def rgba_textura(blob, textura, usar_cache=False):
+    """
+    RGBA de una textura del parche (dict de leer_texturas), decodificado solo si su
+    contenido no se vio antes. Retorna (rgba de solo lectura, huella).
+    """
+    huella_indices, huella = huellas_textura(blob, textura)
+    return _rgba_por_huella(blob, textura, huella_indices, huella, usar_cache), huella
+
+
+def _rgba_por_huella(blob, textura, huella_indices, huella, usar_cache):
+    from ..cache_parse import cache_activa, clave_textura, cargar_entrada, guardar_entrada
+
+    formato = textura['formato']
+    rgba    = _recuperar(_memoria_rgba, huella)
+    if rgba is not None:
+        print(f"[tex] Textura {formato} en memoria ({huella[:8]})")
+        return rgba
+
+    usar_disco = usar_cache and cache_activa()
+    if usar_disco:
+        entrada = cargar_entrada(clave_textura(huella))
+        if entrada is not None and 'rgba' in entrada \
+                and entrada['rgba'].shape == (formato.alto, formato.ancho, 4):
+            return _recordar(_memoria_rgba, huella, entrada['rgba'])
+
+    # Mismo bloque de indices con otra paleta: solo falta aplicar la paleta
+    indices = _recuperar(_memoria_indices, huella_indices)
+    if indices is None:
+        datos   = np.frombuffer(blob, dtype=np.uint8, count=formato.tamano_indices,
+                                offset=textura['indices_offset'])
+        indices = _recordar(_memoria_indices, huella_indices,
+                            indices_a_imagen(desempaquetar_indices(datos, formato.bpp), formato))
+        print(f"[tex] Imagen decodificada: {formato} RGBA ({formato.ancho * formato.alto} pixeles procesados)")
+    else:
+        print(f"[tex] Indices {formato} en memoria ({huella_indices[:8]}), solo se aplica la paleta")
+
+    rgba = leer_paleta(blob, textura['paleta_offset'], formato)[indices]
+    if usar_disco:
+        guardar_entrada(clave_textura(huella), {'rgba': rgba})
+    return _recordar(_memoria_rgba, huella, rgba)
+
+
+def textura_a_blender(blob, textura, nombre, usar_cache=False):
+    """
+    Imagen de Blender '<nombre>_tex' para una textura del parche. Si ya existe una con
+    la misma huella y sus pixeles no se editaron se reutiliza sin decodificar nada.
+    """
+    formato                = textura['formato']
+    huella_indices, huella = huellas_textura(blob, textura)
+    nombre_img             = nombre + "_tex"
     try:
-        from PIL import Image
-    except ImportError:
-        print("[tex] ERROR: Pillow no esta instalado. Ejecuta: pip install Pillow")
-        return None
+        import bpy
 
-    # Leer paleta RGBA (256 colores)
-    paleta = []
-    for i in range(256):
-        off = paleta_offset + (i * 4)
-        if off + 3 < len(blob):
-            r = blob[off]
-            g = blob[off + 1]
-            b = blob[off + 2]
-            a = blob[off + 3]
-            paleta.append((r, g, b, a))
-        else:
-            paleta.append((0, 0, 0, 255))
-
-    # Crear imagen RGBA 256x256
-    img    = Image.new('RGBA', (256, 256))
-    pixels = img.load()
-
-    # Algoritmo de desentrelazado por bloques 16x8
-    # Replica exacta del ShowTex() del C# original
-    num  = 0   # offset X del bloque actual
-    num2 = 0   # offset Y del bloque actual
-    num3 = 0   # indice lineal en el buffer de indices (0..65535)
-    num4 = 32  # contador de filas de bloques (256/8 = 32)
-
-    while num4 != 0:
-        num5 = 16  # contador de columnas de bloques (256/16 = 16)
-
-        while num5 != 0:
-            num6 = 0  # fila dentro del bloque (0..7)
-
-            while num6 < 8:
-                num7 = 0  # columna dentro del bloque (0..15)
-
-                while num7 < 16:
-                    if num3 < 65536:
-                        idx = indices_offset + num3
-                        if idx < len(blob):
-                            color_idx = blob[idx]
-                            color     = paleta[color_idx] if color_idx < len(paleta) else (0, 0, 0, 255)
-                            x = int(num7 + num)
-                            y = int(num6 + num2)
-                            if x < 256 and y < 256:
-                                pixels[x, y] = color
-                        num3 += 1
-                    num7 += 1
-
-                num6 += 1
-
-            # Avanzar al siguiente bloque horizontal
-            if num + 2 < 256:
-                num += 16
-
-            num5 -= 1
-
-        # Avanzar al siguiente bloque vertical
-        if num2 + 2 < 256:
-            num2 += 8
-
-        num = 0   # reiniciar X al inicio de cada fila de bloques
-        num4 -= 1
-
-    print(f"[tex] Imagen decodificada: 256x256 RGBA ({num3} pixeles procesados)")
-
-    # La textura del juego esta invertida verticalmente, corregir antes de retornar
-    img = img.transpose(Image.FLIP_TOP_BOTTOM)
-
-    return img
-
-
-def textura_a_blender(blob, indices_offset, paleta_offset, nombre):
-    img_pil = decodificar_textura(blob, indices_offset, paleta_offset)
-    if img_pil is None:
-        return None
+        bl_img = bpy.data.images.get(nombre_img)
+        if bl_img is not None and bl_img.get("PMDL_Tex_Huella") == huella and not bl_img.is_dirty \
+                and tuple(bl_img.size) == (formato.ancho, formato.alto):
+            # La huella de textura no cambia al editar la imagen: se comparan los pixeles
+            if bl_img.get("PMDL_Tex_Pixeles") == huella_pixeles(rgba_desde_imagen_blender(bl_img)):
+                print(f"[tex] Imagen '{nombre_img}' sin cambios, se reutiliza")
+                return bl_img
+            print(f"[tex] Imagen '{nombre_img}' editada, se vuelve a registrar")
 
+    except Exception as e:
+        print(f"[tex] Error al buscar imagen en Blender: {e}")
+
+    rgba = _rgba_por_huella(blob, textura, huella_indices, huella, usar_cache)
+    return imagen_blender_desde_rgba(rgba, nombre, huella)
+
+
+def imagen_blender_desde_rgba(rgba, nombre, huella=None):
+    """
+    Registra en Blender una textura ya decodificada (array uint8 alto x ancho x 4).
+    Con huella, la imagen la guarda en PMDL_Tex_Huella (y la de sus pixeles en
+    PMDL_Tex_Pixeles) para poder reutilizarse.
+    """
     try:
         import bpy
-        import numpy as np
 
-        # Convertir PIL RGBA a array numpy normalizado (0.0-1.0)
-        arr = np.array(img_pil, dtype=float) / 255.0
+        # Normalizar a 0.0-1.0 directamente en float32, el formato de Image.pixels
+        pixeles     = rgba.astype(np.float32).reshape(-1)
+        pixeles    /= 255.0
+        alto, ancho = rgba.shape[:2]
 
         # Crear imagen en Blender
         nombre_img = nombre + "_tex"
         if nombre_img in bpy.data.images:
             bpy.data.images.remove(bpy.data.images[nombre_img])
 
-        bl_img        = bpy.data.images.new(nombre_img, width=256, height=256, alpha=True)
-        bl_img.pixels  = arr.flatten().tolist()
+        bl_img = bpy.data.images.new(nombre_img, width=ancho, height=alto, alpha=True)
+        bl_img.pixels.foreach_set(pixeles)
         bl_img.pack()   # embeber en el .blend para que no se pierda
         bl_img.update()
+        if huella is not None:
+            bl_img["PMDL_Tex_Huella"]  = huella
+            bl_img["PMDL_Tex_Pixeles"] = huella_pixeles(rgba)
 
         print(f"[tex] Imagen registrada en Blender como '{nombre_img}'")
         return bl_img
 
     except Exception as e:
         print(f"[tex] Error al registrar imagen en Blender: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,200 @@
+import numpy as np
+
+from .tex_codec import (
+    FORMATO_PARCHE, codificar_textura, desempaquetar_indices,
+    indices_a_imagen, leer_paleta,
+)
+
+
+# Codificador de texturas del parche: imagen RGBA de Blender -> indices + paleta.
+#
+# La imagen se cuantiza a 2**bpp colores trabajando sobre sus colores unicos (con
+# su cantidad de pixeles como peso), no sobre los pixeles:
+#   1. Si todos los colores ya estan en la paleta original, se reutiliza tal cual.
+#   2. Si hay como mucho 2**bpp colores, la paleta son esos colores (sin perdida).
+#   3. Si no, median cut ponderado y un par de pasadas de k-means para afinar.
+# Cada color se asigna a la entrada mas cercana de la paleta (distancia RGBA).
+#
+# Antes de cuantizar se prueba el caso mas comun, un recoloreado: si cada indice
+# de la textura original pasa a tener un unico color, basta con reescribir la
+# paleta (sin cuantizar ni entrelazar, los indices del parche no cambian).
+
+PASADAS_KMEANS  = 2
+BLOQUE_BUSQUEDA = 1024
+
+
+def rgba_desde_imagen_blender(bl_img):
+    """Pixeles de una imagen de Blender como uint8[alto, ancho, 4] (mismo orden que el import)."""
+    ancho, alto = bl_img.size
+    pixeles     = np.empty(ancho * alto * 4, dtype=np.float32)
+    bl_img.pixels.foreach_get(pixeles)
+    pixeles *= 255.0
+    np.clip(pixeles, 0.0, 255.0, out=pixeles)
+    return np.rint(pixeles).astype(np.uint8).reshape(alto, ancho, 4)
+
+
+def _colores_unicos(rgba):
+    """Retorna (colores uint8[n, 4], conteos, inversa) de los pixeles de la imagen."""
+    claves = np.ascontiguousarray(rgba).reshape(-1, 4).view('<u4').ravel()
+    unicas, inversa, conteos = np.unique(claves, return_inverse=True, return_counts=True)
+    return unicas.view(np.uint8).reshape(-1, 4), conteos, inversa
+
+
+def color_mas_cercano(colores, paleta):
+    """Indice de la entrada de la paleta mas cercana a cada color (distancia RGBA al cuadrado)."""
+    # |c - p|^2 = |c|^2 - 2 c.p + |p|^2; con enteros <= 255 todo es exacto en float32
+    # y |c|^2 no cambia el argmin. Bloques chicos para que las distancias quepan en cache
+    paleta    = paleta.astype(np.float32)
+    norma_pal = (paleta * paleta).sum(axis=1)
+    menos_2pt = np.ascontiguousarray(-2.0 * paleta.T)
+    salida    = np.empty(len(colores), dtype=np.intp)
+    for inicio in range(0, len(colores), BLOQUE_BUSQUEDA):
+        distancias  = colores[inicio : inicio + BLOQUE_BUSQUEDA].astype(np.float32) @ menos_2pt
+        distancias += norma_pal
+        salida[inicio : inicio + len(distancias)] = distancias.argmin(axis=1)
+    return salida
+
+
+def _media_ponderada(colores, pesos, grupo, cantidad):
+    """Color medio (redondeado) de cada grupo, ponderado por cantidad de pixeles."""
+    total = np.bincount(grupo, weights=pesos, minlength=cantidad)
+    media = np.stack([np.bincount(grupo, weights=pesos * colores[:, c], minlength=cantidad)
+                      for c in range(4)], axis=1)
+    usados = total > 0
+    media[usados] /= total[usados, None]
+    return np.rint(media).astype(np.uint8), usados
+
+
+def _prioridad_caja(colores, conteos, caja):
+    """(pixeles x rango de su canal mas extendido, ese canal); 0 si no se puede partir."""
+    if len(caja) < 2:
+        return 0, 0
+    rangos = colores[caja].max(axis=0).astype(np.int32) - colores[caja].min(axis=0)
+    canal  = int(np.argmax(rangos))
+    return int(rangos[canal]) * int(conteos[caja].sum()), canal
+
+
+def _median_cut(colores, conteos, cantidad):
+    """Divide los colores en hasta 'cantidad' cajas; retorna (grupo de cada color, cajas)."""
+    cajas       = [np.arange(len(colores))]
+    prioridades = [_prioridad_caja(colores, conteos, cajas[0])]
+    while len(cajas) < cantidad:
+        # Se parte la caja con mas pixeles x rango, por la mediana de su canal mas extendido
+        mejor = max(range(len(cajas)), key=lambda i: prioridades[i][0])
+        prioridad, canal = prioridades[mejor]
+        if prioridad == 0:
+            break
+
+        caja      = cajas[mejor]
+        orden     = caja[np.argsort(colores[caja, canal], kind='stable')]
+        acumulado = np.cumsum(conteos[orden])
+        corte     = int(np.searchsorted(acumulado, acumulado[-1] / 2.0))
+        corte     = min(max(corte, 1), len(orden) - 1)
+        mitades   = [orden[:corte], orden[corte:]]
+        cajas[mejor : mejor + 1]       = mitades
+        prioridades[mejor : mejor + 1] = [_prioridad_caja(colores, conteos, m) for m in mitades]
+
+    grupo = np.empty(len(colores), dtype=np.intp)
+    for i, caja in enumerate(cajas):
+        grupo[caja] = i
+    return grupo, len(cajas)
+
+
+def paleta_por_remapeo(rgba, indices, paleta_original):
+    """
+    Paleta con la que los indices originales (uint8[alto, ancho], orden de la imagen)
+    reproducen exactamente la imagen, o None si algun indice necesita dos colores.
+    Las entradas que ningun pixel usa conservan su color original.
+    """
+    claves  = np.ascontiguousarray(rgba).reshape(-1, 4).view('<u4').ravel()
+    indices = np.asarray(indices).reshape(-1)
+    paleta  = np.ascontiguousarray(paleta_original, dtype=np.uint8).copy().view('<u4').ravel()
+
+    # Con indices repetidos queda uno cualquiera de sus colores: se verifica despues
+    paleta[indices] = claves
+    if not np.array_equal(paleta[indices], claves):
+        return None
+    return paleta.view(np.uint8).reshape(-1, 4)
+
+
+def indices_de_textura(blob, textura):
+    """Indices de una textura del parche como uint8[alto, ancho] en el orden de la imagen."""
+    formato = textura['formato']
+    datos   = np.frombuffer(blob, dtype=np.uint8, count=formato.tamano_indices,
+                            offset=textura['indices_offset'])
+    return indices_a_imagen(desempaquetar_indices(datos, formato.bpp), formato)
+
+
+def cuantizar(rgba, colores_max=256, paleta_original=None):
+    """
+    Cuantiza una imagen uint8[alto, ancho, 4] a lo sumo 'colores_max' colores.
+    Retorna (indices uint8[alto, ancho], paleta uint8[n, 4], exacta); 'exacta'
+    indica que la paleta representa la imagen sin perdida.
+    """
+    alto, ancho = rgba.shape[:2]
+    colores, conteos, inversa = _colores_unicos(rgba)
+
+    # 1. Todos los colores estan en la paleta original: se conserva
+    if paleta_original is not None:
+        claves_pal  = np.ascontiguousarray(paleta_original, dtype=np.uint8).view('<u4').ravel()
+        claves, primera = np.unique(claves_pal, return_index=True)
+        buscados    = colores.view('<u4').ravel()
+        posicion    = np.minimum(np.searchsorted(claves, buscados), len(claves) - 1)
+        if np.array_equal(claves[posicion], buscados):
+            indices = primera[posicion][inversa].astype(np.uint8)
+            return indices.reshape(alto, ancho), np.asarray(paleta_original, dtype=np.uint8), True
+
+    # 2. Pocos colores: la paleta son los propios colores
+    if len(colores) <= colores_max:
+        return inversa.astype(np.uint8).reshape(alto, ancho), colores, True
+
+    # 3. Median cut + k-means sobre los colores unicos
+    pesos           = conteos.astype(np.float64)
+    grupo, cantidad = _median_cut(colores, conteos, colores_max)
+    paleta, _       = _media_ponderada(colores, pesos, grupo, cantidad)
+    for _ in range(PASADAS_KMEANS):
+        grupo          = color_mas_cercano(colores, paleta)
+        nueva, usados  = _media_ponderada(colores, pesos, grupo, len(paleta))
+        paleta[usados] = nueva[usados]
+    grupo = color_mas_cercano(colores, paleta)
+
+    return grupo[inversa].astype(np.uint8).reshape(alto, ancho), paleta, False
+
+
+def codificar_rgba(rgba, formato=FORMATO_PARCHE, paleta_original=None):
+    """
+    Imagen uint8[alto, ancho, 4] (orden del import) -> (bytes de indices, bytes de
+    paleta, exacta) en el layout entrelazado del formato.
+    """
+    alto, ancho = rgba.shape[:2]
+    if (ancho, alto) != (formato.ancho, formato.alto):
+        raise ValueError(f"La imagen es de {ancho}x{alto}, la textura del parche es {formato}")
+    indices, paleta, exacta = cuantizar(rgba, formato.colores, paleta_original)
+    indices_bytes, paleta_bytes = codificar_textura(indices, paleta, formato)
+    return indices_bytes, paleta_bytes, exacta
+
+
+def textura_a_parche(blob, textura, rgba):
+    """
+    Escribe una imagen RGBA sobre una textura del parche (dict de leer_texturas):
+    indices y paleta en su sitio, sin cambiar el tamano. Si la imagen es igual a la
+    textura actual no se toca nada y si es un recoloreado solo se reescribe la paleta.
+    Retorna 'sin cambios', 'paleta', 'exacta' o 'cuantizada'.
+    """
+    formato        = textura['formato']
+    indices_offset = textura['indices_offset']
+    paleta_offset  = textura['paleta_offset']
+
+    # Con los indices actuales basta otra paleta (o la misma: la imagen no cambio)
+    paleta_original = leer_paleta(blob, paleta_offset, formato)
+    paleta          = paleta_por_remapeo(rgba, indices_de_textura(blob, textura), paleta_original)
+    if paleta is not None:
+        if np.array_equal(paleta, paleta_original):
+            return 'sin cambios'
+        blob[paleta_offset : paleta_offset + formato.tamano_paleta] = paleta.tobytes()
+        return 'paleta'
+
+    indices_bytes, paleta_bytes, exacta = codificar_rgba(rgba, formato, paleta_original)
+    blob[indices_offset : indices_offset + len(indices_bytes)] = indices_bytes
+    blob[paleta_offset : paleta_offset + len(paleta_bytes)]   = paleta_bytes
+    return 'exacta' if exacta else 'cuantizada'
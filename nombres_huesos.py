@@ -0,0 +1,32 @@
+import os
+
+
+def cargar_nombres_huesos():
+    """Carga el diccionario de nombres desde bones_list"""
+
+    addon_dir  = os.path.dirname(os.path.abspath(__file__))
+    bones_file = os.path.join(addon_dir, "bones_list.txt")
+    nombres    = {}
+
+    if not os.path.exists(bones_file):
+        return nombres
+
+    try:
+        with open(bones_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if ':' in line:
+                    partes = line.split(':', 1)
+                    nombres[partes[0].strip()] = partes[1].strip()
+    except Exception as e:
+        print(f"Error al cargar bones_list.txt: {e}")
+
+    return nombres
+
+
+def obtener_nombre_hueso(hueso_id, renombrar, nombres):
+    """Retorna el nombre del hueso segun su ID."""
+    nombre_base = f"sk_{hueso_id:02X}"
+    if renombrar and nombre_base in nombres:
+        return nombres[nombre_base]
+    return nombre_base
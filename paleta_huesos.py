@@ -0,0 +1,97 @@
+from .formato_pmdl import ENTRADA_PARTE, entradas_subpartes
+
+
+# En la cabecera de cada subparte, 0xFF en la columna j significa "el mismo ID de
+# hueso que la ultima subparte que uso la columna j". El estado de las columnas
+# cruza partes, igual que el juego lo lee. Una columna sin ID previo queda en 0xFF.
+ID_REPETIDO = 0xFF
+
+
+class ResolutorPaleta:
+    """
+    Resuelve los 0xFF de las subpartes en orden de archivo.
+    Mantiene el ultimo ID real de cada columna (cualquier cantidad de columnas).
+    """
+    __slots__ = ('_columnas',)
+
+    def __init__(self):
+        self._columnas = []
+
+    def resolver(self, crudos):
+        """IDs crudos de una subparte -> IDs reales (0xFF solo si la columna no tiene previo)."""
+        columnas = self._columnas
+        cantidad = len(crudos)
+        if cantidad > len(columnas):
+            columnas.extend([ID_REPETIDO] * (cantidad - len(columnas)))
+
+        if ID_REPETIDO in crudos:
+            resueltos = [columnas[j] if hueso_id == ID_REPETIDO else hueso_id
+                         for j, hueso_id in enumerate(crudos)]
+        else:
+            resueltos = list(crudos)
+        columnas[:cantidad] = resueltos
+        return resueltos
+
+
+class CodificadorPaleta:
+    """
+    Inverso de ResolutorPaleta: escribe 0xFF en toda columna cuyo ID es igual
+    al anterior de esa columna. Produce la codificacion con mas 0xFF posible.
+    """
+    __slots__ = ('_columnas',)
+
+    def __init__(self):
+        self._columnas = []
+
+    def codificar(self, resueltos):
+        """IDs reales de una subparte -> bytes tal como van en la cabecera."""
+        columnas    = self._columnas
+        codificados = bytearray(len(resueltos))
+        for j, hueso_id in enumerate(resueltos):
+            if j == len(columnas):
+                columnas.append(ID_REPETIDO)
+            codificados[j] = ID_REPETIDO if hueso_id == columnas[j] else hueso_id
+            columnas[j]    = hueso_id
+        return bytes(codificados)
+
+
+def recorrer_subpartes(blob, offset_indice_partes, cantidad_partes, desde=0):
+    """
+    Generador sobre las cabeceras de subpartes del archivo, en orden, desde la parte 'desde'.
+    Produce (indice_parte, indice_subparte, offset_entrada, entrada) con lecturas acotadas.
+    """
+    entradas = ENTRADA_PARTE.iterar(blob, offset_indice_partes + desde * ENTRADA_PARTE.tamano,
+                                    max(0, cantidad_partes - desde))
+    for i, parte in enumerate(entradas, desde):
+        for j, (offset_entrada, entrada) in enumerate(entradas_subpartes(blob, parte['offset'])):
+            yield i, j, offset_entrada, entrada
+
+
+def _ids_crudos(entrada):
+    return entrada['huesos_ids'][:entrada['num_huesos']]
+
+
+def validar_paleta(blob, offset_indice_partes, cantidad_partes):
+    """
+    Revisa las IDs de hueso de todas las subpartes en una pasada.
+    Retorna una lista de avisos (vacia si todo esta bien): columnas 0xFF sin
+    ID previo y subpartes que no estan en la codificacion optima.
+    """
+    resolutor   = ResolutorPaleta()
+    codificador = CodificadorPaleta()
+    avisos      = []
+
+    for i, j, _, entrada in recorrer_subpartes(blob, offset_indice_partes, cantidad_partes):
+        crudos    = _ids_crudos(entrada)
+        resueltos = resolutor.resolver(crudos)
+
+        if entrada['num_huesos'] > len(crudos):
+            avisos.append(f"Parte {i:02d} sub {j:02d}: {entrada['num_huesos']} huesos, "
+                          f"la cabecera solo admite {len(crudos)}")
+        for columna, hueso_id in enumerate(resueltos):
+            if hueso_id == ID_REPETIDO:
+                avisos.append(f"Parte {i:02d} sub {j:02d}: columna {columna} en 0xFF sin ID previo")
+        if codificador.codificar(resueltos) != bytes(crudos):
+            avisos.append(f"Parte {i:02d} sub {j:02d}: IDs sin optimizar ({bytes(crudos).hex()})")
+
+    return avisos
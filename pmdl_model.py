@@ -0,0 +1,201 @@
+class _AccesoDict:
+    """
+    Acceso tipo diccionario sobre los atributos del registro (obj['clave'], obj.get).
+    Permite que el codigo que todavia espera los dicts de analizar_pmdl siga funcionando.
+    Las claves son los slots y las properties publicos de la clase; 'in' las consulta
+    sin evaluar las properties (decodificar vertices, armar listas de dicts).
+    """
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        claves = set()
+        for clase in cls.__mro__:
+            claves.update(getattr(clase, '__slots__', ()))
+            claves.update(nombre for nombre, valor in vars(clase).items() if isinstance(valor, property))
+        cls._claves = frozenset(clave for clave in claves if not clave.startswith('_'))
+
+    def __getitem__(self, clave):
+        try:
+            return getattr(self, clave)
+        except AttributeError:
+            raise KeyError(clave) from None
+
+    def __setitem__(self, clave, valor):
+        setattr(self, clave, valor)
+
+    def __contains__(self, clave):
+        return clave in self._claves
+
+    def get(self, clave, defecto=None):
+        return getattr(self, clave, defecto)
+
+
+class PmdlSubpart(_AccesoDict):
+    """
+    Subparte (tira de triangulos) con sus datos por vertice en arrays contiguos:
+      coords : int16[N, 3]
+      uvs    : uint8[N, 2]
+      pesos  : float32[N, num_huesos]
+    Los arrays se decodifican desde los datos de la parte la primera vez que se
+    accede a ellos y quedan memorizados.
+    """
+    __slots__ = (
+        'indice', 'num_vertices', 'num_huesos', 'huesos_ids', 'offset',
+        '_datos_parte', '_coords', '_uvs', '_pesos',
+    )
+
+    def __init__(self, indice, num_vertices, num_huesos, huesos_ids, offset, datos_parte):
+        self.indice       = indice
+        self.num_vertices = num_vertices
+        self.num_huesos   = num_huesos
+        self.huesos_ids   = huesos_ids
+        self.offset       = offset
+        self._datos_parte = datos_parte
+        self._coords      = None
+        self._uvs         = None
+        self._pesos       = None
+
+    @classmethod
+    def desde_arrays(cls, indice, num_vertices, num_huesos, huesos_ids, offset,
+                     coords, uvs, pesos):
+        """Crea una subparte ya decodificada a partir de sus arrays."""
+        subparte         = cls(indice, num_vertices, num_huesos, huesos_ids, offset, None)
+        subparte._coords = coords
+        subparte._uvs    = uvs
+        subparte._pesos  = pesos
+        return subparte
+
+    @property
+    def decodificada(self):
+        return self._coords is not None
+
+    def decodificar(self):
+        """Decodifica los vertices si aun no se hizo y libera la referencia a los datos."""
+        if self._coords is None:
+            from .pmdl_parser import decodificar_vertices
+            self._pesos, self._uvs, self._coords = decodificar_vertices(
+                self._datos_parte, self.offset, self.num_vertices, self.num_huesos
+            )
+            self._datos_parte = None
+        return self
+
+    @property
+    def coords(self):
+        return self.decodificar()._coords
+
+    @property
+    def uvs(self):
+        return self.decodificar()._uvs
+
+    @property
+    def pesos(self):
+        return self.decodificar()._pesos
+
+    @property
+    def vertices(self):
+        """Lista de dicts por vertice (formato antiguo). Se construye en cada acceso."""
+        vertices = []
+        for i, (pesos_v, (uv_x, uv_y), (coord_x, coord_y, coord_z)) in enumerate(
+                zip(self.pesos.tolist(), self.uvs.tolist(), self.coords.tolist())):
+            vertices.append({
+                'indice' : i,
+                'pesos'  : pesos_v,
+                'uv_x'   : uv_x,
+                'uv_y'   : uv_y,
+                'coord_x': coord_x,
+                'coord_y': coord_y,
+                'coord_z': coord_z,
+            })
+        return vertices
+
+
+class PmdlPart(_AccesoDict):
+    """Entrada de la tabla de partes con sus subpartes."""
+    __slots__ = (
+        'indice', 'capa', 'opacidad', 'offset', 'longitud',
+        'flag_especial', 'flag_bytes_raw', 'nombre_flag', 'subpartes',
+    )
+
+    def __init__(self, indice, capa, opacidad, offset, longitud,
+                 flag_especial, flag_bytes_raw, nombre_flag, subpartes):
+        self.indice         = indice
+        self.capa           = capa
+        self.opacidad       = opacidad
+        self.offset         = offset
+        self.longitud       = longitud
+        self.flag_especial  = flag_especial
+        self.flag_bytes_raw = flag_bytes_raw
+        self.nombre_flag    = nombre_flag
+        self.subpartes      = subpartes
+
+    @property
+    def cantidad_subpartes(self):
+        return len(self.subpartes)
+
+
+class PmdlModel(_AccesoDict):
+    """Cabecera del PMDL/PMDF y lista de partes."""
+    __slots__ = (
+        'nombre', 'filepath', 'tipo',
+        'grosor_x', 'grosor_y', 'grosor_z',
+        'cantidad_huesos', 'offset_huesos', 'cantidad_partes', 'offset_indice_partes',
+        'blob', 'partes',
+    )
+
+    def __init__(self, nombre, filepath, tipo, grosor_x, grosor_y, grosor_z,
+                 cantidad_huesos, offset_huesos, cantidad_partes, offset_indice_partes,
+                 blob, partes=None):
+        self.nombre               = nombre
+        self.filepath             = filepath
+        self.tipo                 = tipo
+        self.grosor_x             = grosor_x
+        self.grosor_y             = grosor_y
+        self.grosor_z             = grosor_z
+        self.cantidad_huesos      = cantidad_huesos
+        self.offset_huesos        = offset_huesos
+        self.cantidad_partes      = cantidad_partes
+        self.offset_indice_partes = offset_indice_partes
+        self.blob                 = blob
+        self.partes               = partes if partes is not None else []
+
+
+
+class ResumenParte(_AccesoDict):
+    """Datos de una entrada de la tabla de partes, sin vertices."""
+    __slots__ = (
+        'indice', 'capa', 'opacidad', 'flag_especial', 'nombre_flag',
+        'cantidad_subpartes', 'cantidad_vertices',
+    )
+
+    def __init__(self, indice, capa, opacidad, flag_especial, nombre_flag,
+                 cantidad_subpartes, cantidad_vertices):
+        self.indice             = indice
+        self.capa               = capa
+        self.opacidad           = opacidad
+        self.flag_especial      = flag_especial
+        self.nombre_flag        = nombre_flag
+        self.cantidad_subpartes = cantidad_subpartes
+        self.cantidad_vertices  = cantidad_vertices
+
+
+class ResumenPmdl(_AccesoDict):
+    """Resumen de cabecera e indice de un PMDL/PMDF, obtenido sin leer el archivo completo."""
+    __slots__ = (
+        'nombre', 'filepath', 'tipo', 'tamano',
+        'cantidad_huesos', 'cantidad_partes',
+        'grosor_x', 'grosor_y', 'grosor_z', 'partes',
+    )
+
+    def __init__(self, nombre, filepath, tipo, tamano, cantidad_huesos, cantidad_partes,
+                 grosor_x, grosor_y, grosor_z, partes):
+        self.nombre          = nombre
+        self.filepath        = filepath
+        self.tipo            = tipo
+        self.tamano          = tamano
+        self.cantidad_huesos = cantidad_huesos
+        self.cantidad_partes = cantidad_partes
+        self.grosor_x        = grosor_x
+        self.grosor_y        = grosor_y
+        self.grosor_z        = grosor_z
+        self.partes          = partes
@@ -1,174 +1,235 @@
 import os
 
-from .binary_utils import (
-    FLAGS_ESPECIALES,
-    leer_uint32, leer_uint16, leer_uint8, leer_int16, leer_float32
-)
+import numpy as np
 
+from .binary_utils import FLAGS_ESPECIALES
+from .formato_pmdl import CABECERA, CABECERA_PARTE, ENTRADA_PARTE, ENTRADA_SUBPARTE, dtype_vertice
+from .paleta_huesos import ResolutorPaleta, validar_paleta
+from .pmdl_model import PmdlModel, PmdlPart, PmdlSubpart, ResumenPmdl, ResumenParte
 
-def leer_vertices(datos_parte, offset_subparte, num_vertices, num_huesos):
 
-    vertices    = []
-    tamano_pesos   = num_huesos * 2
-    tamano_vertice = tamano_pesos + 2 + 6
-    pos         = offset_subparte
+# Tabla de normalizacion de pesos: valor raw big-endian (0x0000-0xFFFF) -> peso 0.0-1.0
+_RAW_PESOS   = np.arange(0x10000, dtype=np.float64)
+_TABLA_PESOS = np.where(
+    _RAW_PESOS <= 0x0080, 0.0,
+    np.where(_RAW_PESOS >= 0x8000, 1.0, (_RAW_PESOS - 128) / 32640.0)
+).astype(np.float32)
 
-    for i in range(num_vertices):
-        if pos + tamano_vertice > len(datos_parte):
-            break
-
-        pesos = []
-        for j in range(num_huesos):
-            if pos + (j * 2) + 2 <= len(datos_parte):
-                byte1    = leer_uint8(datos_parte, pos + (j * 2))
-                byte2    = leer_uint8(datos_parte, pos + (j * 2) + 1)
-                peso_raw = (byte1 << 8) | byte2  # big-endian
-
-                if peso_raw <= 0x0080:
-                    peso_norm = 0.0
-                elif peso_raw >= 0x8000:
-                    peso_norm = 1.0
-                else:
-                    peso_norm = (peso_raw - 128) / 32640.0
-            else:
-                # Bytes fuera de rango: peso 0.0 para mantener longitud correcta
-                peso_norm = 0.0
 
-            pesos.append(peso_norm)
+def decodificar_vertices(datos_parte, offset_subparte, num_vertices, num_huesos):
+    """
+    Decodifica los vertices de una subparte de una sola vez.
+    Retorna (pesos float32[N,k], uvs uint8[N,2], coords int16[N,3]).
+    Los vertices que no caben completos en datos_parte se descartan.
+    """
+    dtype       = dtype_vertice(num_huesos)
+    disponibles = max(0, len(datos_parte) - offset_subparte) // dtype.itemsize
+    cantidad    = min(num_vertices, disponibles)
 
-        pos += tamano_pesos
+    if cantidad <= 0:
+        return (np.zeros((0, num_huesos), dtype=np.float32),
+                np.zeros((0, 2), dtype=np.uint8),
+                np.zeros((0, 3), dtype=np.int16))
 
-        uv_x   = leer_uint8(datos_parte, pos)
-        uv_y   = leer_uint8(datos_parte, pos + 1)
-        pos   += 2
+    registros = np.frombuffer(datos_parte, dtype=dtype, count=cantidad, offset=offset_subparte)
 
-        coord_x = leer_int16(datos_parte, pos)
-        coord_y = leer_int16(datos_parte, pos + 2)
-        coord_z = leer_int16(datos_parte, pos + 4)
-        pos    += 6
+    pesos  = _TABLA_PESOS[registros['pesos']]
+    uvs    = registros['uv'].copy()
+    coords = registros['coords'].astype(np.int16)
+    return pesos, uvs, coords
 
-        vertices.append({
-            'indice' : i,
-            'pesos'  : pesos,
-            'uv_x'   : uv_x,
-            'uv_y'   : uv_y,
-            'coord_x': coord_x,
-            'coord_y': coord_y,
-            'coord_z': coord_z,
-        })
 
-    return vertices
+def analizar_subpartes(datos_parte, resolutor, diferido=False):
+    """
+    Analiza las subpartes dentro de una parte individual.
+    'resolutor' es el ResolutorPaleta compartido por todas las partes del archivo.
+    Con diferido=True solo se leen las cabeceras; los vertices se decodifican
+    al primer acceso a coords/uvs/pesos de cada subparte.
+    """
 
+    if len(datos_parte) < CABECERA_PARTE.tamano:
+        return []
 
-def analizar_subpartes(datos_parte, ids_previas_global):
-    """Analiza las subpartes dentro de una parte individual."""
-
-    if len(datos_parte) < 4:
-        return [], ids_previas_global
-
-    cantidad_subpartes = leer_uint32(datos_parte, 0x00)
+    cantidad_subpartes = CABECERA_PARTE.leer(datos_parte)['cantidad_subpartes']
     subpartes          = []
-    ids_previas        = list(ids_previas_global)
-
-    for i in range(cantidad_subpartes):
-        entrada_offset = 0x04 + (i * 0x10)
 
-        if entrada_offset + 0x10 > len(datos_parte):
-            break
-
-        num_vertices = leer_uint16(datos_parte, entrada_offset + 0x00)
-        num_huesos   = leer_uint16(datos_parte, entrada_offset + 0x02)
+    entradas = ENTRADA_SUBPARTE.tuplas(datos_parte, CABECERA_PARTE.tamano, cantidad_subpartes)
+    for i, (num_vertices, num_huesos, huesos_ids, offset_subparte) in enumerate(entradas):
+        subparte = PmdlSubpart(i, num_vertices, num_huesos,
+                               resolutor.resolver(huesos_ids[:num_huesos]),
+                               offset_subparte, datos_parte)
+        if not diferido:
+            subparte.decodificar()
+        subpartes.append(subparte)
 
-        huesos_ids = []
-        for j in range(num_huesos):
-            if entrada_offset + 0x04 + j < len(datos_parte):
-                hueso_id = leer_uint8(datos_parte, entrada_offset + 0x04 + j)
+    return subpartes
 
-                if hueso_id == 0xFF:
-                    hueso_id = ids_previas[j] if ids_previas[j] is not None else 0xFF
 
-                huesos_ids.append(hueso_id)
-                ids_previas[j] = hueso_id
+def analizar_pmdl(filepath, diferido=False):
+    """
+    Analiza un archivo PMDL y retorna un PmdlModel con la informacion.
+    Con diferido=True solo se analiza el indice de partes y subpartes; los
+    vertices se decodifican la primera vez que se accede a ellos.
+    """
 
-        offset_subparte = leer_uint32(datos_parte, entrada_offset + 0x0C)
-        vertices        = leer_vertices(datos_parte, offset_subparte, num_vertices, num_huesos)
+    with open(filepath, 'rb') as f:
+        blob = f.read()
 
-        subpartes.append({
-            'indice'      : i,
-            'num_vertices': num_vertices,
-            'num_huesos'  : num_huesos,
-            'huesos_ids'  : huesos_ids,
-            'offset'      : offset_subparte,
-            'vertices'    : vertices,
-        })
+    return analizar_pmdl_bytes(blob, os.path.basename(filepath), filepath, diferido)
 
-    return subpartes, ids_previas
 
+def leer_cabecera_pmdl(blob, offset=0, tamano=None, nombre='', filepath=''):
+    """
+    Lee la cabecera de un PMDL/PMDF que empieza en 'offset' dentro de cualquier
+    buffer (bytes, bytearray o memoryview). Retorna (PmdlModel sin partes, error).
+    El blob del modelo es una ventana memoryview sobre el PMDL, sin copias.
+    """
 
-def analizar_pmdl(filepath):
-    """Analiza un archivo PMDL y retorna un diccionario con la informacion."""
+    fin  = offset + tamano if tamano is not None else None
+    blob = memoryview(blob)[offset:fin]
+    if len(blob) < 0x64:
+        return None, "Error: Datos demasiado cortos para ser PMDL/PMDF"
 
-    with open(filepath, 'rb') as f:
-        blob = f.read()
-
-    firma = blob[0:4].decode('ascii', errors='ignore')
+    cabecera = CABECERA.leer(blob)
+    firma    = cabecera['firma'].decode('ascii', errors='ignore')
     if firma not in ('pMdl', 'pMdF'):
         return None, "Error: No es un archivo PMDL/PMDF valido (firma incorrecta)"
 
-    info = {}
-    info['nombre']   = os.path.basename(filepath)
-    info['filepath'] = filepath
-    info['tipo']     = firma
-
-    info['grosor_x'] = leer_float32(blob, 0x40)
-    info['grosor_y'] = leer_float32(blob, 0x44)
-    info['grosor_z'] = leer_float32(blob, 0x48)
+    # Se guarda el blob completo para que bone_builder pueda leer los huesos
+    grosor_x, grosor_y, grosor_z = cabecera['grosor']
+    info = PmdlModel(
+        nombre               = nombre,
+        filepath             = filepath,
+        tipo                 = firma,
+        grosor_x             = grosor_x,
+        grosor_y             = grosor_y,
+        grosor_z             = grosor_z,
+        cantidad_huesos      = cabecera['cantidad_huesos'],
+        offset_huesos        = cabecera['offset_huesos'],
+        cantidad_partes      = cabecera['cantidad_partes'],
+        offset_indice_partes = cabecera['offset_indice_partes'],
+        blob                 = blob,
+    )
+    return info, None
 
-    info['cantidad_huesos']      = leer_uint32(blob, 0x08)
-    info['offset_huesos']        = leer_uint32(blob, 0x50)
-    info['cantidad_partes']      = leer_uint32(blob, 0x5C)
-    info['offset_indice_partes'] = leer_uint32(blob, 0x60)
 
-    # Guardar blob completo para que bone_builder pueda leer los huesos
-    info['blob'] = blob
+def analizar_pmdl_bytes(blob, nombre, filepath='', diferido=False, offset=0, tamano=None):
+    """
+    Motor comun de parseo para archivos PMDL, PMDL embebidos en parches y caras PMDF.
+    Acepta cualquier buffer mas un offset (y tamano opcional) donde empieza el PMDL.
+    Los datos de cada parte son ventanas memoryview sobre el mismo buffer, sin copias.
+    """
 
-    ids_previas_global = [None, None, None, None]
-    partes = []
+    info, error = leer_cabecera_pmdl(blob, offset, tamano, nombre, filepath)
+    if error:
+        return None, error
+    blob = info.blob
 
-    for i in range(info['cantidad_partes']):
-        entrada_offset = info['offset_indice_partes'] + (i * 0x20)
+    resolutor = ResolutorPaleta()
+    partes    = []
 
-        if entrada_offset + 0x20 > len(blob):
-            break
+    entradas = ENTRADA_PARTE.tuplas(blob, info.offset_indice_partes, info.cantidad_partes)
+    for i, (capa, opacidad, part_offset, part_length, flag_especial) in enumerate(entradas):
+        datos_parte = blob[part_offset : part_offset + part_length]
+        subpartes   = analizar_subpartes(datos_parte, resolutor, diferido)
 
-        capa         = leer_uint16(blob, entrada_offset + 0x00)
-        opacidad     = leer_uint16(blob, entrada_offset + 0x02)
-        part_offset  = leer_uint32(blob, entrada_offset + 0x04)
-        part_length  = leer_uint32(blob, entrada_offset + 0x08)
-        flag_especial = leer_uint32(blob, entrada_offset + 0x0C)
-        flag_bytes   = blob[entrada_offset + 0x0C : entrada_offset + 0x10]
-        nombre_flag  = FLAGS_ESPECIALES.get(flag_especial, "Desconocido")
+        partes.append(PmdlPart(
+            i, capa, opacidad, part_offset, part_length, flag_especial,
+            flag_especial.to_bytes(4, 'little').hex(),
+            FLAGS_ESPECIALES.get(flag_especial, "Desconocido"),
+            subpartes,
+        ))
 
-        datos_parte = blob[part_offset : part_offset + part_length]
-        subpartes, ids_previas_global = analizar_subpartes(datos_parte, ids_previas_global)
-
-        partes.append({
-            'indice'           : i,
-            'capa'             : capa,
-            'opacidad'         : opacidad,
-            'offset'           : part_offset,
-            'longitud'         : part_length,
-            'flag_especial'    : flag_especial,
-            'flag_bytes_raw'   : flag_bytes.hex(),
-            'nombre_flag'      : nombre_flag,
-            'subpartes'        : subpartes,
-            'cantidad_subpartes': len(subpartes),
-        })
-
-    info['partes'] = partes
+    info.partes = partes
     return info, None
 
 
+EXTENSIONES_PMDL = ('.pmdl', '.pmdf', '.unk')
+
+
+def escanear_pmdl(filepath):
+    """
+    Lee solo la cabecera, la tabla de partes (0x20 por entrada) y las cabeceras
+    de subpartes (0x10 por entrada) de un PMDL/PMDF, con lecturas acotadas.
+    Retorna (ResumenPmdl, error).
+    """
+    try:
+        tamano = os.path.getsize(filepath)
+        with open(filepath, 'rb') as f:
+            cabecera, error = leer_cabecera_pmdl(f.read(0x64), nombre=os.path.basename(filepath),
+                                                 filepath=filepath)
+            if error:
+                return None, error
+
+            cantidad_partes      = cabecera.cantidad_partes
+            offset_indice_partes = cabecera.offset_indice_partes
+
+            # No leer mas entradas de las que caben en el archivo
+            cantidad_partes = min(cantidad_partes, max(0, tamano - offset_indice_partes) // ENTRADA_PARTE.tamano)
+            f.seek(offset_indice_partes)
+            indice = f.read(cantidad_partes * ENTRADA_PARTE.tamano)
+
+            partes = []
+            for i, entrada in enumerate(ENTRADA_PARTE.iterar(indice, 0, cantidad_partes)):
+                part_length        = entrada['longitud']
+                cantidad_subpartes = 0
+                cantidad_vertices  = 0
+                if part_length >= CABECERA_PARTE.tamano:
+                    f.seek(entrada['offset'])
+                    cabecera_parte = f.read(CABECERA_PARTE.tamano)
+                    if len(cabecera_parte) == CABECERA_PARTE.tamano:
+                        cantidad_subpartes = min(CABECERA_PARTE.leer(cabecera_parte)['cantidad_subpartes'],
+                                                 (part_length - CABECERA_PARTE.tamano) // ENTRADA_SUBPARTE.tamano)
+                        subcabeceras = list(ENTRADA_SUBPARTE.iterar(
+                            f.read(cantidad_subpartes * ENTRADA_SUBPARTE.tamano), 0, cantidad_subpartes
+                        ))
+                        cantidad_subpartes = len(subcabeceras)
+                        cantidad_vertices  = sum(sub['num_vertices'] for sub in subcabeceras)
+
+                partes.append(ResumenParte(
+                    indice             = i,
+                    capa               = entrada['capa'],
+                    opacidad           = entrada['opacidad'],
+                    flag_especial      = entrada['flag_especial'],
+                    nombre_flag        = FLAGS_ESPECIALES.get(entrada['flag_especial'], "Desconocido"),
+                    cantidad_subpartes = cantidad_subpartes,
+                    cantidad_vertices  = cantidad_vertices,
+                ))
+    except OSError as e:
+        return None, f"Error: No se pudo leer el archivo: {e}"
+
+    resumen = ResumenPmdl(
+        nombre          = cabecera.nombre,
+        filepath        = filepath,
+        tipo            = cabecera.tipo,
+        tamano          = tamano,
+        cantidad_huesos = cabecera.cantidad_huesos,
+        cantidad_partes = cabecera.cantidad_partes,
+        grosor_x        = cabecera.grosor_x,
+        grosor_y        = cabecera.grosor_y,
+        grosor_z        = cabecera.grosor_z,
+        partes          = partes,
+    )
+    return resumen, None
+
+
+def escanear_directorio(directorio, recursivo=True, extensiones=EXTENSIONES_PMDL):
+    """
+    Generador que recorre un directorio y produce (filepath, resumen, error)
+    para cada archivo con extension PMDL/PMDF, usando escanear_pmdl.
+    """
+    for raiz, carpetas, archivos in os.walk(directorio):
+        carpetas.sort()
+        for nombre in sorted(archivos):
+            if not nombre.lower().endswith(extensiones):
+                continue
+            filepath       = os.path.join(raiz, nombre)
+            resumen, error = escanear_pmdl(filepath)
+            yield filepath, resumen, error
+        if not recursivo:
+            break
+
+
 def generar_log(info):
     """Genera un string con el log de informacion del PMDL."""
 
@@ -196,5 +257,12 @@ def generar_log(info):
             log += f"    Sub {sub['indice']:02d}: {sub['num_vertices']} verts, huesos=[{huesos_str}]\n"
         log += "\n"
 
+    if info.get('blob') is not None:
+        avisos = validar_paleta(info['blob'], info['offset_indice_partes'], info['cantidad_partes'])
+        log += f"IDs de huesos: {'OK' if not avisos else f'{len(avisos)} aviso(s)'}\n"
+        for aviso in avisos:
+            log += f"  {aviso}\n"
+        log += "\n"
+
     log += "=" * 70 + "\n"
     return log
\ No newline at end of file
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+# Soldadura de vertices repetidos entre tiras. No depende de bpy.
+# Cada tira trae sus propios vertices, asi que las costuras entre subpartes se
+# repiten. Dos vertices se unen solo si coinciden exactamente en coords (int16
+# del archivo), UV (uint8) y pesos ya resueltos por hueso (float32).
+
+
+def _claves(*arrays):
+    """Una clave binaria por fila a partir de varios arrays [N, ...] (sin comparar por pares)."""
+    n        = len(arrays[0])
+    columnas = [np.ascontiguousarray(a).reshape(n, -1).view(np.uint8) for a in arrays]
+    filas    = np.ascontiguousarray(np.hstack(columnas))
+    return filas.view(np.dtype((np.void, filas.shape[1]))).ravel()
+
+
+def soldar_vertices(coords, uvs, pesos):
+    """
+    Une los vertices identicos de una parte.
+
+    coords : int16[N, 3]   uvs : uint8[N, 2]   pesos : float32[N, G] (una columna por hueso)
+
+    Retorna (representantes, slots):
+      representantes : int64[M] primer vertice original de cada vertice soldado,
+                       en orden de primera aparicion
+      slots          : int32[N] vertice soldado que ocupa cada vertice original
+    """
+    n = len(coords)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32)
+
+    _, primeros, inversa = np.unique(
+        _claves(coords, uvs, pesos), return_index=True, return_inverse=True
+    )
+
+    # np.unique ordena las claves; se renumera por primera aparicion para que los
+    # vertices soldados sigan el orden del archivo
+    orden = np.argsort(primeros, kind='stable')
+    rango = np.empty(len(orden), dtype=np.int32)
+    rango[orden] = np.arange(len(orden), dtype=np.int32)
+
+    return primeros[orden], rango[inversa.ravel()]
+
+
+def quitar_triangulos_duplicados(triangulos):
+    """
+    Mascara de triangulos a conservar: descarta los que repiten los mismos tres
+    vertices que uno anterior (en cualquier orden) y los que usan dos veces el
+    mismo vertice, como hacia bm.faces.new.
+    """
+    if len(triangulos) == 0:
+        return np.zeros(0, dtype=bool)
+
+    ordenados = np.sort(triangulos, axis=1)
+    _, primeros = np.unique(_claves(ordenados), return_index=True)
+
+    conservar = np.zeros(len(triangulos), dtype=bool)
+    conservar[primeros] = True
+    conservar &= (ordenados[:, 0] != ordenados[:, 1]) & (ordenados[:, 1] != ordenados[:, 2])
+    return conservar
@@ -0,0 +1,31 @@
+import os
+import sys
+import types
+
+import pytest
+
+
+# Plugin de pytest (ver pytest.ini) para probar los modulos del addon sin Blender.
+# El __init__ del addon (y el de logic_patch) registran los operadores e importan
+# bpy; los modulos que se prueban no lo necesitan, asi que los paquetes se
+# registran con su ruta sin ejecutar esos __init__ y pytest recorre la carpeta
+# del addon como un directorio comun.
+
+RAIZ_ADDON = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _registrar_paquete(nombre, ruta):
+    if nombre not in sys.modules:
+        paquete             = types.ModuleType(nombre)
+        paquete.__path__    = [ruta]
+        sys.modules[nombre] = paquete
+
+
+_registrar_paquete('pmdl_addon', RAIZ_ADDON)
+_registrar_paquete('pmdl_addon.logic_patch', os.path.join(RAIZ_ADDON, 'logic_patch'))
+
+
+def pytest_collect_directory(path, parent):
+    if str(path) == RAIZ_ADDON:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pytest
+
+from pmdl_addon import cache_parse
+from pmdl_addon.cache_parse import (
+    analizar_pmdl_cacheado, cargar_entrada, configurar_cache, guardar_entrada, invalidar_cache,
+    modelo_a_arrays, modelo_desde_arrays,
+)
+from pmdl_addon.pmdl_parser import analizar_pmdl_bytes
+from pmdl_sintetico         import pmdl_sintetico
+
+CAMPOS_MODELO = ('nombre', 'filepath', 'tipo', 'grosor_x', 'grosor_y', 'grosor_z', 'cantidad_huesos',
+                 'offset_huesos', 'cantidad_partes', 'offset_indice_partes')
+CAMPOS_PARTE  = ('indice', 'capa', 'opacidad', 'offset', 'longitud', 'flag_especial',
+                 'flag_bytes_raw', 'nombre_flag')
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Cache vacia en un directorio temporal; la configuracion se restaura al terminar."""
+    monkeypatch.setattr(cache_parse, '_config', dict(cache_parse._config))
+    configurar_cache(directorio=str(tmp_path / 'cache'), limite_mb=cache_parse.LIMITE_CACHE_MB)
+    return tmp_path / 'cache'
+
+
+def escribir_pmdl(directorio, nombre, semilla=0):
+    ruta = directorio / nombre
+    ruta.write_bytes(pmdl_sintetico(300, num_huesos=3, vertices_subparte=20, subpartes_parte=4,
+                                    semilla=semilla))
+    return str(ruta)
+
+
+def entradas(directorio):
+    return sorted(n for n in os.listdir(directorio) if n.endswith('.npz'))
+
+
+def comparar_modelos(a, b):
+    assert [getattr(a, c) for c in CAMPOS_MODELO] == [getattr(b, c) for c in CAMPOS_MODELO]
+    assert len(a.partes) == len(b.partes)
+    for pa, pb in zip(a.partes, b.partes):
+        assert [getattr(pa, c) for c in CAMPOS_PARTE] == [getattr(pb, c) for c in CAMPOS_PARTE]
+        assert len(pa.subpartes) == len(pb.subpartes)
+        for sa, sb in zip(pa.subpartes, pb.subpartes):
+            assert (sa.indice, sa.num_vertices, sa.num_huesos, sa.offset) == \
+                   (sb.indice, sb.num_vertices, sb.num_huesos, sb.offset)
+            assert list(sa.huesos_ids) == list(sb.huesos_ids)
+            for campo in ('coords', 'uvs', 'pesos'):
+                assert getattr(sa, campo).dtype == getattr(sb, campo).dtype
+                assert np.array_equal(getattr(sa, campo), getattr(sb, campo))
+
+
+@pytest.mark.parametrize("prefijo", ["", "cara_0_"])
+def test_modelo_ida_y_vuelta(prefijo):
+    blob        = pmdl_sintetico(300, num_huesos=3, vertices_subparte=20, subpartes_parte=4)
+    info, error = analizar_pmdl_bytes(blob, "modelo.pmdl", "/ruta/modelo.pmdl")
+    assert error is None
+
+    arrays = modelo_a_arrays(info, prefijo)
+    vuelta = modelo_desde_arrays(arrays, blob, prefijo)
+
+    comparar_modelos(vuelta, info)
+    assert vuelta.blob is blob
+    assert all(sub.decodificada for parte in vuelta.partes for sub in parte.subpartes)
+    assert modelo_desde_arrays(arrays, blob, "otro_") is None
+
+
+def test_acierto_da_los_mismos_datos(cache, tmp_path, monkeypatch):
+    ruta = escribir_pmdl(tmp_path, "modelo.pmdl")
+
+    primero, error = analizar_pmdl_cacheado(ruta)
+    assert error is None and len(entradas(cache)) == 1
+
+    # En un acierto no se vuelve a analizar el archivo
+    def sin_analizar(*args, **kwargs):
+        raise AssertionError("se analizo el archivo con la entrada en cache")
+    monkeypatch.setattr(cache_parse, 'analizar_pmdl_bytes', sin_analizar)
+
+    segundo, error = analizar_pmdl_cacheado(ruta)
+    assert error is None
+    comparar_modelos(segundo, primero)
+
+
+def test_guardar_reemplaza_la_version_vieja_del_archivo(cache):
+    datos = {'x': np.arange(10)}
+    guardar_entrada('aaaa_1', datos)
+    guardar_entrada('bbbb_1', datos)
+    guardar_entrada('aaaa_2', datos)
+
+    assert entradas(cache) == ['aaaa_2.npz', 'bbbb_1.npz']
+    assert cargar_entrada('aaaa_1') is None
+    assert np.array_equal(cargar_entrada('aaaa_2')['x'], datos['x'])
+
+
+def test_archivo_modificado_deja_una_sola_entrada(cache, tmp_path):
+    ruta = escribir_pmdl(tmp_path, "modelo.pmdl", semilla=0)
+    analizar_pmdl_cacheado(ruta)
+    antes = entradas(cache)
+
+    escribir_pmdl(tmp_path, "modelo.pmdl", semilla=1)
+    info, _ = analizar_pmdl_cacheado(ruta)
+
+    assert len(entradas(cache)) == 1 and entradas(cache) != antes
+    comparar_modelos(info, analizar_pmdl_bytes((tmp_path / "modelo.pmdl").read_bytes(), "modelo.pmdl", ruta)[0])
+
+
+def test_limite_elimina_las_menos_usadas(cache):
+    # Cuatro entradas de ~400 KiB con un limite de 1 MiB: quedan dos
+    datos = {'x': np.zeros(400 * 1024, dtype=np.uint8)}
+    for i, clave in enumerate(('a_1', 'b_1', 'c_1')):
+        guardar_entrada(clave, datos)
+        os.utime(cache / f"{clave}.npz", (1000 + i, 1000 + i))
+    configurar_cache(limite_mb=1)
+
+    # Un acierto la marca como usada recien: 'a' pasa a ser la mas nueva
+    assert cargar_entrada('a_1') is not None
+    guardar_entrada('d_1', datos)
+
+    assert entradas(cache) == ['a_1.npz', 'd_1.npz']
+
+
+def test_limite_cero_desactiva_la_cache(cache):
+    configurar_cache(limite_mb=0)
+    guardar_entrada('a_1', {'x': np.arange(3)})
+
+    assert not os.path.exists(cache)
+    assert cargar_entrada('a_1') is None
+
+
+def test_invalidar_un_archivo_y_toda_la_cache(cache, tmp_path):
+    ruta_a = escribir_pmdl(tmp_path, "a.pmdl", semilla=0)
+    ruta_b = escribir_pmdl(tmp_path, "b.pmdl", semilla=1)
+    analizar_pmdl_cacheado(ruta_a)
+    analizar_pmdl_cacheado(ruta_b)
+    guardar_entrada(cache_parse.clave_textura('0123abcd'), {'rgba': np.zeros((4, 4, 4), dtype=np.uint8)})
+    assert len(entradas(cache)) == 3
+
+    assert invalidar_cache(ruta_a) == 1
+    assert cargar_entrada(cache_parse.clave_archivo(ruta_b, (tmp_path / "b.pmdl").read_bytes())) is not None
+    assert len(entradas(cache)) == 2
+
+    assert invalidar_cache() == 2
+    assert entradas(cache) == []
@@ -0,0 +1,141 @@
+import numpy as np
+
+from pmdl_addon.codificador_pmdl import GROSOR_MAXIMO, codificar_pmdl, pesos_norm_a_bytes
+from pmdl_addon.datos_malla      import DatosMalla
+from pmdl_addon.formato_pmdl     import CABECERA
+from pmdl_addon.nombres_huesos   import obtener_nombre_hueso
+from pmdl_addon.pmdl_parser      import analizar_pmdl_bytes
+from pmdl_sintetico              import pmdl_sintetico
+
+
+def peso_norm_a_bytes(peso_norm):
+    """Conversion anterior: un peso por llamada, retorna (byte alto, byte bajo)."""
+    if peso_norm <= 0.0:
+        return (0x00, 0x00)
+    elif peso_norm >= 1.0:
+        return (0x80, 0x00)
+    raw = int(round(peso_norm * 32640.0 + 128))
+    raw = max(0x0081, min(0x7FFF, raw))
+    return ((raw >> 8) & 0xFF, raw & 0xFF)
+
+
+def test_pesos_igual_que_el_bucle():
+    rnd    = np.random.default_rng(0)
+    bordes = [-1.0, -0.0, 0.0, 1e-9, 1e-5, 0.5, 0.9999, 0.99999, 1.0, 1.5]
+    # Pesos que caen justo en medio de dos valores crudos (el redondeo va al par)
+    medios = [(raw + 0.5 - 128) / 32640.0 for raw in (0x81, 0x1000, 0x4001, 0x7FFE)]
+    pesos  = np.concatenate((bordes, medios, rnd.random(4993),
+                             rnd.random(4993).astype(np.float32))).reshape(-1, 4)
+
+    raw = pesos_norm_a_bytes(pesos)
+
+    assert raw.dtype == np.dtype('>u2') and raw.shape == pesos.shape
+    esperado = [bytes(peso_norm_a_bytes(float(p))) for p in pesos.ravel()]
+    assert [raw.ravel()[i:i + 1].tobytes() for i in range(raw.size)] == esperado
+
+
+# --- Reutilizacion de partes sin cambios ---
+
+def sin_log(*args):
+    pass
+
+
+def pmdl_canonico():
+    """
+    PMDL sintetico con grosor maximo (coordenadas sin factor) y los IDs de hueso ya
+    codificados con los 0xFF optimos, como quedan despues de un export.
+    """
+    blob = bytearray(pmdl_sintetico(120, num_huesos=2, vertices_subparte=10, subpartes_parte=4))
+    CABECERA.escribir(blob, 0, grosor=(GROSOR_MAXIMO,) * 3)
+    codificar_pmdl(blob, [], None, log=sin_log)
+    return blob
+
+
+def malla(parte, semilla, guardada=True):
+    """DatosMalla al azar con un vertice por vertice de la parte; por defecto sin cambios."""
+    rnd    = np.random.default_rng(semilla)
+    n      = sum(sub.num_vertices for sub in parte.subpartes)
+    grupos = [obtener_nombre_hueso(hid, False, {}) for hid in range(0x40)]
+    datos  = DatosMalla(
+        nombre       = f"Parte_{parte.indice:02d}",
+        # Multiplos de 1/64 y de 1/255: coordenadas y UVs exactas en el PMDL
+        co           = (rnd.integers(-2000, 2000, (n, 3)) / 64.0).astype(np.float32),
+        matriz       = np.eye(4, dtype=np.float32),
+        vertice_loop = np.arange(n, dtype=np.int32),
+        uv_loop      = (rnd.integers(0, 256, (n, 2)) / 255.0).astype(np.float32),
+        pesos        = np.hstack((rnd.random((n, len(grupos))), np.zeros((n, 1)))).astype(np.float32),
+        grupos       = grupos,
+        propiedades  = {},
+    )
+    if guardada:
+        datos.huella_guardada = datos.huella()
+    return datos
+
+
+def partes(blob):
+    info, error = analizar_pmdl_bytes(bytes(blob), "test")
+    assert error is None
+    return info.partes
+
+
+def bytes_parte(blob, parte):
+    return bytes(blob[parte.offset : parte.offset + parte.longitud])
+
+
+def comprobar_malla(parte, datos):
+    """Los vertices de la parte son los de la malla."""
+    coords = np.concatenate([sub.coords for sub in parte.subpartes])
+    uvs    = np.concatenate([sub.uvs for sub in parte.subpartes])
+    co     = datos.co.astype(np.float64) * 64.0
+    assert coords.tolist() == np.stack((co[:, 0], -co[:, 2], co[:, 1]), axis=1).astype(np.int16).tolist()
+    uv = datos.uv_loop.astype(np.float64) * 255.0
+    assert uvs.tolist() == np.rint(np.stack((uv[:, 0], 255.0 - uv[:, 1]), axis=1)).astype(np.uint8).tolist()
+
+    base = 0
+    for sub in parte.subpartes:
+        columnas = [datos.grupos.index(obtener_nombre_hueso(hid, False, {})) for hid in sub.huesos_ids]
+        esperado = datos.pesos[base : base + sub.num_vertices][:, columnas]
+        assert np.abs(sub.pesos - esperado).max() < 1e-4
+        base += sub.num_vertices
+
+
+def test_partes_sin_cambios_conservan_sus_bytes():
+    blob   = pmdl_canonico()
+    antes  = bytes(blob)
+    mallas = [malla(parte, i) for i, parte in enumerate(partes(blob))]
+
+    resumen = codificar_pmdl(blob, mallas, None, log=sin_log)
+
+    assert bytes(blob) == antes
+    assert (resumen['reutilizadas'], resumen['recodificadas']) == (len(mallas), 0)
+    assert [h for _, h in resumen['huellas']] == [datos.huella() for datos in mallas]
+
+
+def test_parte_modificada_se_recodifica():
+    blob    = pmdl_canonico()
+    antes   = partes(blob)
+    mallas  = [malla(parte, i) for i, parte in enumerate(antes)]
+    # La parte 1 cambio desde el import: su huella ya no coincide con la guardada
+    mallas[1].co = mallas[1].co + np.float32(1.0)
+
+    resumen = codificar_pmdl(blob, mallas, None, log=sin_log)
+    despues = partes(blob)
+
+    assert (resumen['reutilizadas'], resumen['recodificadas']) == (len(mallas) - 1, 1)
+    comprobar_malla(despues[1], mallas[1])
+    original = pmdl_canonico()
+    for i, parte in enumerate(antes):
+        if i != 1:
+            assert bytes_parte(blob, despues[i]) == bytes_parte(original, parte)
+    assert bytes_parte(blob, despues[1]) != bytes_parte(original, antes[1])
+
+
+def test_forzar_completo_recodifica_todo():
+    blob   = pmdl_canonico()
+    mallas = [malla(parte, i) for i, parte in enumerate(partes(blob))]
+
+    resumen = codificar_pmdl(blob, mallas, None, forzar_completo=True, log=sin_log)
+
+    assert (resumen['reutilizadas'], resumen['recodificadas']) == (0, len(mallas))
+    for parte, datos in zip(partes(blob), mallas):
+        comprobar_malla(parte, datos)
@@ -0,0 +1,198 @@
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from pmdl_addon.binary_utils   import leer_int16, leer_uint8
+from pmdl_addon.formato_pmdl   import ENTRADA_PARTE, ENTRADA_SUBPARTE
+from pmdl_addon.paleta_huesos  import ResolutorPaleta
+from pmdl_addon.pmdl_model     import PmdlPart, PmdlSubpart
+from pmdl_addon.pmdl_parser    import (
+    analizar_pmdl_bytes, decodificar_vertices, escanear_directorio, escanear_pmdl,
+)
+from pmdl_sintetico            import pmdl_sintetico
+
+
+def leer_vertices_dict(datos_parte, offset_subparte, num_vertices, num_huesos):
+    """Decodificador anterior: un dict por vertice, pesos normalizados uno a uno."""
+    vertices       = []
+    tamano_pesos   = num_huesos * 2
+    tamano_vertice = tamano_pesos + 2 + 6
+    pos            = offset_subparte
+
+    for i in range(num_vertices):
+        if pos + tamano_vertice > len(datos_parte):
+            break
+
+        pesos = []
+        for j in range(num_huesos):
+            peso_raw = (leer_uint8(datos_parte, pos + j * 2) << 8) | leer_uint8(datos_parte, pos + j * 2 + 1)
+            if peso_raw <= 0x0080:
+                pesos.append(0.0)
+            elif peso_raw >= 0x8000:
+                pesos.append(1.0)
+            else:
+                pesos.append((peso_raw - 128) / 32640.0)
+        pos += tamano_pesos
+
+        uv_x, uv_y = leer_uint8(datos_parte, pos), leer_uint8(datos_parte, pos + 1)
+        pos       += 2
+        coords     = [leer_int16(datos_parte, pos + k * 2) for k in range(3)]
+        pos       += 6
+
+        vertices.append({'pesos': pesos, 'uv': [uv_x, uv_y], 'coords': coords})
+    return vertices
+
+
+def comparar(datos, offset, num_vertices, num_huesos):
+    referencia         = leer_vertices_dict(datos, offset, num_vertices, num_huesos)
+    pesos, uvs, coords = decodificar_vertices(datos, offset, num_vertices, num_huesos)
+
+    assert pesos.shape == (len(referencia), num_huesos) and pesos.dtype == np.float32
+    assert uvs.shape == (len(referencia), 2) and uvs.dtype == np.uint8
+    assert coords.shape == (len(referencia), 3) and coords.dtype == np.int16
+    for i, vertice in enumerate(referencia):
+        # El decodificador guarda los pesos en float32
+        assert pesos[i].tolist() == np.float32(vertice['pesos']).tolist()
+        assert uvs[i].tolist() == vertice['uv']
+        assert coords[i].tolist() == vertice['coords']
+
+
+@pytest.mark.parametrize("num_huesos", [1, 2, 3, 4])
+def test_igual_al_decodificador_anterior(num_huesos):
+    rnd   = np.random.default_rng(num_huesos)
+    datos = rnd.integers(0, 256, 0x10 + 300 * (num_huesos * 2 + 8), dtype=np.uint8).tobytes()
+    comparar(datos, 0x10, 300, num_huesos)
+
+
+def test_limites_de_los_pesos():
+    crudos = [0x0000, 0x0080, 0x0081, 0x0100, 0x7FFF, 0x8000, 0x8001, 0xFFFF]
+    datos  = b''.join(struct.pack('>H', p) + bytes([1, 2]) + struct.pack('<3h', -1, 0, 32767)
+                      for p in crudos)
+    pesos, _, _ = decodificar_vertices(datos, 0, len(crudos), 1)
+
+    assert pesos[:, 0].tolist() == pytest.approx([0.0, 0.0, 1 / 32640.0, 128 / 32640.0,
+                                                  (0x7FFF - 128) / 32640.0, 1.0, 1.0, 1.0])
+    assert pesos[1, 0] == 0.0 and pesos[5, 0] == 1.0
+    comparar(datos, 0, len(crudos), 1)
+
+
+def test_vertices_incompletos_se_descartan():
+    rnd   = np.random.default_rng(7)
+    datos = rnd.integers(0, 256, 4 + 10 * 16 - 5, dtype=np.uint8).tobytes()   # 4 huesos: 16 bytes
+    comparar(datos, 4, 10, 4)
+    assert len(decodificar_vertices(datos, 4, 10, 4)[0]) == 9
+    assert len(decodificar_vertices(datos, len(datos) + 8, 10, 4)[0]) == 0
+
+
+def test_resolutor_paleta():
+    resolutor = ResolutorPaleta()
+    assert resolutor.resolver(b'\xff\x05') == [0xFF, 0x05]          # columna 0 sin previo
+    assert resolutor.resolver(b'\x03\xff\xff') == [0x03, 0x05, 0xFF]
+    assert resolutor.resolver(b'\xff\xff\x07\x08') == [0x03, 0x05, 0x07, 0x08]
+    assert resolutor.resolver(b'\x01') == [0x01]
+    assert resolutor.resolver(b'\xff\xff\xff\xff') == [0x01, 0x05, 0x07, 0x08]
+
+
+def test_tuplas_igual_que_iterar():
+    rnd   = np.random.default_rng(3)
+    datos = rnd.integers(0, 256, 8 + 5 * 0x20 + 7, dtype=np.uint8).tobytes()
+    for registro in (ENTRADA_PARTE, ENTRADA_SUBPARTE):
+        dicts  = registro.iterar(datos, 8, 99)
+        tuplas = list(registro.tuplas(datos, 8, 99))
+        assert len(tuplas) == len(dicts) == (len(datos) - 8) // registro.tamano
+        assert [dict(zip(registro.nombres, t)) for t in tuplas] == dicts
+
+
+def resumen_analizado(blob):
+    """(partes, [(capa, opacidad, flag, subpartes, vertices)]) segun analizar_pmdl_bytes."""
+    info, error = analizar_pmdl_bytes(blob, "test", diferido=True)
+    assert error is None
+    return info.cantidad_partes, [
+        (p.capa, p.opacidad, p.flag_especial, len(p.subpartes), sum(s.num_vertices for s in p.subpartes))
+        for p in info.partes
+    ]
+
+
+def resumen_escaneado(resumen):
+    return resumen.cantidad_partes, [
+        (p.capa, p.opacidad, p.flag_especial, p.cantidad_subpartes, p.cantidad_vertices)
+        for p in resumen.partes
+    ]
+
+
+def test_escanear_igual_que_analizar(tmp_path):
+    blob = pmdl_sintetico(500, vertices_subparte=20, subpartes_parte=6)
+    ruta = tmp_path / "modelo.pmdl"
+    ruta.write_bytes(blob)
+
+    resumen, error = escanear_pmdl(str(ruta))
+
+    assert error is None
+    assert (resumen.nombre, resumen.tipo, resumen.tamano) == ("modelo.pmdl", "pMdl", len(blob))
+    assert resumen_escaneado(resumen) == resumen_analizado(blob)
+    assert sum(p.cantidad_vertices for p in resumen.partes) == 500
+
+
+# 3 partes de 4 subpartes (0x44 bytes de cabeceras + 0x280 de vertices cada una)
+# a partir de 0xD0. Cortes: dentro de los vertices de la ultima parte, dentro de
+# sus cabeceras de subpartes y dentro de la tabla de partes
+@pytest.mark.parametrize("tamano", [0x6A0, 0xD0 + 2 * 0x2C4 + 0x17, 0x70 + 0x25])
+def test_escanear_archivo_truncado(tmp_path, tamano):
+    blob = pmdl_sintetico(120, vertices_subparte=10, subpartes_parte=4)[:tamano]
+    ruta = tmp_path / "truncado.pmdl"
+    ruta.write_bytes(blob)
+
+    resumen, error = escanear_pmdl(str(ruta))
+
+    assert error is None
+    assert resumen_escaneado(resumen) == resumen_analizado(blob)
+
+
+def test_escanear_firma_incorrecta_y_archivo_corto(tmp_path):
+    blob = bytearray(pmdl_sintetico(40))
+    blob[0:4] = b'XXXX'
+    (tmp_path / "firma.pmdl").write_bytes(blob)
+    (tmp_path / "corto.pmdl").write_bytes(b'pMdl' + bytes(0x20))
+
+    resumen, error = escanear_pmdl(str(tmp_path / "firma.pmdl"))
+    assert resumen is None and "firma" in error
+    resumen, error = escanear_pmdl(str(tmp_path / "corto.pmdl"))
+    assert resumen is None and "cortos" in error
+    resumen, error = escanear_pmdl(str(tmp_path / "no_existe.pmdl"))
+    assert resumen is None and error
+
+
+def test_escanear_directorio(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "b.pmdl").write_bytes(pmdl_sintetico(40, semilla=1))
+    (tmp_path / "a.unk").write_bytes(b'nada')
+    (tmp_path / "notas.txt").write_bytes(pmdl_sintetico(40))
+    (tmp_path / "sub" / "c.PMDF").write_bytes(b'pMdF' + pmdl_sintetico(40)[4:])
+
+    encontrados = [(os.path.relpath(ruta, tmp_path), resumen is not None, error is None)
+                   for ruta, resumen, error in escanear_directorio(str(tmp_path))]
+    assert encontrados == [
+        ("a.unk", False, False),
+        ("b.pmdl", True, True),
+        (os.path.join("sub", "c.PMDF"), True, True),
+    ]
+
+    assert [os.path.basename(ruta) for ruta, _, _ in escanear_directorio(str(tmp_path), recursivo=False)] \
+        == ["a.unk", "b.pmdl"]
+
+
+def test_in_no_evalua_las_properties(monkeypatch):
+    datos = bytes(0x10 + 4 * 12)
+    sub   = PmdlSubpart(0, 4, 2, [1, 2], 0x10, datos)
+    parte = PmdlPart(0, 0, 0xFF, 0, len(datos), 0, '00000000', "Ninguna", [sub])
+
+    def sin_decodificar(self):
+        raise AssertionError("'in' decodifico los vertices")
+    monkeypatch.setattr(PmdlSubpart, 'decodificar', sin_decodificar)
+
+    assert all(clave in sub for clave in ('vertices', 'coords', 'uvs', 'pesos', 'huesos_ids', 'offset'))
+    assert all(clave in parte for clave in ('subpartes', 'cantidad_subpartes', 'nombre_flag'))
+    assert '_coords' not in sub and '_datos_parte' not in sub and 'otra' not in sub
+    assert not sub.decodificada
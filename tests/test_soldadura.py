@@ -0,0 +1,83 @@
+import numpy as np
+
+from pmdl_addon.soldadura import quitar_triangulos_duplicados, soldar_vertices
+
+
+def vertices(*filas):
+    """Arrays (coords, uvs, pesos) a partir de filas ((x, y, z), (u, v), (pesos...))."""
+    coords = np.array([c for c, _, _ in filas], dtype=np.int16)
+    uvs    = np.array([uv for _, uv, _ in filas], dtype=np.uint8)
+    pesos  = np.array([p for _, _, p in filas], dtype=np.float32)
+    return coords, uvs, pesos
+
+
+def test_solo_se_unen_los_identicos():
+    coords, uvs, pesos = vertices(
+        ((0, 0, 0), (10, 10), (1.0, 0.0)),
+        ((5, 5, 5), (20, 20), (0.5, 0.5)),
+        ((0, 0, 0), (10, 10), (1.0, 0.0)),     # igual al 0
+        ((0, 0, 0), (11, 10), (1.0, 0.0)),     # misma posicion, otra UV
+        ((0, 0, 0), (10, 10), (0.9, 0.1)),     # misma posicion, otros pesos
+        ((5, 5, 5), (20, 20), (0.5, 0.5)),     # igual al 1
+    )
+    representantes, slots = soldar_vertices(coords, uvs, pesos)
+
+    # Orden de primera aparicion
+    assert representantes.tolist() == [0, 1, 3, 4]
+    assert slots.tolist() == [0, 1, 0, 2, 3, 1]
+    assert representantes.dtype == np.int64 and slots.dtype == np.int32
+
+
+def test_pesos_de_otros_huesos_no_se_unen():
+    # Mismos pesos pero en otra columna (otro hueso)
+    coords, uvs, pesos = vertices(
+        ((1, 2, 3), (0, 0), (1.0, 0.0)),
+        ((1, 2, 3), (0, 0), (0.0, 1.0)),
+    )
+    representantes, slots = soldar_vertices(coords, uvs, pesos)
+    assert representantes.tolist() == [0, 1] and slots.tolist() == [0, 1]
+
+
+def test_costura_entre_tiras_remapea_los_triangulos():
+    # Dos tiras de 4 vertices; la segunda repite la arista 2-3 de la primera
+    coords, uvs, pesos = vertices(
+        ((0, 0, 0), (0, 0), (1.0,)), ((0, 9, 0), (0, 9), (1.0,)),
+        ((9, 0, 0), (9, 0), (1.0,)), ((9, 9, 0), (9, 9), (1.0,)),
+        ((9, 0, 0), (9, 0), (1.0,)), ((9, 9, 0), (9, 9), (1.0,)),
+        ((18, 0, 0), (18, 0), (1.0,)), ((18, 9, 0), (18, 9), (1.0,)),
+    )
+    triangulos = np.array([[0, 1, 2], [1, 3, 2], [4, 5, 6], [5, 7, 6]], dtype=np.int32)
+
+    representantes, slots = soldar_vertices(coords, uvs, pesos)
+    soldados = slots[triangulos]
+
+    assert representantes.tolist() == [0, 1, 2, 3, 6, 7]
+    assert soldados.tolist() == [[0, 1, 2], [1, 3, 2], [2, 3, 4], [3, 5, 4]]
+    # Cada esquina conserva su posicion
+    assert np.array_equal(coords[representantes][soldados], coords[triangulos])
+    assert quitar_triangulos_duplicados(soldados).all()
+
+
+def test_quitar_triangulos_duplicados_y_degenerados():
+    triangulos = np.array([
+        [0, 1, 2],
+        [2, 0, 1],      # mismos vertices que el primero, rotado
+        [1, 0, 2],      # y con el winding invertido
+        [1, 2, 3],
+        [3, 3, 4],      # vertice repetido
+        [5, 6, 5],
+        [1, 2, 3],
+    ], dtype=np.int32)
+
+    assert quitar_triangulos_duplicados(triangulos).tolist() == [True, False, False, True,
+                                                                 False, False, False]
+
+
+def test_sin_vertices_ni_triangulos():
+    representantes, slots = soldar_vertices(np.zeros((0, 3), dtype=np.int16),
+                                            np.zeros((0, 2), dtype=np.uint8),
+                                            np.zeros((0, 2), dtype=np.float32))
+    assert representantes.shape == (0,) and slots.shape == (0,)
+
+    conservar = quitar_triangulos_duplicados(np.zeros((0, 3), dtype=np.int32))
+    assert conservar.shape == (0,) and conservar.dtype == bool
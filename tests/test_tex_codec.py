@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from pmdl_addon.logic_patch.tex_codec import FORMATO_PARCHE, TEX_HEADER, decodificar_rgba
+
+
+def decodificar_bucle(blob, indices_offset, paleta_offset):
+    """Decodificador anterior (ShowTex): 256x256 a 8 bpp, un pixel por iteracion."""
+    paleta = []
+    for i in range(256):
+        off = paleta_offset + (i * 4)
+        if off + 3 < len(blob):
+            paleta.append((blob[off], blob[off + 1], blob[off + 2], blob[off + 3]))
+        else:
+            paleta.append((0, 0, 0, 255))
+
+    pixels = np.zeros((256, 256, 4), dtype=np.uint8)
+
+    num, num2, num3, num4 = 0, 0, 0, 32
+    while num4 != 0:
+        num5 = 16
+        while num5 != 0:
+            num6 = 0
+            while num6 < 8:
+                num7 = 0
+                while num7 < 16:
+                    if num3 < 65536:
+                        idx = indices_offset + num3
+                        if idx < len(blob):
+                            x = int(num7 + num)
+                            y = int(num6 + num2)
+                            if x < 256 and y < 256:
+                                pixels[y, x] = paleta[blob[idx]]
+                        num3 += 1
+                    num7 += 1
+                num6 += 1
+            if num + 2 < 256:
+                num += 16
+            num5 -= 1
+        if num2 + 2 < 256:
+            num2 += 8
+        num = 0
+        num4 -= 1
+
+    return pixels[::-1]
+
+
+# Bytes que se quitan del final: textura completa, paleta a medias, sin paleta
+# con los indices a medias y solo la cabecera
+@pytest.mark.parametrize("recorte", [0, 0x200 + 2, 0x400 + 0x8000 + 5, 0x10400])
+def test_igual_al_decodificador_anterior(recorte):
+    rnd           = np.random.default_rng(recorte)
+    blob          = rnd.integers(0, 256, FORMATO_PARCHE.tamano_total - recorte, dtype=np.uint8).tobytes()
+    paleta_offset = TEX_HEADER + FORMATO_PARCHE.tamano_indices
+
+    rgba = decodificar_rgba(blob, TEX_HEADER, paleta_offset)
+
+    assert rgba.shape == (256, 256, 4) and rgba.dtype == np.uint8
+    assert np.array_equal(rgba, decodificar_bucle(blob, TEX_HEADER, paleta_offset))
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from pmdl_addon.logic_patch.tex_codec   import (
+    FORMATO_PARCHE, TEX_HEADER, FormatoTextura, decodificar_rgba, leer_paleta,
+)
+from pmdl_addon.logic_patch.tex_encoder import (
+    codificar_rgba, cuantizar, indices_de_textura, textura_a_parche,
+)
+
+FORMATOS = [FORMATO_PARCHE, FormatoTextura(128, 64, 4)]
+
+
+def textura_sintetica(formato, semilla):
+    """Blob con una textura al azar (cabecera, indices y paleta) y su dict de leer_texturas."""
+    rnd     = np.random.default_rng(semilla)
+    blob    = bytearray(rnd.integers(0, 256, formato.tamano_total, dtype=np.uint8).tobytes())
+    textura = {
+        'formato'        : formato,
+        'inicio'         : 0,
+        'indices_offset' : TEX_HEADER,
+        'paleta_offset'  : TEX_HEADER + formato.tamano_indices,
+    }
+    return blob, textura
+
+
+def decodificar(blob, textura):
+    return decodificar_rgba(blob, textura['indices_offset'], textura['paleta_offset'], textura['formato'])
+
+
+def imagen_pocos_colores(formato, cantidad, semilla):
+    rnd     = np.random.default_rng(semilla)
+    colores = np.unique(rnd.integers(0, 256, (cantidad * 2, 4), dtype=np.uint8), axis=0)[:cantidad]
+    return colores[rnd.integers(0, len(colores), (formato.alto, formato.ancho))]
+
+
+def imagen_gradiente(formato):
+    """Degradado suave con alfa en damero: miles de colores distintos."""
+    y, x = np.mgrid[0:formato.alto, 0:formato.ancho].astype(np.float64)
+    r    = 255 * x / (formato.ancho - 1)
+    g    = 255 * y / (formato.alto - 1)
+    b    = 127.5 + 127.5 * np.sin((x + y) / 23.0)
+    a    = np.where((x // 32 + y // 32) % 2, 255, 160)
+    return np.rint(np.stack((r, g, b, a), axis=-1)).astype(np.uint8)
+
+
+def escribir(formato, indices_bytes, paleta_bytes):
+    blob, textura = textura_sintetica(formato, 0)
+    blob[textura['indices_offset'] : textura['paleta_offset']] = indices_bytes
+    blob[textura['paleta_offset'] :]                          = paleta_bytes
+    return blob, textura
+
+
+@pytest.mark.parametrize("formato", FORMATOS, ids=repr)
+def test_pocos_colores_ida_y_vuelta_exacta(formato):
+    rgba = imagen_pocos_colores(formato, formato.colores - 3, 1)
+    indices_bytes, paleta_bytes, exacta = codificar_rgba(rgba, formato)
+
+    assert exacta
+    assert len(indices_bytes) == formato.tamano_indices
+    assert len(paleta_bytes) == formato.tamano_paleta
+    assert np.array_equal(decodificar(*escribir(formato, indices_bytes, paleta_bytes)), rgba)
+
+
+# Error medio por canal medido: ~6.3 a 8 bpp (256 colores) y ~15 a 4 bpp (16 colores)
+@pytest.mark.parametrize("formato, error_maximo", [(FORMATO_PARCHE, 10.0), (FormatoTextura(128, 64, 4), 25.0)],
+                         ids=repr)
+def test_muchos_colores_error_acotado(formato, error_maximo):
+    rgba = imagen_gradiente(formato)
+    indices_bytes, paleta_bytes, exacta = codificar_rgba(rgba, formato)
+    decodificada = decodificar(*escribir(formato, indices_bytes, paleta_bytes))
+
+    assert not exacta
+    assert np.abs(decodificada.astype(np.int16) - rgba).mean() < error_maximo
+
+
+def test_cuantizar_conserva_la_paleta_original():
+    rnd      = np.random.default_rng(5)
+    original = rnd.integers(0, 256, (256, 4), dtype=np.uint8)
+    rgba     = original[rnd.integers(0, 40, (64, 64))]
+    indices, paleta, exacta = cuantizar(rgba, 256, original)
+
+    assert exacta and np.array_equal(paleta, original)
+    assert np.array_equal(paleta[indices], rgba)
+
+
+def test_tamano_distinto_es_error():
+    with pytest.raises(ValueError):
+        codificar_rgba(np.zeros((128, 256, 4), dtype=np.uint8), FORMATO_PARCHE)
+
+
+@pytest.mark.parametrize("formato", FORMATOS, ids=repr)
+def test_textura_a_parche_sin_cambios(formato):
+    blob, textura = textura_sintetica(formato, 2)
+    antes         = bytes(blob)
+
+    assert textura_a_parche(blob, textura, decodificar(blob, textura)) == 'sin cambios'
+    assert bytes(blob) == antes
+
+
+@pytest.mark.parametrize("formato", FORMATOS, ids=repr)
+def test_textura_a_parche_recoloreado(formato):
+    blob, textura = textura_sintetica(formato, 3)
+    antes         = bytes(blob)
+    paleta_nueva  = np.random.default_rng(4).integers(0, 256, (formato.colores, 4), dtype=np.uint8)
+    recoloreada   = paleta_nueva[indices_de_textura(blob, textura)]
+
+    assert textura_a_parche(blob, textura, recoloreada) == 'paleta'
+    assert np.array_equal(decodificar(blob, textura), recoloreada)
+    # Solo cambia la paleta; cabecera e indices quedan igual
+    assert bytes(blob[: textura['paleta_offset']]) == antes[: textura['paleta_offset']]
+
+
+@pytest.mark.parametrize("formato", FORMATOS, ids=repr)
+def test_textura_a_parche_exacta(formato):
+    blob, textura = textura_sintetica(formato, 5)
+    antes         = bytes(blob)
+    rgba          = imagen_pocos_colores(formato, formato.colores // 2, 6)
+
+    assert textura_a_parche(blob, textura, rgba) == 'exacta'
+    assert len(blob) == len(antes)
+    assert np.array_equal(decodificar(blob, textura), rgba)
+    assert bytes(blob[:TEX_HEADER]) == antes[:TEX_HEADER]
+
+
+def test_textura_a_parche_cuantizada():
+    blob, textura = textura_sintetica(FORMATO_PARCHE, 7)
+    rgba          = imagen_gradiente(FORMATO_PARCHE)
+
+    assert textura_a_parche(blob, textura, rgba) == 'cuantizada'
+    assert len(leer_paleta(blob, textura['paleta_offset'], FORMATO_PARCHE)) == 256
+    assert np.abs(decodificar(blob, textura).astype(np.int16) - rgba).mean() < 10.0
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from pmdl_addon.tiras import triangular_tiras
+
+
+def triangular_referencia(longitudes, coords):
+    """Un triangulo por iteracion; retorna (triangulos, repetidos, area_cero)."""
+    triangulos = []
+    repetidos  = 0
+    area_cero  = 0
+    base       = 0
+    for n in longitudes:
+        for i in range(n - 2):
+            a, b, c = (base + i, base + i + 1, base + i + 2)
+            pa, pb, pc = (tuple(int(v) for v in coords[k]) for k in (a, b, c))
+            if pa == pb or pb == pc or pa == pc:
+                repetidos += 1
+                continue
+            u    = [pb[k] - pa[k] for k in range(3)]
+            v    = [pc[k] - pa[k] for k in range(3)]
+            cruz = (u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0])
+            if cruz == (0, 0, 0):
+                area_cero += 1
+                continue
+            triangulos.append((a, b, c) if i % 2 == 0 else (a, c, b))
+        base += n
+    return triangulos, repetidos, area_cero
+
+
+def test_winding_de_los_impares():
+    triangulos, _ = triangular_tiras([6])
+    assert triangulos.tolist() == [[0, 1, 2], [1, 3, 2], [2, 3, 4], [3, 5, 4]]
+    assert triangulos.dtype == np.int32
+
+
+def test_varias_tiras_concatenadas():
+    # El winding se reinicia en cada tira; las tiras de menos de 3 vertices no aportan
+    triangulos, estadisticas = triangular_tiras([4, 2, 3, 5])
+    assert triangulos.tolist() == [[0, 1, 2], [1, 3, 2],
+                                   [6, 7, 8],
+                                   [9, 10, 11], [10, 12, 11], [11, 12, 13]]
+    assert (estadisticas.tiras, estadisticas.vertices, estadisticas.triangulos) == (4, 14, 6)
+    assert estadisticas.degenerados == 0
+
+
+def test_descarta_repetidos_y_area_cero():
+    coords = np.array([
+        [0, 0, 0], [10, 0, 0], [0, 10, 0],      # valido
+        [0, 10, 0],                             # 1-2-3 y 2-3-4 repiten el vertice 2
+        [20, 10, 0], [40, 10, 0],               # 3-4-5 alineados (area cero)
+        [5, 5, 5],                              # 4-5-6 valido (par, sin invertir)
+    ], dtype=np.int16)
+    triangulos, estadisticas = triangular_tiras([7], coords)
+
+    assert triangulos.tolist() == [[0, 1, 2], [4, 5, 6]]
+    assert (estadisticas.repetidos, estadisticas.area_cero) == (2, 1)
+    assert estadisticas.triangulos == 2 and estadisticas.degenerados == 3
+
+    # Sin coords (o sin descartar) se conservan todos
+    assert len(triangular_tiras([7])[0]) == 5
+    assert len(triangular_tiras([7], coords, descartar_degenerados=False)[0]) == 5
+
+
+def test_sin_tiras():
+    triangulos, estadisticas = triangular_tiras([], np.zeros((0, 3), dtype=np.int16))
+    assert triangulos.shape == (0, 3)
+    assert (estadisticas.tiras, estadisticas.vertices, estadisticas.triangulos) == (0, 0, 0)
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_igual_a_la_referencia(semilla):
+    rnd        = np.random.default_rng(semilla)
+    longitudes = rnd.integers(0, 20, 40).tolist()
+    # Coordenadas en una rejilla chica para que haya repetidos y alineados
+    coords     = rnd.integers(-2, 3, (sum(longitudes), 3)).astype(np.int16)
+
+    triangulos, estadisticas         = triangular_tiras(longitudes, coords)
+    referencia, repetidos, area_cero = triangular_referencia(longitudes, coords)
+
+    assert triangulos.tolist() == [list(t) for t in referencia]
+    assert (estadisticas.repetidos, estadisticas.area_cero) == (repetidos, area_cero)
+    assert estadisticas.triangulos + estadisticas.degenerados == sum(max(n - 2, 0) for n in longitudes)
@@ -0,0 +1,101 @@
+import numpy as np
+
+
+# Conversion de tiras de triangulos (triangle strips) a listas de triangulos.
+# No depende de bpy: trabaja solo con arrays de NumPy.
+
+
+class EstadisticasTiras:
+    """Resumen de una conversion de tiras a triangulos."""
+    __slots__ = ('tiras', 'vertices', 'triangulos', 'repetidos', 'area_cero')
+
+    def __init__(self, tiras, vertices, triangulos, repetidos, area_cero):
+        self.tiras      = tiras
+        self.vertices   = vertices
+        self.triangulos = triangulos   # triangulos conservados
+        self.repetidos  = repetidos    # descartados por tener dos vertices en la misma posicion
+        self.area_cero  = area_cero    # descartados por tener sus tres vertices alineados
+
+    @property
+    def degenerados(self):
+        return self.repetidos + self.area_cero
+
+    @property
+    def triangulos_por_vertice(self):
+        return self.triangulos / self.vertices if self.vertices else 0.0
+
+    def __str__(self):
+        return (f"{self.tiras} tiras, {self.vertices} vertices, {self.triangulos} triangulos "
+                f"({self.triangulos_por_vertice:.2f}/vertice), {self.degenerados} degenerados "
+                f"({self.repetidos} repetidos, {self.area_cero} area cero)")
+
+
+def triangular_tiras(longitudes, coords=None, descartar_degenerados=True):
+    """
+    Convierte varias tiras consecutivas (las subpartes de una parte) en una lista
+    de triangulos, todo de una vez.
+
+    longitudes : cantidad de vertices de cada tira, en orden
+    coords     : int16[N, 3] con las posiciones de los N vertices (necesario para
+                 detectar degenerados; sin coords no se descarta nada)
+
+    Los triangulos impares de cada tira invierten su orden para conservar el winding.
+    Retorna (triangulos, estadisticas), con triangulos int32[T, 3] el indice del
+    vertice de cada esquina. Cada vertice de una tira trae su propia UV, asi que
+    los mismos indices sirven para las UV de las esquinas.
+    """
+    longitudes = np.asarray(longitudes, dtype=np.int64)
+    inicios    = np.concatenate(([0], np.cumsum(longitudes)[:-1])) if len(longitudes) else longitudes
+    por_tira   = np.maximum(longitudes - 2, 0)
+    total      = int(por_tira.sum())
+
+    # Indice local de cada triangulo dentro de su tira
+    primero = np.concatenate(([0], np.cumsum(por_tira)[:-1])) if len(por_tira) else por_tira
+    local   = np.arange(total, dtype=np.int64) - np.repeat(primero, por_tira)
+    base    = np.repeat(inicios, por_tira) + local
+
+    repetidos = 0
+    area_cero = 0
+    if descartar_degenerados and coords is not None and total:
+        # Cada triangulo usa los vertices base, base+1 y base+2 (el orden no cambia
+        # si es degenerado), asi que basta con las diferencias entre vecinos.
+        # Se calcula una vez por ventana de 3 vertices y luego se indexa por 'base'.
+        x, y, z = np.asarray(coords, dtype=np.int64).T.copy()
+        ax, ay, az = x[1:-1] - x[:-2], y[1:-1] - y[:-2], z[1:-1] - z[:-2]   # base+1 - base
+        bx, by, bz = x[2:]   - x[:-2], y[2:]   - y[:-2], z[2:]   - z[:-2]   # base+2 - base
+
+        # Producto cruz nulo -> area cero (incluye vertices repetidos)
+        degenerado = (ay * bz == az * by)
+        degenerado &= (az * bx == ax * bz)
+        degenerado &= (ax * by == ay * bx)
+        degenerado  = degenerado[base]
+
+        # Entre los degenerados, separar los que repiten posicion para las estadisticas
+        candidatos = base[degenerado]
+        repetido   = (((ax[candidatos] == 0) & (ay[candidatos] == 0) & (az[candidatos] == 0))
+                      | ((bx[candidatos] == 0) & (by[candidatos] == 0) & (bz[candidatos] == 0))
+                      | ((ax[candidatos] == bx[candidatos]) & (ay[candidatos] == by[candidatos])
+                         & (az[candidatos] == bz[candidatos])))
+        repetidos = int(repetido.sum())
+        area_cero = len(candidatos) - repetidos
+
+        conservar = ~degenerado
+        base      = base[conservar]
+        local     = local[conservar]
+
+    impar      = (local & 1).astype(bool)
+    triangulos = np.empty((len(base), 3), dtype=np.int32)
+    triangulos[:, 0] = base
+    triangulos[:, 1] = base + 1
+    triangulos[:, 2] = base + 2
+    triangulos[impar, 1] += 1
+    triangulos[impar, 2] -= 1
+
+    estadisticas = EstadisticasTiras(
+        tiras      = len(longitudes),
+        vertices   = int(longitudes.sum()),
+        triangulos = len(triangulos),
+        repetidos  = repetidos,
+        area_cero  = area_cero,
+    )
+    return triangulos, estadisticas